@@ -1,14 +1,11 @@
-def read_fasta(filename):
-    seq = ""
-    with open(filename, "r") as f:
-        for line in f:
-            if line.startswith(">"): 
-                continue
-            seq += line.strip()       
-    return seq
+import os
+import sys
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from biotools.fasta import read_sequence
 
-s = read_fasta("input.fasta")
+
+s = read_sequence("input.fasta")
 
 aparitii = {}
 sumall = 0
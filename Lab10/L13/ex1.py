@@ -1,6 +1,12 @@
+import os
+import sys
 import matplotlib.pyplot as plt
 import collections
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from biotools.kappa import kappa_ic, kappa_ic_windows
+from biotools.windows import window_profile
+
 def calculate_cg_content(sequence):
     sequence = sequence.upper()
     length = len(sequence)
@@ -14,44 +20,13 @@ def calculate_cg_content(sequence):
     return cg_percent
 
 def calculate_kappa_ic(sequence):
-
-    sequence = sequence.upper()
-    N = len(sequence)
-    if N < 2:
-        return 0.0
-    
-    total_percentage = 0.0
-    
-    for shift in range(1, N):
-        matches = 0
-        length_of_overlap = N - shift
-        
-        for i in range(length_of_overlap):
-            if sequence[i] == sequence[i + shift]:
-                matches += 1
-        
-        if length_of_overlap > 0:
-            pct = (matches / length_of_overlap) * 100.0
-            total_percentage += pct
-            
-    ic_value = total_percentage / (N - 1)
-    return ic_value
+    return kappa_ic(sequence)
 
 def analyze_sequence(sequence, window_size=30):
 
-    cg_values = []
-    ic_values = []
-    
+    cg_values = window_profile(sequence, window_size)['gc'].tolist()
+    ic_values = kappa_ic_windows(sequence, window_size).tolist()
 
-    for i in range(len(sequence) - window_size + 1):
-        window = sequence[i : i + window_size]
-        
-        cg = calculate_cg_content(window)
-        ic = calculate_kappa_ic(window)
-        
-        cg_values.append(cg)
-        ic_values.append(ic)
-        
     return cg_values, ic_values
 
 def main():
@@ -2,6 +2,13 @@ import matplotlib.pyplot as plt
 import collections
 import os
 import re
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from biotools.fasta import read_fasta
+from biotools.kappa import kappa_ic, kappa_ic_windows
+from biotools.ods import load_store, plot_density, run_batch
+from biotools.windows import window_profile
 
 def calculate_cg_content(sequence):
 
@@ -17,65 +24,14 @@ def calculate_cg_content(sequence):
     return cg_percent
 
 def calculate_kappa_ic(sequence):
-    sequence = sequence.upper()
-    N = len(sequence)
-    if N < 2:
-        return 0.0
-    
-    total_percentage = 0.0
-    
-    for shift in range(1, N):
-        matches = 0
-        length_of_overlap = N - shift
-        
-        for i in range(length_of_overlap):
-            if sequence[i] == sequence[i + shift]:
-                matches += 1
-        
-        if length_of_overlap > 0:
-            pct = (matches / length_of_overlap) * 100.0
-            total_percentage += pct
-            
-    ic_value = total_percentage / (N - 1)
-    return ic_value
+    return kappa_ic(sequence)
 
 def analyze_sequence(sequence, window_size=30):
 
-    cg_values = []
-    ic_values = []
-    
-    for i in range(len(sequence) - window_size + 1):
-        window = sequence[i : i + window_size]
-        
-        cg = calculate_cg_content(window)
-        ic = calculate_kappa_ic(window)
-        
-        cg_values.append(cg)
-        ic_values.append(ic)
-        
-    return cg_values, ic_values
-
-def read_fasta(file_path):
+    cg_values = window_profile(sequence, window_size)['gc'].tolist()
+    ic_values = kappa_ic_windows(sequence, window_size).tolist()
 
-    header = None
-    sequence = []
-    
-    with open(file_path, 'r') as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            
-            if line.startswith(">"):
-                if header:
-                    yield header, "".join(sequence)
-                header = line[1:] # Remove >
-                sequence = []
-            else:
-                sequence.append(line)
-        
-        if header and sequence:
-            yield header, "".join(sequence)
+    return cg_values, ic_values
 
 def process_promoters_combined(fasta_file, output_folder="ODS_Patterns"):
  
@@ -116,13 +72,31 @@ def process_promoters_combined(fasta_file, output_folder="ODS_Patterns"):
     
     print(f"Merged ODS pattern saved to: {output_filename}")
 
+def process_promoters_batch(fasta_file, output_folder="ODS_Patterns", workers=None, plot=True):
+    """
+    Batch version of process_promoters_combined for large promoter sets:
+    records are analysed on a process pool and the (CG, IC) points are
+    streamed to an on-disk store; the chart (a density hexbin) is optional.
+    """
+    store_path = os.path.join(output_folder, "ods_store")
+    print(f"Processing {fasta_file} in batch mode...")
+
+    count = run_batch(fasta_file, store_path, window=30, workers=workers,
+                      progress=lambda done: print(f"Processed {done} sequences..."))
+    print(f"Finished processing {count} sequences. Points stored in: {store_path}")
+
+    if plot:
+        output_filename = f"{output_folder}/Combined_ODS_Pattern.png"
+        plot_density(load_store(store_path), output_filename)
+        print(f"Merged ODS pattern saved to: {output_filename}")
+
 def main():
     FASTA_FILE = "promoters.fasta"
     
     if not os.path.exists(FASTA_FILE):
         print(f"Error: {FASTA_FILE} not found. Please upload the file.")
     else:
-        process_promoters_combined(FASTA_FILE)
+        process_promoters_batch(FASTA_FILE)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
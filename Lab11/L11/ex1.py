@@ -1,70 +1,36 @@
+import os
+import sys
 import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib.patches as patches
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from biotools.align import affine_align, alignment_path, global_align
+from biotools.align import score_matrix as build_score_matrix
+
+
+# Above this many cells the full score matrix is not built (visualisation only)
+MAX_PLOT_CELLS = 250_000
+
 
 def needleman_wunsch(seq1, seq2, match=1, mismatch=-1, gap=0):
-    n = len(seq1) 
-    m = len(seq2) 
-    
-    score_matrix = np.zeros((m + 1, n + 1))
-    
-    for i in range(m + 1): score_matrix[i][0] = i * gap
-    for j in range(n + 1): score_matrix[0][j] = j * gap
-    
-    for i in range(1, m + 1):
-        for j in range(1, n + 1):
-            if seq2[i-1] == seq1[j-1]:
-                diagonal = score_matrix[i-1][j-1] + match
-            else:
-                diagonal = score_matrix[i-1][j-1] + mismatch
-            
-            up = score_matrix[i-1][j] + gap
-            left = score_matrix[i][j-1] + gap
-            
-            score_matrix[i][j] = max(diagonal, up, left)
-            
-    align1 = ""
-    align2 = ""
-    matches_count = 0
-    path_coords = [] 
-    
-    i, j = m, n
-    path_coords.append((i, j))
-    
-    while i > 0 or j > 0:
-        score = score_matrix[i][j]
-        
-        diag_val = score_matrix[i-1][j-1] if (i>0 and j>0) else -999
-        up_val   = score_matrix[i-1][j]   if i>0 else -999
-        left_val = score_matrix[i][j-1]   if j>0 else -999
-        
-        is_match = (seq2[i-1] == seq1[j-1]) if (i>0 and j>0) else False
-        target_diag = diag_val + (match if is_match else mismatch)
-        
-        if i > 0 and j > 0 and score == target_diag:
-            align1 = seq1[j-1] + align1
-            align2 = seq2[i-1] + align2
-            if is_match: matches_count += 1
-            i -= 1; j -= 1
-        elif i > 0 and score == up_val + gap:
-            align1 = "-" + align1
-            align2 = seq2[i-1] + align2
-            i -= 1
-        else:
-            align1 = seq1[j-1] + align1
-            align2 = "-" + align2
-            j -= 1
-            
-        path_coords.append((i, j))
+    """
+    Global alignment in linear memory (Hirschberg, see biotools.align).
+    The full score matrix is only returned for small inputs, for the
+    figures; for genome-sized inputs it is None.
+    """
+    align1, align2, _, matches_count = global_align(seq1, seq2, match, mismatch, gap)
+    path_coords = alignment_path(align1, align2)
+
+    score_matrix = None
+    if (len(seq1) + 1) * (len(seq2) + 1) <= MAX_PLOT_CELLS:
+        score_matrix = build_score_matrix(seq1, seq2, match, mismatch, gap)
 
     return align1, align2, matches_count, score_matrix, path_coords
 
 
 def print_console_results(s1, s2, as1, as2, matches):
-    match_line = ""
-    for c1, c2 in zip(as1, as2):
-        match_line += "|" if (c1 == c2 and c1 != '-') else " "
+    match_line = "".join("|" if (c1 == c2 and c1 != '-') else " " for c1, c2 in zip(as1, as2))
 
     total_len = len(as1)
     similarity = int((matches / total_len) * 100)
@@ -126,5 +92,15 @@ aligned_s1, aligned_s2, match_count, mat, path = needleman_wunsch(S1, S2)
 
 print_console_results(S1, S2, aligned_s1, aligned_s2, match_count)
 
-print("Opening graphic visualization...")
-show_figures(mat, path, S1, S2)
\ No newline at end of file
+# Same pair with affine gaps (open=-2, extend=-1), evaluating only cells
+# within 4 diagonals of the main path; X-drop stops once the score collapses.
+print("\nAffine gaps (open=-2, extend=-1), band=4, X-drop=10:")
+affine_s1, affine_s2, _, affine_matches = affine_align(S1, S2, match=1, mismatch=-1, gap_open=-2,
+                                                       gap_extend=-1, band=4, xdrop=10)
+print_console_results(S1, S2, affine_s1, affine_s2, affine_matches)
+
+if mat is not None:
+    print("Opening graphic visualization...")
+    show_figures(mat, path, S1, S2)
+else:
+    print("Sequences too long for the matrix figures; skipping visualization.")
\ No newline at end of file
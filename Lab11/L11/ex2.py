@@ -1,124 +1,142 @@
+import os
 import numpy as np
 import matplotlib.pyplot as plt
-from matplotlib.collections import LineCollection
+from matplotlib.collections import PolyCollection
 import sys
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from biotools.fasta import read_sequence
+from biotools.synteny import SyntenyMap
+
 
 def read_fasta_robust(filename):
-    sequence = []
     try:
-        with open(filename, 'r') as f:
-            for line in f:
-                line = line.strip()
-                if not line or line.startswith(">") or line.startswith("["):
-                    continue
-                sequence.append(line.upper())
+        return read_sequence(filename)
     except FileNotFoundError:
         print(f"Eroare: Fisierul {filename} lipseste.")
         return ""
-    return "".join(sequence)
-
-
-def get_relative_alignment_data(seq_flu, seq_cov, samples=600):
-
-    data = []
-    len_f = len(seq_flu)
-    len_c = len(seq_cov)
-    
-    print(f"Generare hartă relativă ({samples} puncte)...")
-    
-    for p in range(samples):
-        idx_f = int((p / samples) * len_f)
-        idx_c = int((p / samples) * len_c)
-        
-        # Limite
-        idx_f = min(idx_f, len_f - 1)
-        idx_c = min(idx_c, len_c - 1)
-        
-        char_f = seq_flu[idx_f]
-        char_c = seq_cov[idx_c]
-        is_match = (char_f == char_c)
-        
-        data.append({
-            'x': p,
-            'flu_char': char_f,
-            'cov_char': char_c,
-            'is_match': is_match,
-            'flu_idx': idx_f,
-            'cov_idx': idx_c
-        })
-        
-    return data
+
+
+def get_relative_alignment_data(seq_flu, seq_cov, k=11):
+    """
+    Builds the synteny map of the two genomes: shared k-mer anchors on both
+    strands, chained into collinear blocks, with pyramid coverage tracks.
+    """
+    print(f"Generare hartă de sinteny (k={k})...")
+    synteny = SyntenyMap(seq_flu, seq_cov, k=k)
+    print(f"Ancore comune: {len(synteny.anchors)} | Blocuri colineare: {len(synteny.blocks)}")
+    for block in synteny.blocks.tolist():
+        start1, end1, start2, end2, strand, anchors = block
+        print(f"  Influenza {start1}-{end1} <-> COVID {start2}-{end2} "
+              f"({'+' if strand > 0 else '-'}, {anchors} ancore)")
+    return synteny
+
+
+COMPLEMENT = str.maketrans("ACGTN", "TGCAN")
 
 
 class ZoomableGenomeMap:
-    def __init__(self, data, width):
-        self.data = data
-        self.width = width
-        
+    def __init__(self, synteny, seq_flu, seq_cov):
+        self.map = synteny
+        self.seq_flu = seq_flu
+        self.seq_cov = seq_cov
+        self.width = len(seq_flu)
+        self.scale = len(seq_flu) / len(seq_cov)  # COVID coordinates drawn on the Influenza axis
+
         self.fig, self.ax = plt.subplots(figsize=(15, 8))
-        self.text_artists_flu = []
-        self.text_artists_cov = []
-        
-        self.zoom_threshold = 120 
-        self.text_visible = False
+        self.text_artists = []
+        self.density_line = None
+
+        self.zoom_threshold = 120  # bases visible before the letters are drawn
+        self.max_bins = 600        # bins of the coverage track at any zoom level
 
     def draw(self):
-        self.ax.set_xlim(-10, self.width + 10)
-        self.ax.set_ylim(-0.5, 1.5)
+        self.ax.set_xlim(0, self.width)
+        self.ax.set_ylim(-0.5, 1.6)
         self.ax.axis('off')
 
         # --- LINII DE FUNDAL ---
+        label_x = -0.01 * self.width
         self.ax.hlines(1, 0, self.width, colors='blue', linewidth=4, alpha=0.2)
-        self.ax.text(-20, 1, "INFLUENZA", va='center', ha='right', fontsize=12, fontweight='bold', color='blue')
-        
+        self.ax.text(label_x, 1, "INFLUENZA", va='center', ha='right', fontsize=12, fontweight='bold', color='blue')
+
         self.ax.hlines(0, 0, self.width, colors='red', linewidth=4, alpha=0.2)
-        self.ax.text(-20, 0, "COVID-19", va='center', ha='right', fontsize=12, fontweight='bold', color='red')
-
-        segments = []
-        for d in self.data:
-            if d['is_match']:
-                segments.append([(d['x'], 0), (d['x'], 1)])
-        
-        lc = LineCollection(segments, colors='green', alpha=0.5, linewidths=2)
-        self.ax.add_collection(lc)
-
-        print("Se pregătesc literele (ascunse)...")
-        for d in self.data:
-            color = 'green' if d['is_match'] else 'darkred'
-            weight = 'bold' if d['is_match'] else 'normal'
-            
-            t1 = self.ax.text(d['x'], 1, d['flu_char'], ha='center', va='center', 
-                              fontsize=10, color=color, fontweight=weight, visible=False, clip_on=True)
-            self.text_artists_flu.append(t1)
-            
-            t2 = self.ax.text(d['x'], 0, d['cov_char'], ha='center', va='center', 
-                              fontsize=10, color=color, fontweight=weight, visible=False, clip_on=True)
-            self.text_artists_cov.append(t2)
+        self.ax.text(label_x, 0, "COVID-19", va='center', ha='right', fontsize=12, fontweight='bold', color='red')
+
+        # --- BLOCURI COLINEARE (cate un poligon per bloc) ---
+        polygons, colors = [], []
+        for start1, end1, start2, end2, strand, _ in self.map.blocks.tolist():
+            bottom = (start2 * self.scale, end2 * self.scale)
+            if strand < 0:
+                bottom = bottom[::-1]
+            polygons.append([(start1, 0.95), (end1, 0.95), (bottom[1], 0.05), (bottom[0], 0.05)])
+            colors.append('green' if strand > 0 else 'orange')
+        self.ax.add_collection(PolyCollection(polygons, facecolors=colors, edgecolors=colors, alpha=0.4))
+
+        # --- PISTA DE ACOPERIRE (doar regiunea vizibila) ---
+        self.density_line, = self.ax.plot([], [], drawstyle='steps-post', color='green', linewidth=1)
+        self.update_view(self.ax.get_xlim())
 
         self.ax.set_title("Harta Aliniere Genomică\nFolosește Lupa (Zoom Box) pe o zonă mică pentru a vedea LITERELE", fontsize=14)
-        
+
         self.ax.callbacks.connect('xlim_changed', self.on_xlims_change)
-        
+
         plt.tight_layout()
         plt.show()
 
+    def update_view(self, xlim):
+        start, end = max(int(xlim[0]), 0), min(int(np.ceil(xlim[1])), self.width)
+
+        starts, ends, coverage, _ = self.map.track('blocks', start, end, self.max_bins)
+        if len(starts):
+            self.density_line.set_data(np.append(starts, ends[-1]),
+                                       1.15 + 0.35 * np.append(coverage, coverage[-1]))
+
+        for t in self.text_artists:
+            t.remove()
+        self.text_artists = []
+        if end - start < self.zoom_threshold:
+            self.draw_letters(start, end)
+
+    def draw_letters(self, start, end):
+        """Letters of the visible region only, with COVID aligned through the nearest anchor."""
+        positions = np.arange(start, end)
+        for x in positions.tolist():
+            self.text_artists.append(self.ax.text(x, 1, self.seq_flu[x], ha='center', va='center',
+                                                  fontsize=10, color='blue', clip_on=True))
+
+        anchors = self.map.anchors_in(start - self.map.k - 500, end)
+        in_block = np.zeros(len(anchors), dtype=bool)
+        for block in self.map.blocks_in(start, end):
+            in_block |= ((anchors['strand'] == block['strand']) &
+                         (anchors['pos1'] >= block['start1']) & (anchors['pos1'] < block['end1']) &
+                         (anchors['pos2'] >= block['start2']) & (anchors['pos2'] < block['end2']))
+        anchors = anchors[in_block]
+        if len(anchors) == 0:
+            return
+
+        nearest = np.searchsorted(anchors['pos1'], positions, side='right') - 1
+        for x, i in zip(positions.tolist(), nearest.tolist()):
+            if i < 0:
+                continue
+            pos1, pos2, strand = anchors[i].tolist()
+            if strand > 0:
+                cov_idx = pos2 + (x - pos1)
+                char_c = self.seq_cov[cov_idx] if cov_idx < len(self.seq_cov) else ''
+            else:
+                cov_idx = pos2 + self.map.k - 1 - (x - pos1)
+                char_c = self.seq_cov[cov_idx].translate(COMPLEMENT) if cov_idx >= 0 else ''
+            if not char_c:
+                continue
+            is_match = char_c == self.seq_flu[x]
+            self.text_artists.append(self.ax.text(
+                x, 0.75, char_c, ha='center', va='center', fontsize=10,
+                color='green' if is_match else 'darkred', fontweight='bold' if is_match else 'normal',
+                clip_on=True))
+
     def on_xlims_change(self, event_ax):
-        xlim = event_ax.get_xlim()
-        visible_range = xlim[1] - xlim[0]
-        
-        should_be_visible = visible_range < self.zoom_threshold
-
-        if should_be_visible != self.text_visible:
-            self.text_visible = should_be_visible
-            print(f"Zoom detectat: {int(visible_range)} puncte. Afisare text: {self.text_visible}")
-            
-            for t in self.text_artists_flu:
-                t.set_visible(self.text_visible)
-            for t in self.text_artists_cov:
-                t.set_visible(self.text_visible)
-            
-            self.fig.canvas.draw_idle()
+        self.update_view(event_ax.get_xlim())
+        self.fig.canvas.draw_idle()
 
 
 if __name__ == "__main__":
@@ -129,12 +147,9 @@ if __name__ == "__main__":
     s_cov = read_fasta_robust(f_cov)
 
     if s_flu and s_cov:
-        data_points = get_relative_alignment_data(s_flu, s_cov, samples=600)
-        
-        if data_points:
-            viz = ZoomableGenomeMap(data_points, width=600)
-            viz.draw()
-        else:
-            print("Eroare: Nu sunt date.")
+        synteny = get_relative_alignment_data(s_flu, s_cov, k=11)
+
+        viz = ZoomableGenomeMap(synteny, s_flu, s_cov)
+        viz.draw()
     else:
         print("Lipsesc fisierele FASTA.")
\ No newline at end of file
@@ -1,21 +1,21 @@
+import glob
+import os
 import sys
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from biotools.fasta import read_sequence
+from biotools import minhash, similarity
+from biotools.local import local_search
+
 # ==========================================
 # 1. READ DATA
 # ==========================================
 def read_fasta_robust(filename):
-    sequence = []
     try:
-        with open(filename, 'r') as f:
-            for line in f:
-                line = line.strip()
-                if not line or line.startswith(">") or line.startswith("["):
-                    continue
-                sequence.append(line.upper())
+        return read_sequence(filename)
     except FileNotFoundError:
         print(f"Error: File {filename} is missing.")
         return ""
-    return "".join(sequence)
 
 # ==========================================
 # 2. THE 3 SCORING EQUATIONS
@@ -26,16 +26,7 @@ def score_1_identity(seq1, seq2):
     EQUATION 1: Simple Identity
     Calculates the percentage of identical characters at the same position.
     """
-    length = min(len(seq1), len(seq2))
-    if length == 0: return 0.0, 0
-    
-    matches = 0
-    for i in range(length):
-        if seq1[i] == seq2[i]:
-            matches += 1
-            
-    percentage = (matches / length) * 100
-    return percentage, matches
+    return similarity.identity(seq1, seq2)
 
 def score_2_weighted(seq1, seq2, match_reward=1, mismatch_penalty=1):
     """
@@ -43,25 +34,9 @@ def score_2_weighted(seq1, seq2, match_reward=1, mismatch_penalty=1):
     Awards points for matches and DEDUCTS points for mismatches.
     The result is then normalized to a 0-100% scale.
     """
-    length = min(len(seq1), len(seq2))
-    if length == 0: return 0.0, 0
-    
-    raw_score = 0
-    # Calculate theoretical max and min scores for normalization
-    max_possible_score = length * match_reward
-    min_possible_score = length * -mismatch_penalty
-    
-    for i in range(length):
-        if seq1[i] == seq2[i]:
-            raw_score += match_reward
-        else:
-            raw_score -= mismatch_penalty
-            
     # Normalization (Min-Max Scaling) to bring score between 0 and 100
     # Formula: (val - min) / (max - min) * 100
-    normalized_score = (raw_score - min_possible_score) / (max_possible_score - min_possible_score) * 100
-    
-    return normalized_score, raw_score
+    return similarity.weighted(seq1, seq2, match_reward, mismatch_penalty)
 
 def score_3_jaccard_kmers(seq1, seq2, k=3):
     """
@@ -69,53 +44,77 @@ def score_3_jaccard_kmers(seq1, seq2, k=3):
     Breaks sequences into 'words' of k letters (trigrams) and checks overlap.
     Useful for detecting structural similarity even if there are small shifts.
     """
-    if len(seq1) < k or len(seq2) < k: return 0.0, 0, 0
-
-    # Generate sets of k-mers (e.g., "ATCG" -> {"ATC", "TCG"})
-    set1 = set(seq1[i : i+k] for i in range(len(seq1) - k + 1))
-    set2 = set(seq2[i : i+k] for i in range(len(seq2) - k + 1))
-    
-    intersection = len(set1.intersection(set2))
-    union = len(set1.union(set2))
-    
-    if union == 0: return 0.0, 0, 0
-    
-    jaccard_index = (intersection / union) * 100
-    return jaccard_index, intersection, union
+    # Sets of k-mers (e.g., "ATCG" -> {"ATC", "TCG"}) as sorted integer codes;
+    # k-mers spanning a gap or an N are skipped
+    return similarity.jaccard(seq1, seq2, k)
 
 # ==========================================
 # 3. FIND BEST WINDOW (Intermediate Layer)
 # ==========================================
-def find_best_alignment_window(s_flu, s_cov, window_size=50):
+def find_best_alignment_window(s_flu, s_cov, k=9, top=5):
     """
-    Scans the COVID genome with a chunk of Influenza to find 
-    a region with relevant similarity to apply the calculations on.
+    Searches both genomes for their best local alignments (k-mer seeds,
+    ungapped X-drop extension, banded Smith-Waterman) and returns the best
+    one to apply the calculations on.
     """
-    print(f"Searching for best local alignment (Window: {window_size}bp)...")
-    
-    best_score = -1
-    best_flu_seq = ""
-    best_cov_seq = ""
-    best_positions = (0, 0) # (flu_start, cov_start)
-
-    # Optimization: scan Influenza every 100bp
-    for i in range(0, len(s_flu) - window_size, 100):
-        chunk_flu = s_flu[i : i+window_size]
-        
-        # Scan Covid every 500bp
-        for j in range(0, len(s_cov) - window_size, 500):
-            chunk_cov = s_cov[j : j+window_size]
-            
-            # Use simple score for scanning
-            perc, _ = score_1_identity(chunk_flu, chunk_cov)
-            
-            if perc > best_score:
-                best_score = perc
-                best_flu_seq = chunk_flu
-                best_cov_seq = chunk_cov
-                best_positions = (i, j)
-                
-    return best_flu_seq, best_cov_seq, best_positions
+    print(f"Searching for best local alignments (seed k-mer: {k}bp)...")
+
+    hits = local_search(s_flu, s_cov, top=top, k=k)
+    if not hits:
+        print("No local alignment found.")
+        return "", "", (0, 0)
+
+    print(f"\n{'#':>2s} {'Score':>6s} {'Influenza':>17s} {'COVID':>17s} {'Identity':>9s}")
+    for rank, hit in enumerate(hits, 1):
+        flu_span = f"{hit['start1']}-{hit['end1']}"
+        cov_span = f"{hit['start2']}-{hit['end2']}"
+        print(f"{rank:2d} {hit['score']:6d} {flu_span:>17s} {cov_span:>17s} {hit['identity']:8.2f}%")
+
+    best = hits[0]
+    return best["aligned1"], best["aligned2"], (best["start1"], best["start2"])
+
+# ==========================================
+# 4. ALL-VS-ALL MODE (Folder of genomes)
+# ==========================================
+def compare_genome_folder(folder, output_prefix="distance", k=3, workers=None):
+    """
+    Computes the 3 scores for every pair of FASTA files in a folder and
+    writes one symmetric distance matrix (1 - score/100) per score.
+    """
+    records = similarity.read_fasta_folder(folder)
+    if len(records) < 2:
+        print(f"Need at least 2 FASTA files in {folder}.")
+        return None
+
+    print(f"\nComparing {len(records)} genomes all-vs-all (k={k})...")
+    names, matrices = similarity.similarity_matrices(records, k=k, workers=workers)
+    for score, matrix in matrices.items():
+        filename = f"{output_prefix}_{score}.phy"
+        similarity.write_distance_matrix(filename, names, similarity.distance_matrix(matrix))
+        print(f"Saved {score} distance matrix: {filename}")
+    return names, matrices
+
+
+def sketch_genome_folder(folder, sketch_file="genomes.msk", k=21, size=1000, workers=None):
+    """
+    Approximate all-vs-all comparison: builds a MinHash sketch of every
+    FASTA file in a folder, saves them, and writes the Mash distance matrix.
+    """
+    filenames = sorted(glob.glob(os.path.join(folder, "*.fasta")))
+    if not filenames:
+        print(f"No FASTA files in {folder}.")
+        return []
+
+    print(f"\nSketching {len(filenames)} genomes (k={k}, sketch size={size})...")
+    sketches = minhash.sketch_files(filenames, k=k, size=size, workers=workers)
+    minhash.write_sketches(sketch_file, sketches)
+    print(f"Saved sketches: {sketch_file}")
+
+    names = [sketch.name for sketch in sketches]
+    distances = minhash.distance_matrix(sketches)
+    similarity.write_distance_matrix("distance_mash.phy", names, distances)
+    print("Saved Mash distance matrix: distance_mash.phy")
+    return sketches
 
 
 if __name__ == "__main__":
@@ -126,7 +125,7 @@ if __name__ == "__main__":
     seq_cov = read_fasta_robust(f_cov)
 
     if seq_flu and seq_cov:
-        w_flu, w_cov, pos = find_best_alignment_window(seq_flu, seq_cov, window_size=60)
+        w_flu, w_cov, pos = find_best_alignment_window(seq_flu, seq_cov, k=9)
         
         print("\n" + "="*60)
         print(f"CALCULATION RESULTS FOR BEST LOCAL ALIGNMENT")
@@ -159,4 +158,9 @@ if __name__ == "__main__":
         print("="*60)
         
     else:
-        print("Could not read input files.")
\ No newline at end of file
+        print("Could not read input files.")
+
+    genome_folder = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "Lab12", "L12")
+    if os.path.isdir(genome_folder):
+        compare_genome_folder(genome_folder)
+        sketch_genome_folder(genome_folder)
\ No newline at end of file
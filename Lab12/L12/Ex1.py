@@ -1,4 +1,10 @@
 import math
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from biotools.pwm import pwm_from_dict
+from biotools.pwm_pvalue import score_distribution
 
 motifs = [
     "GAGGTAAAC",
@@ -19,6 +25,8 @@ motif_length = 9
 num_sequences = len(motifs)
 bases = ['A', 'C', 'G', 'T']
 background_freq = 0.25
+signal_pvalue = 0.001  # P(random 9-mer scores at least this high)
+display_pvalue = 0.05  # windows listed in the table; looser than the signal cutoff
 
 
 count_matrix = {b: [0]*motif_length for b in bases}
@@ -41,6 +49,7 @@ for b in bases:
             score = math.log(p_obs / background_freq)
         else:
             score = -99.0  
+        log_likelihood_matrix[b][i] = score
 
 def print_matrix(title, matrix):
     print(f"\n--- {title} ---")
@@ -54,15 +63,20 @@ print_matrix("Probability Matrix", prob_matrix)
 print_matrix("Log-Likelihood Matrix", log_likelihood_matrix)
 
 
+# Exact score distribution of the matrix under the uniform background
+distribution = score_distribution(pwm_from_dict(log_likelihood_matrix))
+signal_threshold = distribution.threshold(signal_pvalue)
+
 print(f"\n--- Analyzing Sequence S ---")
-print(f"Sequence: {sequence_s}\n")
+print(f"Sequence: {sequence_s}")
+print(f"Score threshold for p <= {signal_pvalue}: {signal_threshold:.2f}\n")
 
 best_score = -999
 best_window = ""
 best_index = -1
 
-print(f"{'Index':<6} {'Window':<12} {'Score':<6}")
-print("-" * 30)
+print(f"{'Index':<6} {'Window':<12} {'Score':<8} {'P-value':<10}")
+print("-" * 40)
 
 for i in range(len(sequence_s) - motif_length + 1):
     window = sequence_s[i : i + motif_length]
@@ -71,8 +85,9 @@ for i in range(len(sequence_s) - motif_length + 1):
     for pos, char in enumerate(window):
         current_score += log_likelihood_matrix[char][pos]
         
-    if current_score > -20:  
-        print(f"{i:<6} {window:<12} {current_score:.2f}")
+    window_pvalue = distribution.pvalue(current_score)
+    if window_pvalue <= display_pvalue:
+        print(f"{i:<6} {window:<12} {current_score:<8.2f} {window_pvalue:<10.2e}")
         
     if current_score > best_score:
         best_score = current_score
@@ -81,9 +96,9 @@ for i in range(len(sequence_s) - motif_length + 1):
 
 print("\n--- Conclusion ---")
 print(f"Best match found at index {best_index}: {best_window}")
-print(f"Score: {best_score:.2f}")
+print(f"Score: {best_score:.2f} (p-value: {distribution.pvalue(best_score):.2e})")
 
-if best_score > 0:
+if best_score >= signal_threshold:
     print("Result: SIGNAL DETECTED. This is likely an exon-intron border.")
 else:
     print("Result: No significant signal found.")
\ No newline at end of file
@@ -1,6 +1,14 @@
 import math
+import numpy as np
 import matplotlib.pyplot as plt
 import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from biotools.fasta import read_fasta
+from biotools.motifs import MotifLibrary, scan_library, write_bed
+from biotools.pwm import pwm_from_dict, scan_many
+from biotools.pwm_pvalue import score_threshold
 
 
 motifs = [
@@ -33,6 +41,7 @@ motif_length = 9
 num_sequences = len(motifs)
 bases = ['A', 'C', 'G', 'T']
 background_freq = 0.25
+signal_pvalue = 1e-4  # P(random 9-mer scores at least this high)
 
 
 count_matrix = {b: [0] * motif_length for b in bases}
@@ -65,50 +74,18 @@ for b in bases:
 
 def parse_fasta(filename):
     """
-    Reads a FASTA file and concatenates all sequences into one string.
-    Returns the concatenated sequence and a short ID.
+    Reads a FASTA file once.
+    Returns its (name, sequence) records, or None if the file is missing.
     """
-    sequence_data = ""
     try:
-        with open(filename, 'r') as f:
-            lines = f.readlines()
-            
-        for line in lines:
-            line = line.strip()
-            if not line: continue
-            if line.startswith(">"):
-                continue # Skip headers, we just want the raw sequence stream
-            else:
-                # Filter to ensure only valid bases ACGT are processed
-                clean_line = "".join([c for c in line.upper() if c in bases])
-                sequence_data += clean_line
-                
-        return sequence_data
+        # Filter to ensure only valid bases ACGT are processed
+        return [(header.split()[0] if header else "", seq)
+                for header, seq in read_fasta(filename, alphabet=bases)]
     except FileNotFoundError:
         print(f"Warning: File {filename} not found.")
         return None
 
-def scan_genome(sequence, matrix):
-    """
-    Scans the sequence with the PWM matrix.
-    Returns a list of scores corresponding to each position.
-    """
-    scores = []
-    # Sliding window
-    for i in range(len(sequence) - motif_length + 1):
-        window = sequence[i : i + motif_length]
-        current_score = 0
-        
-        for pos, char in enumerate(window):
-            if char in matrix:
-                current_score += matrix[char][pos]
-            else:
-                current_score += -99.0 # Heavy penalty for non-base characters
-        
-        scores.append(current_score)
-    return scores
-
-def plot_genome_chart(filename, scores):
+def plot_genome_chart(filename, scores, threshold=0):
     """
     Creates a chart for the genome showing signal strength.
     """
@@ -118,8 +95,8 @@ def plot_genome_chart(filename, scores):
     # Plot data
     plt.plot(scores, color='#1f77b4', linewidth=0.6, label='Motif Score')
     
-    # Add threshold line (Score > 0 implies likely match)
-    plt.axhline(y=0, color='red', linestyle='--', linewidth=1, label='Signal Threshold (0)')
+    # Add threshold line (scores above it are unlikely by chance)
+    plt.axhline(y=threshold, color='red', linestyle='--', linewidth=1, label=f'Signal Threshold ({threshold:.2f})')
     
     # Styling
     plt.title(f"Genome Scan: {filename}", fontsize=14)
@@ -134,21 +111,43 @@ def plot_genome_chart(filename, scores):
 
 # --- 4. Main Execution Loop ---
 
-print(f"{'File Name':<35} | {'Genome Length':<15} | {'Max Score':<10}")
-print("-" * 70)
-
+genome_records = {}
+genomes = {}
 for f_name in file_names:
-    genome_seq = parse_fasta(f_name)
-    
+    records = parse_fasta(f_name)
+    genome_seq = "".join(seq for _, seq in records) if records else ""
     if genome_seq:
-        # Scan the genome
-        scores = scan_genome(genome_seq, log_likelihood_matrix)
-        
-        # Print summary statistics
-        max_score = max(scores) if scores else 0
-        print(f"{f_name:<35} | {len(genome_seq):<15} | {max_score:.2f}")
-        
-        # Generate the chart
-        plot_genome_chart(f_name, scores)
+        genome_records[f_name] = records
+        genomes[f_name] = genome_seq
+
+# Scan all genomes, both strands, in one batched call
+pwm = pwm_from_dict(log_likelihood_matrix)
+tracks = scan_many(genomes.values(), pwm)
+
+# Convert the p-value cutoff to a score once, from the exact score distribution
+threshold = score_threshold(pwm, signal_pvalue)
+print(f"Score threshold for p <= {signal_pvalue}: {threshold:.2f}\n")
+
+print(f"{'File Name':<35} | {'Genome Length':<15} | {'Max Score':<10} | {'Hits':<8}")
+print("-" * 81)
+
+for (f_name, genome_seq), (scores, rc_scores) in zip(genomes.items(), tracks):
+    # Print summary statistics
+    max_score = max(scores.max(), rc_scores.max()) if len(scores) else 0
+    hits = np.count_nonzero(scores >= threshold) + np.count_nonzero(rc_scores >= threshold)
+    print(f"{f_name:<35} | {len(genome_seq):<15} | {max_score:<10.2f} | {hits:<8}")
+    
+    # Generate the chart
+    plot_genome_chart(f_name, scores, threshold)
+
+# --- 5. Motif hits for every record, written as BED ---
+# The library holds just the splice-site matrix here, but any number of
+# matrices (e.g. MotifLibrary.from_jaspar("JASPAR.txt")) scan in the same pass.
+library = MotifLibrary([("splice_site", pwm)])
+records = (record for f_name in genomes for record in genome_records[f_name])
+
+with open("motif_hits.bed", "w") as bed:
+    hit_count = write_bed(scan_library(records, library, pvalue=signal_pvalue), bed)
+print(f"\n{hit_count} motif hits written to motif_hits.bed")
 
 print("\nProcessing Complete.")
\ No newline at end of file
@@ -1,17 +1,37 @@
+import os
+import sys
 import tkinter as tk
-from itertools import product
-from collections import Counter
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from biotools.encoding import ALPHABET
+from biotools.kmers import as_strings, count_kmers
 
 bases = "ATGC"
+# 2-bit code of each letter of `bases`
+base_codes = np.array([ALPHABET.index(b) for b in bases], dtype=np.uint64)
+
+def combination_codes(length):
+    """K-mer codes of every combination, in product(bases, repeat=length) order."""
+    codes = np.zeros(1, dtype=np.uint64)
+    for _ in range(length):
+        codes = ((codes[:, None] << np.uint64(2)) | base_codes).ravel()
+    return codes
 
 def generate_combinations(length):
-    return [''.join(p) for p in product(bases, repeat=length)]
+    return as_strings(combination_codes(length), length)
 
 def calculate_percentages(seq, length):
-    combos = generate_combinations(length)
-    counts = Counter(seq[i:i+length] for i in range(len(seq)-length+1))
-    total = sum(counts.values())
-    percentages = {k: (counts.get(k, 0)/total)*100 for k in combos}
+    codes = combination_codes(length)
+    present, counts = count_kmers(seq, length)
+    # percentages of all windows, including those with other symbols
+    total = max(len(seq) - length + 1, 1)
+    found = np.zeros(len(codes), dtype=np.int64)
+    if len(present):
+        idx = np.minimum(np.searchsorted(present, codes), len(present) - 1)
+        hit = present[idx] == codes
+        found[hit] = counts[idx[hit]]
+    percentages = dict(zip(as_strings(codes, length), (found / total * 100).tolist()))
     return percentages
 
 def format_grid(percent_dict, cols=5):
@@ -1,17 +1,13 @@
-S = "ATTGTCCCAATCTGTTG"
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from biotools.kmers import distinct_kmers
 
-dinucleotides = []
-trinucleotides = []
+S = "ATTGTCCCAATCTGTTG"
 
-for i in range(len(S)):
-    if i + 1 < len(S):
-        di = S[i:i+2]
-        if di not in dinucleotides:
-            dinucleotides.append(di)
-    if i + 2 < len(S):
-        tri = S[i:i+3]
-        if tri not in trinucleotides:
-            trinucleotides.append(tri)
+dinucleotides = distinct_kmers(S, 2)
+trinucleotides = distinct_kmers(S, 3)
 
 print("Existing Dinucleotides:")
 print(", ".join(dinucleotides))
@@ -7,27 +7,24 @@
 # In order to plot this chart, first, the vectors that contain the frequency of 
 # each symbol must be computed and only then plotted.
 
+import os
+import sys
 import tkinter as tk
 from tkinter import filedialog, messagebox
 import matplotlib.pyplot as plt
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from biotools.fasta import read_sequence
+from biotools.windows import symbol_frequencies
+
 
 def load_fasta(filepath):
-    with open(filepath, 'r') as f:
-        lines = f.readlines()
-    seq = ''.join(line.strip() for line in lines if not line.startswith('>')).upper()
-    return seq
+    return read_sequence(filepath)
 
 def compute_frequencies(seq, window_size=30):
     alphabet = sorted(set(seq))  # e.g., ['A', 'C', 'G', 'T']
-    freq_vectors = {base: [] for base in alphabet}
-
-    for i in range(len(seq) - window_size + 1):
-        window = seq[i:i+window_size]
-        for base in alphabet:
-            freq = window.count(base) / window_size
-            freq_vectors[base].append(freq)
-    return freq_vectors
+    # One cumulative count per symbol, so each window costs O(1)
+    return symbol_frequencies(seq, window_size, alphabet=alphabet)
 
 
 def open_and_analyze():
@@ -1,30 +1,35 @@
+import os
+import sys
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
-import re
 import math
+import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.figure import Figure
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 
-def calculate_tms(subsequence, na_concentration):
-    a_count = subsequence.count('A')
-    t_count = subsequence.count('T')
-    g_count = subsequence.count('G')
-    c_count = subsequence.count('C')
-    
-    total_bases = len(subsequence)
-    if total_bases == 0 or total_bases != (a_count + t_count + g_count + c_count):
-        return -1, -1
-
-    # Formula 1: Wallace Rule (Basic)
-    tm_wallace = (2 * (a_count + t_count)) + (4 * (g_count + c_count))
-    
-    # Formula 2: Marmur & Doty Formula (Advanced)
-    gc_content = (g_count + c_count) / total_bases * 100
-    # Tm = 81.5 + 16.6 * log10([Na+]) + 0.41 * (%GC) - 600 / length
-    tm_advanced = 81.5 + (16.6 * math.log10(na_concentration)) + (0.41 * gc_content) - (600 / total_bases)
-    
-    return tm_wallace, round(tm_advanced, 2)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from biotools.fasta import read_sequence
+from biotools.windows import symbol_counts
+
+LETTERS = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
+def calculate_tms_windows(sequence, window_size, na_concentration):
+    """
+    Wallace and Marmur & Doty Tm of every window at once, using prefix
+    counts. Windows containing anything other than A/C/G/T (U included)
+    get -1, -1.
+    """
+    counts = symbol_counts(sequence, window_size, alphabet="ACGT")
+    at = counts['A'] + counts['T']
+    gc = counts['G'] + counts['C']
+    valid = (at + gc) == window_size
+
+    tm_wallace = np.where(valid, 2 * at + 4 * gc, -1)
+    gc_content = gc / window_size * 100
+    tm_advanced = 81.5 + (16.6 * math.log10(na_concentration)) + (0.41 * gc_content) - (600 / window_size)
+    tm_advanced = np.where(valid, np.round(tm_advanced, 2), -1)
+    return tm_wallace, tm_advanced
 
 class TmAnalyzerApp:
     def __init__(self, root):
@@ -173,9 +178,10 @@ class TmAnalyzerApp:
             self.plot_results()
             return
         
-        for i in range(len(sequence) - window_size + 1):
+        tm_wallace_values, tm_advanced_values = calculate_tms_windows(sequence, window_size, na_concentration)
+
+        for i, (tm_wallace, tm_advanced) in enumerate(zip(tm_wallace_values.tolist(), tm_advanced_values.tolist())):
             subsequence = sequence[i : i + window_size]
-            tm_wallace, tm_advanced = calculate_tms(subsequence, na_concentration)
             
             if tm_wallace != -1:
                 self.analysis_results.append((i + 1, subsequence, tm_wallace, tm_advanced))
@@ -190,12 +196,7 @@ class TmAnalyzerApp:
         if not self.selected_filepath:
             return None
         try:
-            with open(self.selected_filepath, 'r') as file:
-                sequence_lines = []
-                for line in file:
-                    if not line.startswith('>'):
-                        sequence_lines.append(re.sub(r'[^a-zA-Z]', '', line))
-                return "".join(sequence_lines).upper()
+            return read_sequence(self.selected_filepath, alphabet=LETTERS)
         except Exception:
             return None
 
@@ -1,67 +1,38 @@
-import re
+import os
+import sys
 from collections import Counter
+import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
 
-GENETIC_CODE = {
-    'UUU': 'Phe', 'UUC': 'Phe', 'UUA': 'Leu', 'UUG': 'Leu',
-    'UCU': 'Ser', 'UCC': 'Ser', 'UCA': 'Ser', 'UCG': 'Ser',
-    'UAU': 'Tyr', 'UAC': 'Tyr', 'UAA': 'Stop', 'UAG': 'Stop',
-    'UGU': 'Cys', 'UGC': 'Cys', 'UGA': 'Stop', 'UGG': 'Trp',
-    'CUU': 'Leu', 'CUC': 'Leu', 'CUA': 'Leu', 'CUG': 'Leu',
-    'CCU': 'Pro', 'CCC': 'Pro', 'CCA': 'Pro', 'CCG': 'Pro',
-    'CAU': 'His', 'CAC': 'His', 'CAA': 'Gln', 'CAG': 'Gln',
-    'CGU': 'Arg', 'CGC': 'Arg', 'CGA': 'Arg', 'CGG': 'Arg',
-    'AUU': 'Ile', 'AUC': 'Ile', 'AUA': 'Ile', 'AUG': 'Met',
-    'ACU': 'Thr', 'ACC': 'Thr', 'ACA': 'Thr', 'ACG': 'Thr',
-    'AAU': 'Asn', 'AAC': 'Asn', 'AAA': 'Lys', 'AAG': 'Lys',
-    'AGU': 'Ser', 'AGC': 'Ser', 'AGA': 'Arg', 'AGG': 'Arg',
-    'GUU': 'Val', 'GUC': 'Val', 'GUA': 'Val', 'GUG': 'Val',
-    'GCU': 'Ala', 'GCC': 'Ala', 'GCA': 'Ala', 'GCG': 'Ala',
-    'GAU': 'Asp', 'GAC': 'Asp', 'GAA': 'Glu', 'GAG': 'Glu',
-    'GGU': 'Gly', 'GGC': 'Gly', 'GGA': 'Gly', 'GGG': 'Gly',
-}
-
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from biotools.fasta import read_sequence
+from biotools.codon_usage import usage_table
+from biotools.genetic_code import CODONS, STANDARD, THREE_LETTER
 
 def read_fasta(filename):
-    sequence = ""
-    with open(filename, 'r') as f:
-        for line in f:
-            line = line.strip()
-            if not line.startswith('>'):
-                sequence += line.upper()
-    return sequence
+    return read_sequence(filename)
 
 
 def dna_to_rna(sequence):
     return sequence.replace('T', 'U')
 
 
-def extract_codons(sequence):
-    if 'T' in sequence:
-        sequence = dna_to_rna(sequence)
-    
-    codons = []
-    for i in range(0, len(sequence) - 2, 3):
-        codon = sequence[i:i+3]
-        if len(codon) == 3 and codon in GENETIC_CODE:
-            codons.append(codon)
-    
-    return codons
+RNA_CODONS = np.array([dna_to_rna(codon) for codon in CODONS])
+# three-letter amino acid of every codon code, from the standard code of the registry
+AMINO_ACIDS = np.array([THREE_LETTER[chr(letter)] for letter in STANDARD.letters[:64].tolist()])
+GENETIC_CODE = dict(zip(RNA_CODONS.tolist(), AMINO_ACIDS.tolist()))
 
 
-def count_codons(codons):
-    return Counter(codons)
+def count_codons(counts):
+    return Counter({codon: count for codon, count in zip(RNA_CODONS.tolist(), counts.tolist()) if count})
 
 
-def count_amino_acids(codons):
-    amino_acids = []
-    for codon in codons:
-        if codon in GENETIC_CODE:
-            aa = GENETIC_CODE[codon]
-            if aa != 'Stop':
-                amino_acids.append(aa)
-    return Counter(amino_acids)
+def count_amino_acids(counts):
+    names, index = np.unique(AMINO_ACIDS, return_inverse=True)
+    totals = np.bincount(index, weights=counts, minlength=len(names)).astype(np.int64)
+    return Counter({aa: count for aa, count in zip(names.tolist(), totals.tolist())
+                    if count and aa != 'Stop'})
 
 
 def plot_top_codons(codon_counts, title, filename, top_n=10):
@@ -152,33 +123,32 @@ def print_statistics(name, sequence, codon_counts, aa_counts):
         print(f"{i}. {aa}: {count:,} ({percentage:.2f}%)")
 
 
-def compare_codons(covid_counts, flu_counts):
-    """Compare and find common frequent codons"""
+def compare_codons(table, top_n=20):
+    """Compare the codon usage table of several genomes and find common frequent codons"""
+    names, counts, rscu = table['names'], table['counts'], table['rscu']
     print(f"\n{'='*70}")
-    print("COMPARISON: MOST FREQUENT CODONS IN BOTH GENOMES")
+    print("COMPARISON: MOST FREQUENT CODONS IN ALL GENOMES")
     print(f"{'='*70}")
-    
-    covid_top = set([codon for codon, count in covid_counts.most_common(20)])
-    flu_top = set([codon for codon, count in flu_counts.most_common(20)])
-    
-    common_codons = covid_top & flu_top
-    
-    print(f"\nCommon codons in top 20 of both genomes: {len(common_codons)}")
-    
-    combined_freq = []
-    for codon in common_codons:
-        covid_freq = covid_counts.get(codon, 0)
-        flu_freq = flu_counts.get(codon, 0)
-        combined_freq.append((codon, covid_freq, flu_freq, covid_freq + flu_freq))
-    
-    combined_freq.sort(key=lambda x: x[3], reverse=True)
-    
-    print(f"\n{'Codon':6s} {'AA':4s} {'COVID-19':>12s} {'Influenza':>12s} {'Combined':>12s}")
-    print('-' * 60)
-    
-    for codon, covid_freq, flu_freq, combined in combined_freq[:15]:
-        aa = GENETIC_CODE.get(codon, '?')
-        print(f"{codon:6s} {aa:4s} {covid_freq:12,} {flu_freq:12,} {combined:12,}")
+
+    # top_n codons of every genome as a (genomes, 64) mask
+    top = np.zeros(counts.shape, dtype=bool)
+    np.put_along_axis(top, np.argsort(-counts, axis=1, kind='stable')[:, :top_n], True, axis=1)
+    common = np.flatnonzero(top.all(axis=0))
+    common = common[np.argsort(-counts[:, common].sum(axis=0), kind='stable')]
+
+    print(f"\nCommon codons in top {top_n} of all genomes: {len(common)}")
+    header = "".join(f" {name[:12]:>12s} {'RSCU':>5s}" for name in names)
+    print(f"\n{'Codon':6s} {'AA':4s}{header} {'Combined':>12s}")
+    print('-' * (12 + 19 * len(names) + 13))
+    for codon in common[:15].tolist():
+        row = "".join(f" {count:12,} {value:5.2f}"
+                      for count, value in zip(counts[:, codon].tolist(), rscu[:, codon].tolist()))
+        print(f"{RNA_CODONS[codon]:6s} {AMINO_ACIDS[codon]:4s}{row} {int(counts[:, codon].sum()):12,}")
+
+    print(f"\n{'Genome':12s} {'Codons':>10s} {'ENC':>6s} {'CAI':>6s}")
+    for name, total, enc, cai in zip(names, counts.sum(axis=1).tolist(), table['enc'].tolist(),
+                                     table['cai'].tolist()):
+        print(f"{name[:12]:12s} {total:10,} {enc:6.2f} {cai:6.3f}")
 
 
 def main():
@@ -199,23 +169,23 @@ def main():
         flu_seq = read_fasta(flu_file)
         print(f"✓ Loaded: {len(flu_seq):,} nucleotides")
         
-        # Extract codons
-        print("\n[3/7] Extracting codons...")
-        covid_codons = extract_codons(covid_seq)
-        flu_codons = extract_codons(flu_seq)
-        print(f"✓ COVID-19 codons: {len(covid_codons):,}")
-        print(f"✓ Influenza codons: {len(flu_codons):,}")
+        # Codon usage table: counts, RSCU, ENC and CAI of both genomes at once
+        print("\n[3/7] Building codon usage table...")
+        table = usage_table([("COVID-19", covid_seq), ("Influenza", flu_seq)])
+        covid_vector, flu_vector = table['counts']
+        print(f"✓ COVID-19 codons: {int(covid_vector.sum()):,}")
+        print(f"✓ Influenza codons: {int(flu_vector.sum()):,}")
         
         # Count frequencies
         print("\n[4/7] Counting codon frequencies...")
-        covid_codon_counts = count_codons(covid_codons)
-        flu_codon_counts = count_codons(flu_codons)
+        covid_codon_counts = count_codons(covid_vector)
+        flu_codon_counts = count_codons(flu_vector)
         print("✓ Frequencies calculated")
         
         # Count amino acids
         print("\n[5/7] Counting amino acid frequencies...")
-        covid_aa_counts = count_amino_acids(covid_codons)
-        flu_aa_counts = count_amino_acids(flu_codons)
+        covid_aa_counts = count_amino_acids(covid_vector)
+        flu_aa_counts = count_amino_acids(flu_vector)
         print("✓ Amino acids counted")
         
         # Print statistics
@@ -241,7 +211,7 @@ def main():
         
         # D) Compare results
         print(f"\n[7/7] Comparing genomes...")
-        compare_codons(covid_codon_counts, flu_codon_counts)
+        compare_codons(table)
         
         print(f"\n{'='*70}")
         print("ANALYSIS COMPLETE!")
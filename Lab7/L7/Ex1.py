@@ -1,16 +1,18 @@
+import os
+import sys
 import matplotlib.pyplot as plt
 from collections import Counter
 
-with open('Project_L7\\L7\\dna.fasta', 'r') as f:
-    sequence = ''.join(line.strip() for line in f if not line.startswith('>')).upper()
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from biotools.fasta import read_sequence
+from biotools.kmers import as_strings, count_kmers_multi
 
-repetitions = Counter()
-for length in range(6, 11):
-    for i in range(len(sequence) - length + 1):
-        pattern = sequence[i:i + length]
-        repetitions[pattern] += 1
+sequence = read_sequence('Project_L7\\L7\\dna.fasta')
 
-repetitions = {p: c for p, c in repetitions.items() if c > 1}
+repetitions = {}
+for length, (codes, counts) in count_kmers_multi(sequence, range(6, 11)).items():
+    repeated = counts > 1
+    repetitions.update(zip(as_strings(codes[repeated], length), counts[repeated].tolist()))
 
 top_20 = sorted(repetitions.items(), key=lambda x: x[1], reverse=True)[:20]
 patterns, frequencies = zip(*top_20) if top_20 else ([], [])
@@ -1,6 +1,11 @@
 import matplotlib.pyplot as plt
 from collections import Counter
 import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from biotools.faidx import FastaIndex
+from biotools.kmers import as_strings, count_kmers_multi
 
 # Check if influenza.fna exists
 if not os.path.exists('Project_L7\\L7\\influenza.fna'):
@@ -13,34 +18,28 @@ if not os.path.exists('Project_L7\\L7\\influenza.fna'):
 
 print("Parsing influenza.fna...")
 genomes = []
-current_seq = []
-current_header = None
 
-with open("Project_L7\\L7\\influenza.fna", 'r') as f:
-    for line in f:
-        line = line.strip()
-        if line.startswith('>'):
-            if current_header and current_seq:
-                seq = ''.join(current_seq).upper()
-                seq = ''.join(c for c in seq if c in 'ATGC')
-                if 1000 <= len(seq) <= 3000:
-                    genomes.append({'header': current_header, 'seq': seq})
-                    if len(genomes) == 10:
-                        break
-            current_header = line
-            current_seq = []
-        else:
-            current_seq.append(line)
+# The .fai index gives every record length up front. Cleaning only removes
+# symbols, so records shorter than 1000 bp are skipped without being read;
+# the 3000 bp limit applies to the cleaned sequence.
+with FastaIndex("Project_L7\\L7\\influenza.fna") as fna:
+    for name in fna:
+        if fna.length(name) < 1000:
+            continue
+        seq = ''.join(c for c in fna.fetch(name) if c in 'ATGC')
+        if 1000 <= len(seq) <= 3000:
+            genomes.append({'header': fna.header(name), 'seq': seq})
+            if len(genomes) == 10:
+                break
 
 print(f"Found {len(genomes)} genomes (1000-3000 bp)")
 
 def analyze_repetitions(sequence):
-    repetitions = Counter()
-    for length in range(6, 11):
-        for i in range(len(sequence) - length + 1):
-            pattern = sequence[i:i + length]
-            repetitions[pattern] += 1
-    return {p: c for p, c in repetitions.items() if c > 1}
+    repetitions = {}
+    for length, (codes, counts) in count_kmers_multi(sequence, range(6, 11)).items():
+        repeated = counts > 1
+        repetitions.update(zip(as_strings(codes[repeated], length), counts[repeated].tolist()))
+    return repetitions
 
 def plot_genome(repetitions, title, filename, seq_length):
     top_20 = sorted(repetitions.items(), key=lambda x: x[1], reverse=True)[:20]
@@ -116,7 +115,7 @@ for i, genome in enumerate(genomes, 1):
     header_short = genome['header'][:60]
     
     with open(f"influenza_genomes/genome_{i}.fasta", 'w') as f:
-        f.write(f"{genome['header']}\n{genome['seq']}\n")
+        f.write(f">{genome['header']}\n{genome['seq']}\n")
     
     repetitions = analyze_repetitions(genome['seq'])
     
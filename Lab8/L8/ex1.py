@@ -2,6 +2,11 @@ import random
 import urllib.request
 import time
 import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from biotools.faidx import FastaIndex
+from biotools.repeats import find_inverted_repeats, ir_sequences
 
 def get_reverse_complement(seq):
     """Returns the reverse complement of a DNA sequence."""
@@ -52,48 +57,20 @@ class TransposonSimulation:
 
 
 def find_transposons(dna_sequence, min_ir=4, max_ir=6, min_dist=10, max_dist=100):
-    detected = []
-    seq_len = len(dna_sequence)
-    
-    for i in range(seq_len):
-        for k in range(min_ir, max_ir + 1):
-            if i + k > seq_len: continue
-            
-            start_ir = dna_sequence[i : i+k]
-            expected_end_ir = get_reverse_complement(start_ir)
-            
-            search_start = i + k + min_dist
-            search_end = min(i + k + max_dist + k, seq_len)
-            
-            if search_start >= seq_len: continue
-            
-            window = dna_sequence[search_start : search_end]
-            match_pos_in_window = window.find(expected_end_ir)
-            
-            if match_pos_in_window != -1:
-                end_ir_start_index = search_start + match_pos_in_window
-                end_ir_end_index = end_ir_start_index + k
-                
-                detected.append({
-                    "start": i,
-                    "end": end_ir_end_index,
-                    "ir_seq": start_ir,
-                    "ir_len": k,
-                    "payload_len": end_ir_start_index - (i + k)
-                })
-                
-    return detected
-
-
-def get_genome_sequence(filename, accession):
+    """
+    Inverted repeat pairs (IR, payload, reverse-complement IR) as a NumPy
+    structured array with fields start, end, ir_len, payload_len, ir_code.
+    """
+    return find_inverted_repeats(dna_sequence, min_ir, max_ir, min_dist, max_dist)
+
+
+def get_genome_sequence(filename, accession, limit=None):
+    """
+    Returns (first `limit` bases of the genome, total genome length).
+    Only the requested prefix is read, through the file's .fai index.
+    """
     if os.path.exists(filename):
         print(f"Reading local file: {filename}")
-        try:
-            with open(filename, 'r') as f:
-                data = f.read()
-        except IOError as e:
-            print(f"Error reading file {filename}: {e}")
-            return ""
     else:
      
         try:
@@ -104,11 +81,17 @@ def get_genome_sequence(filename, accession):
                 print(f"Saved data to {filename}")
         except Exception as e:
             print(f"Error downloading {accession}: {e}")
-            return ""
+            return "", 0
 
-    lines = data.split('\n')
-    sequence = "".join(line.strip() for line in lines if not line.startswith(">"))
-    return sequence
+    try:
+        with FastaIndex(filename) as fa:
+            if not fa.names:
+                return "", 0
+            name = fa.names[0]
+            return fa.fetch(name, 0, limit), fa.length(name)
+    except (IOError, ValueError) as e:
+        print(f"Error reading file {filename}: {e}")
+        return "", 0
 
 def analyze_real_genomes():
     target_files = [
@@ -124,26 +107,24 @@ def analyze_real_genomes():
     for filename, accession in target_files:
         print(f"\nProcessing: {filename}")
         
-        seq = get_genome_sequence(filename, accession)
-        if not seq: 
+        sequence, total_length = get_genome_sequence(filename, accession)
+        if not sequence:
             print("Skipping (No sequence found).")
             continue
-            
-        print(f"Total Sequence Length: {len(seq)} bp")
-        
-        scan_limit = 5000 
-        sub_seq = seq[:scan_limit]
-        
-        print(f"Scanning first {scan_limit} bp for possible transposons...")
+
+        print(f"Total Sequence Length: {total_length} bp")
+
+        print("Scanning the whole genome for possible transposons...")
         print("(Criteria: IR len 4-6, Payload 50-1000 bp)")
-        
-        hits = find_transposons(sub_seq, min_ir=4, max_ir=6, min_dist=50, max_dist=1000)
-        
-        print(f"Found {len(hits)} potential inverted repeat pairs.")
-        if hits:
+
+        start_time = time.time()
+        hits = find_transposons(sequence, min_ir=4, max_ir=6, min_dist=50, max_dist=1000)
+
+        print(f"Found {len(hits)} potential inverted repeat pairs in {time.time() - start_time:.2f} s.")
+        if len(hits):
             print("Top 5 examples:")
-            for i, hit in enumerate(hits[:5]):
-                print(f"  {i+1}. Loc: {hit['start']}-{hit['end']} | IR: {hit['ir_seq']} | Payload: {hit['payload_len']}bp")
+            for i, (hit, ir_seq) in enumerate(zip(hits[:5], ir_sequences(hits[:5]))):
+                print(f"  {i+1}. Loc: {hit['start']}-{hit['end']} | IR: {ir_seq} | Payload: {hit['payload_len']}bp")
         else:
             print("No hits found in the scanned region.")
             
@@ -162,7 +143,7 @@ if __name__ == "__main__":
     results = find_transposons(sim.sequence, min_ir=4, max_ir=6, min_dist=10, max_dist=100)
     
     print(f"Detected {len(results)} potential elements:")
-    for res in results:
-        print(f"  Found at {res['start']}-{res['end']} (IR: {res['ir_seq']}, Payload: {res['payload_len']}bp)")
+    for res, ir_seq in zip(results, ir_sequences(results)):
+        print(f"  Found at {res['start']}-{res['end']} (IR: {ir_seq}, Payload: {res['payload_len']}bp)")
 
     analyze_real_genomes()
\ No newline at end of file
@@ -1,7 +1,10 @@
-import re
 import sys
 import os
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from biotools.fasta import read_sequence
+from biotools.restriction import COMMON_ENZYMES, Digest, Enzyme
+
 def read_fasta(filename):
 
     if not os.path.exists(filename):
@@ -9,54 +12,53 @@ def read_fasta(filename):
         print("Please ensure 'sequence.fasta' is in the same directory as this script.")
         sys.exit(1)
 
-    with open(filename, 'r') as f:
-        lines = f.readlines()
+    return read_sequence(filename)
 
-    sequence = ""
-    for line in lines:
-        line = line.strip()
-        if not line.startswith(">"):
-            sequence += line
-            
-    return sequence.upper() 
-
-enzymes = {
-    "EcoRI":   {"seq": "GAATTC", "offset": 1},
-    "BamHI":   {"seq": "GGATCC", "offset": 1},
-    "HindIII": {"seq": "AAGCTT", "offset": 1},
-    "TaqI":    {"seq": "TCGA",   "offset": 1},
-    "HaeIII":  {"seq": "GGCC",   "offset": 2}
-}
-
-def digest_dna(dna, enzyme_info, is_circular=True):
-    seq_pattern = enzyme_info["seq"]
-    cut_offset = enzyme_info["offset"]
-    
-    matches = [m.start() for m in re.finditer(f'(?={seq_pattern})', dna)]
-    
-    cut_sites = [m + cut_offset for m in matches]
-    cut_sites.sort()
-    
-    num_cleavages = len(cut_sites)
-    fragments = []
-    
-    if num_cleavages == 0:
-        fragments = [len(dna)] 
-    else:
-        if is_circular:
-            for i in range(len(cut_sites) - 1):
-                fragments.append(cut_sites[i+1] - cut_sites[i])
-            wrap_fragment = (len(dna) - cut_sites[-1]) + cut_sites[0]
-            fragments.append(wrap_fragment)
-        else:
-            current_pos = 0
-            for cut in cut_sites:
-                fragments.append(cut - current_pos)
-                current_pos = cut
-            fragments.append(len(dna) - current_pos)
-            
-    fragments.sort(reverse=True) 
-    return num_cleavages, cut_sites, fragments
+# REBASE notation: ^ marks the top-strand cut of a palindromic site
+enzymes = [Enzyme.from_rebase(name, pattern) for name, pattern in (
+    ("EcoRI",   "G^AATTC"),
+    ("BamHI",   "G^GATCC"),
+    ("HindIII", "A^AGCTT"),
+    ("TaqI",    "T^CGA"),
+    ("HaeIII",  "GG^CC"),
+)]
+
+def digest_dna(dna, enzymes, is_circular=True):
+    # One scan of the sequence finds the sites of every enzyme
+    digest = Digest(dna, enzymes, circular=is_circular)
+    results = {}
+    for enzyme in digest.enzymes:
+        cut_sites = digest.cuts(enzyme.name).tolist()
+        fragments = sorted(digest.digest(enzyme.name)['length'].tolist(), reverse=True)
+        results[enzyme.name] = (len(cut_sites), cut_sites, fragments)
+    return digest, results
+
+def search_digests(dna, min_size, max_size, region=None, is_circular=True, max_fragments=3, top=10):
+    # Virtual digest search over a whole enzyme list: the sequence is scanned once,
+    # then every single enzyme and enzyme pair is checked against the targets
+    digest = Digest(dna, COMMON_ENZYMES, circular=is_circular)
+
+    print("\n" + "="*65)
+    print(f"  DIGEST SEARCH ({len(digest.enzymes)} enzymes)")
+    print("="*65)
+    matches = digest.fragment_search(min_size, max_size, pairs=True, max_fragments=max_fragments)
+    print(f"Digests with a {min_size}-{max_size} bp fragment and at most {max_fragments} fragments: {len(matches)}")
+    for names, count, in_window in matches[:top]:
+        lengths = sorted(digest.digest(*names)['length'].tolist(), reverse=True)
+        print(f"  {'+'.join(names):16s} {count} fragments {lengths}")
+
+    if region is None:
+        return matches, [], []
+    start, end = region
+    cutters = digest.region_cutters(start, end, unique=True)
+    print(f"\nUnique cutters inside {start}-{end}: {len(cutters)}")
+    for name, cut in cutters:
+        print(f"  {name:10s} cuts at {cut}")
+    pairs = digest.region_pairs(start, end, unique=True)
+    print(f"Enzyme pairs for directional cloning in {start}-{end}: {len(pairs)}")
+    for first, second, first_cut, second_cut in pairs[:top]:
+        print(f"  {first}+{second}: {first_cut}-{second_cut} ({second_cut - first_cut} bp)")
+    return matches, cutters, pairs
 
 def simulate_gel(results):
     print("\n" + "="*65)
@@ -109,21 +111,42 @@ def main():
     print("-" * 40)
 
     all_results = {}
+    digest, results = digest_dna(dna_sequence, enzymes, is_circular=True)
 
-    for name, info in enzymes.items():
-        cuts, sites, frags = digest_dna(dna_sequence, info, is_circular=True)
-        all_results[name] = {'fragments': frags}
+    for enzyme in enzymes:
+        cuts, sites, frags = results[enzyme.name]
+        all_results[enzyme.name] = {'fragments': frags}
         
-        print(f"\nEnzyme: {name}")
-        print(f"  Sequence:  5'-{info['seq']}-3'")
+        print(f"\nEnzyme: {enzyme.name}")
+        print(f"  Sequence:  5'-{enzyme.site}-3'")
+        print(f"  Ends:      {enzyme.ends} ({abs(enzyme.overhang)} nt overhang)")
         print(f"  Cleavages: {cuts}")
         if cuts > 0:
             print(f"  Positions: {sites}")
             print(f"  Fragments: {frags}")
+            print(f"  Overhangs: {sorted(set(digest.overhangs(enzyme.name)))}")
         else:
             print("  Result:    No cuts (Supercoiled/Nicked DNA)")
 
+    # Double digests of every pair of enzymes, from the same scan
+    print("\n" + "-" * 40)
+    print("Double digests")
+    for names, fragments in digest.combinations(2):
+        lengths = sorted(fragments['length'].tolist(), reverse=True)
+        print(f"  {'+'.join(names):16s} {len(lengths):3d} fragments: {lengths[:8]}{' ...' if len(lengths) > 8 else ''}")
+    double = digest.digest("EcoRI", "HindIII")
+    all_results["Eco+Hin"] = {'fragments': sorted(double['length'].tolist(), reverse=True)}
+
     simulate_gel(all_results)
 
+    # Reverse question: which enzymes give a 400-800 bp band, or cut once
+    # around the EcoRI-HindIII cloning region (the closest pair of their cuts)?
+    eco_cuts, hin_cuts = results["EcoRI"][1], results["HindIII"][1]
+    region = None
+    if eco_cuts and hin_cuts:
+        first, second = min(((e, h) for e in eco_cuts for h in hin_cuts), key=lambda pair: abs(pair[0] - pair[1]))
+        region = (min(first, second), max(first, second))
+    search_digests(dna_sequence, 400, 800, region=region)
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,5 @@
+"""Shared sequence utilities used by the lab scripts.
+
+The labs are plain scripts, so each one adds the repository root to
+``sys.path`` before importing from this package.
+"""
@@ -0,0 +1,368 @@
+"""
+Global (Needleman-Wunsch) alignment in linear memory.
+
+The DP is filled one row at a time with NumPy. Inside a row the horizontal
+gap dependency H[j] = max(T[j], H[j-1] + gap) is resolved with a running
+maximum, H[j] = j*gap + max_{k<=j}(T[k] - k*gap), so each row is a handful
+of vectorised operations and only two rows are ever kept. The alignment
+itself is recovered with Hirschberg's divide and conquer, which splits the
+problem at the midpoint row using a forward and a reverse score pass; small
+sub-problems are solved with a full matrix and a normal traceback.
+
+affine_align adds Gotoh affine gap scores, an optional diagonal band and an
+optional X-drop cut-off. All global aligners return the same
+(aligned1, aligned2, score, matches) tuple; local_align runs the same
+machinery in Smith-Waterman mode and adds the aligned coordinates.
+"""
+
+import numpy as np
+
+from .encoding import upper_bytes
+
+# Sub-problems up to this many DP cells are solved with a full matrix
+FULL_MATRIX_CELLS = 1_000_000
+
+DIAG, UP, LEFT = 0, 1, 2
+
+
+def _dtype(*params):
+    if all(float(p).is_integer() for p in params):
+        return np.int64
+    return np.float64
+
+
+def _substitution_rows(b, match, mismatch, dtype):
+    """Cache of the substitution score row of each symbol against b."""
+    rows = {}
+
+    def row(symbol):
+        if symbol not in rows:
+            rows[symbol] = np.where(b == symbol, match, mismatch).astype(dtype)
+        return rows[symbol]
+    return row
+
+
+def _rows(a, b, match, mismatch, gap):
+    """Yields DP rows H[0], H[1], ..., H[len(a)] of a (rows) against b (columns)."""
+    dtype = _dtype(match, mismatch, gap)
+    steps = np.arange(len(b) + 1, dtype=dtype) * gap
+    sub = _substitution_rows(b, match, mismatch, dtype)
+
+    prev = steps.copy()
+    yield prev
+    temp = np.empty(len(b) + 1, dtype=dtype)
+    for i, symbol in enumerate(a.tolist(), 1):
+        temp[0] = i * gap
+        np.maximum(prev[:-1] + sub(symbol), prev[1:] + gap, out=temp[1:])
+        prev = np.maximum.accumulate(temp - steps) + steps
+        yield prev
+
+
+def last_row(a, b, match=1, mismatch=-1, gap=0):
+    """Last DP row of a against b, computed in O(len(b)) memory."""
+    for row in _rows(a, b, match, mismatch, gap):
+        pass
+    return row
+
+
+def score_matrix(seq1, seq2, match=1, mismatch=-1, gap=0):
+    """
+    Full (len(seq2) + 1) x (len(seq1) + 1) DP matrix, rows along seq2 as
+    in Lab11. Only meant for small inputs (visualisation).
+    """
+    a, b = upper_bytes(seq2), upper_bytes(seq1)
+    return np.vstack(list(_rows(a, b, match, mismatch, gap)))
+
+
+def _full_align(a, b, match, mismatch, gap):
+    """Traceback on a full matrix; prefers diagonal, then up, then left."""
+    matrix = np.vstack(list(_rows(a, b, match, mismatch, gap)))
+    ops = []
+    i, j = len(a), len(b)
+    while i > 0 or j > 0:
+        score = matrix[i, j]
+        if i > 0 and j > 0 and score == matrix[i - 1, j - 1] + (match if a[i - 1] == b[j - 1] else mismatch):
+            ops.append(DIAG)
+            i -= 1
+            j -= 1
+        elif i > 0 and score == matrix[i - 1, j] + gap:
+            ops.append(UP)
+            i -= 1
+        else:
+            ops.append(LEFT)
+            j -= 1
+    ops.reverse()
+    return ops
+
+
+def _hirschberg(a, b, match, mismatch, gap):
+    if len(a) == 0:
+        return [LEFT] * len(b)
+    if len(b) == 0:
+        return [UP] * len(a)
+    if len(a) == 1 or (len(a) + 1) * (len(b) + 1) <= FULL_MATRIX_CELLS:
+        return _full_align(a, b, match, mismatch, gap)
+
+    mid = len(a) // 2
+    forward = last_row(a[:mid], b, match, mismatch, gap)
+    backward = last_row(a[mid:][::-1], b[::-1], match, mismatch, gap)
+    split = int(np.argmax(forward + backward[::-1]))
+    return (_hirschberg(a[:mid], b[:split], match, mismatch, gap)
+            + _hirschberg(a[mid:], b[split:], match, mismatch, gap))
+
+
+def _render(ops, a, b):
+    """
+    Builds the aligned strings (rows sequence first) from the ops.
+    Returns (row_a, row_b, matches, mismatches, gap_columns).
+    """
+    ops = np.asarray(ops, dtype=np.uint8)
+    take_a = ops != LEFT
+    take_b = ops != UP
+    row_a = np.full(len(ops), ord('-'), dtype=np.uint8)
+    row_b = np.full(len(ops), ord('-'), dtype=np.uint8)
+    row_a[take_a] = a
+    row_b[take_b] = b
+
+    paired = ops == DIAG
+    matches = int(np.count_nonzero(row_a[paired] == row_b[paired]))
+    mismatches = int(np.count_nonzero(paired)) - matches
+    gaps = len(ops) - matches - mismatches
+    return row_a.tobytes().decode('ascii'), row_b.tobytes().decode('ascii'), matches, mismatches, gaps
+
+
+def global_align(seq1, seq2, match=1, mismatch=-1, gap=0):
+    """
+    Optimal global alignment of seq1 and seq2 in O(min(len1, len2)) memory.
+    Returns (aligned1, aligned2, score, matches).
+    """
+    a, b = upper_bytes(seq2), upper_bytes(seq1)
+    swap = len(b) > len(a)
+    if swap:
+        # keep the shorter sequence along the DP row
+        a, b = b, a
+    ops = _hirschberg(a, b, match, mismatch, gap)
+    row_a, row_b, matches, mismatches, gaps = _render(ops, a, b)
+    score = matches * match + mismatches * mismatch + gaps * gap
+    if swap:
+        return row_a, row_b, score, matches
+    return row_b, row_a, score, matches
+
+
+def global_score(seq1, seq2, match=1, mismatch=-1, gap=0):
+    """Optimal global alignment score only (no traceback)."""
+    a, b = upper_bytes(seq2), upper_bytes(seq1)
+    if len(b) > len(a):
+        a, b = b, a
+    return last_row(a, b, match, mismatch, gap)[-1].item()
+
+
+def alignment_path(aligned1, aligned2):
+    """
+    Matrix cells (row along seq2, column along seq1) visited by an alignment,
+    from the bottom-right corner back to (0, 0), as Lab11's traceback lists them.
+    """
+    i = len(aligned2) - aligned2.count('-')
+    j = len(aligned1) - aligned1.count('-')
+    path = [(i, j)]
+    for c1, c2 in zip(reversed(aligned1), reversed(aligned2)):
+        if c1 != '-':
+            j -= 1
+        if c2 != '-':
+            i -= 1
+        path.append((i, j))
+    return path
+
+
+# Traceback flags of the affine aligner, packed into one byte per cell
+_FROM_X = 1       # the best of (diagonal, vertical gap) is the vertical gap
+_X_EXTEND = 2     # the vertical gap extends a vertical gap
+_Y_EXTEND = 4     # the horizontal gap extends a horizontal gap
+_STATE_SHIFT = 3  # bits 3-4: state of the cell's best score (DIAG, UP, LEFT or STOP)
+STOP = 3          # local alignment starts here (score clamped to 0)
+
+
+def _affine_fill(a, b, match, mismatch, gap_open, gap_extend, band, xdrop, local=False):
+    """
+    Gotoh DP of a (rows) against b (columns), restricted to a band of
+    columns per row. Returns (flags, lows, end_i, end_j, score): per-row
+    traceback flags, the first column of each row's band, and the cell the
+    traceback starts from. With local=True scores are clamped at 0
+    (Smith-Waterman) and the traceback starts from the best cell.
+    """
+    m, n = len(a), len(b)
+    if band is None:
+        width = n + 1
+        lows = np.zeros(m + 1, dtype=np.int64)
+    elif xdrop is not None or local:
+        # the end is not fixed, so follow the main diagonal
+        width = 2 * band + 1
+        lows = np.arange(m + 1) - band
+    else:
+        width = 2 * band + 1
+        lows = (np.arange(m + 1) * n) // max(m, 1) - band
+
+    neg = -np.inf
+    cols = np.arange(width)
+    sub = _substitution_rows(b, match, mismatch, np.float64)
+
+    flags = np.zeros((m + 1, width), dtype=np.uint8)
+
+    # Row 0: only horizontal gaps
+    j = lows[0] + cols
+    inside = (j >= 0) & (j <= n)
+    H = np.where(inside & (j > 0), gap_open + (j - 1) * gap_extend, neg)
+    H[j == 0] = 0
+    X = np.full(width, neg)
+    flags[0] = np.where(j > 1, _Y_EXTEND, 0) | (LEFT << _STATE_SHIFT)
+    if local:
+        H[inside] = 0
+        flags[0] = STOP << _STATE_SHIFT
+
+    best, best_i, best_j = 0.0, 0, 0
+    padded_h = np.full(width + 2, neg)
+    padded_x = np.full(width + 2, neg)
+    for i in range(1, m + 1):
+        shift = lows[i] - lows[i - 1]
+        j = lows[i] + cols
+        inside = (j >= 0) & (j <= n)
+
+        # previous row values at column j (same) and j - 1 (diag); padded_*[1 + k] = row[k]
+        padded_h[1:-1] = H
+        padded_x[1:-1] = X
+        h_same = padded_h[1 + shift:1 + shift + width]
+        x_same = padded_x[1 + shift:1 + shift + width]
+        h_diag = padded_h[shift:shift + width]
+
+        scores = np.full(width, neg)
+        cells = inside & (j > 0)
+        scores[cells] = sub(a[i - 1])[j[cells] - 1]
+        D = h_diag + scores
+
+        x_open = h_same + gap_open
+        x_ext = x_same + gap_extend
+        X = np.maximum(x_open, x_ext)
+        E = np.maximum(D, X)
+
+        # Y[k] = max over l < k of E[l] + open + (k - 1 - l) * extend
+        Y = np.full(width, neg)
+        run = np.maximum.accumulate(E - cols * gap_extend)
+        Y[1:] = run[:-1] + gap_open + (cols[1:] - 1) * gap_extend
+
+        H = np.maximum(E, Y)
+        H[~inside] = neg
+        X[~inside] = neg
+
+        state = np.where(D >= X, DIAG, UP)
+        state = np.where(Y > np.maximum(D, X), LEFT, state)
+        if local:
+            start = inside & (H <= 0)
+            H[start] = 0
+            state[start] = STOP
+        y_open = np.full(width, neg)
+        y_open[1:] = E[:-1] + gap_open
+        flags[i] = ((X > D) * _FROM_X
+                    | (x_ext > x_open) * _X_EXTEND
+                    | (Y > y_open) * _Y_EXTEND
+                    | (state.astype(np.uint8) << _STATE_SHIFT))
+
+        if xdrop is not None or local:
+            k = int(np.argmax(H))
+            if H[k] > best:
+                best, best_i, best_j = H[k], i, int(j[k])
+            if xdrop is not None and H[k] < best - xdrop:
+                return flags[:i + 1], lows, best_i, best_j, best
+
+    if local:
+        return flags, lows, best_i, best_j, best
+
+    end_k = n - lows[m]
+    if not 0 <= end_k < width or H[end_k] == neg:
+        raise ValueError("The band does not reach the end of the alignment; increase `band`")
+    if xdrop is not None and best > H[end_k]:
+        # the global end scores lower than an earlier cell: report the extension
+        return flags, lows, best_i, best_j, best
+    return flags, lows, m, n, H[end_k]
+
+
+def _affine_traceback(flags, lows, i, j):
+    """Returns (ops, start_i, start_j) walking back from cell (i, j)."""
+    ops = []
+    state = (flags[i, j - lows[i]] >> _STATE_SHIFT) & 3
+    while (i > 0 or j > 0) and state != STOP:
+        cell = flags[i, j - lows[i]]
+        if state == DIAG:
+            ops.append(DIAG)
+            i -= 1
+            j -= 1
+            state = (flags[i, j - lows[i]] >> _STATE_SHIFT) & 3
+        elif state == UP:
+            ops.append(UP)
+            i -= 1
+            if not cell & _X_EXTEND:
+                state = (flags[i, j - lows[i]] >> _STATE_SHIFT) & 3
+        else:
+            ops.append(LEFT)
+            j -= 1
+            if not cell & _Y_EXTEND:
+                state = UP if flags[i, j - lows[i]] & _FROM_X else DIAG
+        if state == STOP:
+            break
+        if i == 0 and j > 0:
+            state = LEFT
+        elif j == 0 and i > 0:
+            state = UP
+    ops.reverse()
+    return ops, i, j
+
+
+def affine_align(seq1, seq2, match=1, mismatch=-1, gap_open=-2, gap_extend=-1, band=None, xdrop=None):
+    """
+    Global alignment with affine gaps (Gotoh): a gap of length L scores
+    gap_open + (L - 1) * gap_extend.
+
+    band:  only cells within +/- band diagonals of the straight path from
+           (0, 0) to the end are evaluated, so time and memory are
+           O(len * band) instead of O(len1 * len2). Use it for similar
+           sequences; a ValueError is raised if the band misses the end.
+    xdrop: stop as soon as the best score in a row falls more than `xdrop`
+           below the best score seen so far, and end the alignment at the
+           best-scoring cell, i.e. align the best-scoring prefixes. With a
+           band, the band then follows the main diagonal.
+
+    Returns (aligned1, aligned2, score, matches) like global_align.
+    """
+    a, b = upper_bytes(seq2), upper_bytes(seq1)
+    swap = len(b) > len(a)
+    if swap:
+        # rows along the longer sequence keep the band's slope <= 1
+        a, b = b, a
+    flags, lows, end_i, end_j, score = _affine_fill(a, b, match, mismatch, gap_open, gap_extend, band, xdrop)
+    ops, _, _ = _affine_traceback(flags, lows, end_i, end_j)
+    row_a, row_b, matches, _, _ = _render(ops, a[:end_i], b[:end_j])
+    if float(score).is_integer():
+        score = int(score)
+    if swap:
+        return row_a, row_b, score, matches
+    return row_b, row_a, score, matches
+
+
+def local_align(seq1, seq2, match=2, mismatch=-3, gap_open=-5, gap_extend=-2, band=None):
+    """
+    Smith-Waterman local alignment with affine gaps, optionally limited to
+    +/- band diagonals around the main diagonal (banded Smith-Waterman).
+
+    Returns (aligned1, aligned2, score, matches, span) where span is
+    (start1, end1, start2, end2), 0-based half-open coordinates of the
+    aligned parts of seq1 and seq2.
+    """
+    a, b = upper_bytes(seq2), upper_bytes(seq1)
+    flags, lows, end_i, end_j, score = _affine_fill(a, b, match, mismatch, gap_open, gap_extend,
+                                                    band, None, local=True)
+    if score <= 0:
+        return "", "", 0, 0, (0, 0, 0, 0)
+    ops, start_i, start_j = _affine_traceback(flags, lows, end_i, end_j)
+    row_a, row_b, matches, _, _ = _render(ops, a[start_i:end_i], b[start_j:end_j])
+    if float(score).is_integer():
+        score = int(score)
+    return row_b, row_a, score, matches, (start_j, end_j, start_i, end_i)
@@ -0,0 +1,284 @@
+"""
+Genome assembly from reads: greedy overlap graph and de Bruijn graph.
+
+Overlap mode indexes the integer code of every read's first `seed` bases.
+Each k-mer of each read (all reads joined with N separators and coded in one
+pass) is looked up in that sorted prefix index, so a candidate overlap is
+every read whose prefix occurs at some offset of another read. Candidates
+are verified by string comparison, contained reads are dropped and the
+longest overlaps are accepted greedily (one successor and one predecessor
+per read, no cycles).
+
+De Bruijn mode counts the k-mers of all reads, links each k-mer to the
+next one wherever the (k-1)-mer between them has exactly one way in and one
+way out, and compacts those runs into unitigs with pointer jumping (list
+ranking) instead of walking them base by base. Unitigs are then joined along
+Eulerian walks of the unitig graph (Hierholzer). Reads are taken as given;
+reverse complements are not merged.
+"""
+
+import numpy as np
+
+from .encoding import ALPHABET
+from .kmers import MAX_K, as_strings, kmer_positions
+
+
+def n50(lengths):
+    """Length L such that contigs of length >= L hold at least half of the total."""
+    lengths = np.sort(np.asarray(lengths, dtype=np.int64))[::-1]
+    if len(lengths) == 0:
+        return 0
+    cumulative = np.cumsum(lengths)
+    return int(lengths[np.searchsorted(cumulative, cumulative[-1] / 2)])
+
+
+def assembly_stats(contigs):
+    """Returns {contigs, total, longest, n50} of a list of contig sequences."""
+    lengths = [len(contig) for contig in contigs]
+    return {
+        'contigs': len(lengths),
+        'total': int(sum(lengths)),
+        'longest': max(lengths, default=0),
+        'n50': n50(lengths),
+    }
+
+
+def _joined_kmers(reads, k):
+    """(codes, read index, offset in read) of every valid k-mer of every read."""
+    offsets = np.cumsum([0] + [len(read) + 1 for read in reads[:-1]])
+    codes, starts = kmer_positions("N".join(reads), k)
+    which = np.searchsorted(offsets, starts, side='right') - 1
+    return codes, which, starts - offsets[which]
+
+
+# ---------------------------------------------------------------------------
+# Overlap graph
+# ---------------------------------------------------------------------------
+
+def find_overlaps(reads, min_overlap, seed=None):
+    """
+    Exact suffix-prefix overlaps of at least min_overlap bases.
+    Returns (edges, contained): a list of (a, b, overlap) read index
+    triples and the set of reads contained in another read.
+    """
+    seed = min(seed or min_overlap, min_overlap, MAX_K)
+    codes, which, offset = _joined_kmers(reads, seed)
+
+    # --- prefix index: first `seed` bases of each read ---
+    is_prefix = offset == 0
+    prefix_codes, prefix_reads = codes[is_prefix], which[is_prefix]
+    order = np.argsort(prefix_codes, kind='stable')
+    prefix_codes, prefix_reads = prefix_codes[order], prefix_reads[order]
+
+    lo = np.searchsorted(prefix_codes, codes, side='left')
+    hi = np.searchsorted(prefix_codes, codes, side='right')
+    counts = hi - lo
+    a = np.repeat(which, counts)
+    o = np.repeat(offset, counts)
+    run_starts = np.cumsum(counts) - counts
+    b = prefix_reads[np.repeat(lo, counts) + np.arange(len(a)) - np.repeat(run_starts, counts)]
+
+    lengths = np.array([len(read) for read in reads])
+    remaining = lengths[a] - o
+    keep = (a != b) & ((remaining >= min_overlap) | (lengths[b] <= remaining))
+    edges, contained = [], set()
+    for a_i, o_i, b_i in zip(a[keep].tolist(), o[keep].tolist(), b[keep].tolist()):
+        read_a, read_b = reads[a_i], reads[b_i]
+        overlap = len(read_a) - o_i
+        if len(read_b) <= overlap:
+            if read_a.startswith(read_b, o_i):
+                contained.add(b_i)
+        elif read_b.startswith(read_a[o_i:]):
+            edges.append((a_i, b_i, overlap))
+    return edges, contained
+
+
+def overlap_assemble(reads, min_overlap=70, seed=None):
+    """
+    Greedy overlap-graph assembly. Returns the contigs, longest first.
+    Identical reads are merged and reads contained in others are dropped.
+    """
+    reads = list(dict.fromkeys(reads))
+    if not reads:
+        return []
+    edges, contained = find_overlaps(reads, min_overlap, seed)
+
+    successor, has_predecessor = {}, set()
+    parent = list(range(len(reads)))
+
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for a, b, overlap in sorted(edges, key=lambda edge: -edge[2]):
+        if a in contained or b in contained or a in successor or b in has_predecessor:
+            continue
+        root_a, root_b = find(a), find(b)
+        if root_a == root_b:
+            continue  # would close a cycle
+        parent[root_b] = root_a
+        successor[a] = (b, overlap)
+        has_predecessor.add(b)
+
+    contigs = []
+    for start in range(len(reads)):
+        if start in contained or start in has_predecessor:
+            continue
+        parts = [reads[start]]
+        current = start
+        while current in successor:
+            current, overlap = successor[current]
+            parts.append(reads[current][overlap:])
+        contigs.append("".join(parts))
+    contigs.sort(key=len, reverse=True)
+    return contigs
+
+
+# ---------------------------------------------------------------------------
+# De Bruijn graph
+# ---------------------------------------------------------------------------
+
+def _list_rank(pred):
+    """
+    Pointer jumping over predecessor links (-1 = head). Returns (head, rank)
+    of every element; elements on cycles get head -1.
+    """
+    count = len(pred)
+    head = np.where(pred < 0, np.arange(count), pred)
+    rank = (pred >= 0).astype(np.int64)
+    for _ in range(max(count, 1).bit_length() + 1):
+        jump = head[head]
+        if np.array_equal(jump, head):
+            break
+        rank = rank + rank[head]
+        head = jump
+    on_cycle = pred[head] >= 0
+    head[on_cycle] = -1
+    return head, rank
+
+
+def unitigs(kmers, k):
+    """
+    Compacts the de Bruijn graph whose edges are the distinct k-mer codes
+    `kmers`. Returns the list of unitig sequences.
+    """
+    kmers = np.unique(np.asarray(kmers, dtype=np.uint64))
+    if len(kmers) == 0:
+        return []
+    mask = np.uint64((1 << (2 * (k - 1))) - 1)
+    prefix = kmers >> np.uint64(2)
+    suffix = kmers & mask
+
+    # in/out degree of every (k-1)-mer node
+    nodes = np.unique(np.concatenate([prefix, suffix]))
+    out_degree = np.bincount(np.searchsorted(nodes, prefix), minlength=len(nodes))
+    in_degree = np.bincount(np.searchsorted(nodes, suffix), minlength=len(nodes))
+    simple = (in_degree == 1) & (out_degree == 1)
+
+    # edge -> next edge through a 1-in-1-out node (edges are sorted by prefix)
+    by_prefix = np.argsort(prefix, kind='stable')
+    suffix_node = np.searchsorted(nodes, suffix)
+    follows = simple[suffix_node]
+    nxt = np.full(len(kmers), -1, dtype=np.int64)
+    nxt[follows] = by_prefix[np.searchsorted(prefix[by_prefix], suffix[follows])]
+    pred = np.full(len(kmers), -1, dtype=np.int64)
+    pred[nxt[follows]] = np.flatnonzero(follows)
+
+    # break every cycle of simple nodes at its smallest edge
+    head, rank = _list_rank(pred)
+    cycle = head < 0
+    if cycle.any():
+        index = np.arange(len(kmers))
+        link = np.where(cycle, pred, index)
+        smallest = index.copy()
+        for _ in range(len(kmers).bit_length() + 1):
+            smallest = np.minimum(smallest, smallest[link])
+            link = link[link]
+        pred[cycle & (smallest == index)] = -1
+        head, rank = _list_rank(pred)
+
+    order = np.lexsort((rank, head))
+    heads = np.flatnonzero(pred < 0)
+    first = np.searchsorted(head[order], heads)
+    last_bases = np.frombuffer(ALPHABET.encode(), dtype=np.uint8)[(kmers[order] & np.uint64(3)).astype(np.int64)]
+    starts = as_strings(kmers[heads], k)
+    ends = np.append(first[1:], len(order))
+    return [start + last_bases[lo + 1:hi].tobytes().decode()
+            for start, lo, hi in zip(starts, first.tolist(), ends.tolist())]
+
+
+def _eulerian_walks(sources, targets, node_count):
+    """
+    Splits the edges of a directed multigraph into Eulerian walks
+    (Hierholzer), starting from nodes with more outgoing than incoming
+    edges. Returns lists of edge indices.
+    """
+    adjacency = [[] for _ in range(node_count)]
+    for edge in range(len(sources) - 1, -1, -1):
+        adjacency[sources[edge]].append(edge)
+    balance = np.bincount(sources, minlength=node_count) - np.bincount(targets, minlength=node_count)
+    starts = [node for node in np.flatnonzero(balance > 0).tolist() for _ in range(balance[node])]
+    starts += list(range(node_count))
+
+    walks = []
+    for start in starts:
+        if not adjacency[start]:
+            continue
+        stack, trail = [(start, -1)], []
+        while stack:
+            node, edge = stack[-1]
+            if adjacency[node]:
+                out = adjacency[node].pop()
+                stack.append((targets[out], out))
+            else:
+                stack.pop()
+                if edge >= 0:
+                    trail.append(edge)
+        trail.reverse()
+        # a stuck walk can splice branches that do not connect: split there
+        walk = [trail[0]]
+        for edge in trail[1:]:
+            if sources[edge] != targets[walk[-1]]:
+                walks.append(walk)
+                walk = []
+            walk.append(edge)
+        walks.append(walk)
+    return walks
+
+
+def debruijn_assemble(reads, k=31, min_count=1, euler=True):
+    """
+    De Bruijn graph assembly. K-mers seen fewer than min_count times are
+    treated as errors and dropped. Returns unitigs, or with euler=True the
+    contigs spelled by Eulerian walks through the unitig graph; longest first.
+    """
+    if not 2 <= k <= MAX_K:
+        raise ValueError(f"k must be between 2 and {MAX_K}, got {k}")
+    reads = list(reads)
+    if not reads:
+        return []
+    codes, _, _ = _joined_kmers(reads, k)
+    kmers, counts = np.unique(codes, return_counts=True)
+    contigs = unitigs(kmers[counts >= min_count], k)
+
+    if euler and contigs:
+        ends = [contig[:k - 1] for contig in contigs] + [contig[-(k - 1):] for contig in contigs]
+        names = {node: i for i, node in enumerate(dict.fromkeys(ends))}
+        sources = np.array([names[contig[:k - 1]] for contig in contigs])
+        targets = np.array([names[contig[-(k - 1):]] for contig in contigs])
+        contigs = [contigs[walk[0]] + "".join(contigs[edge][k - 1:] for edge in walk[1:])
+                   for walk in _eulerian_walks(sources, targets, len(names))]
+
+    contigs.sort(key=len, reverse=True)
+    return contigs
+
+
+def assemble(reads, mode='overlap', **options):
+    """Assembles reads with mode 'overlap' (overlap_assemble) or 'debruijn' (debruijn_assemble)."""
+    if mode == 'overlap':
+        return overlap_assemble(reads, **options)
+    if mode == 'debruijn':
+        return debruijn_assemble(reads, **options)
+    raise ValueError(f"Unknown assembly mode '{mode}' (expected 'overlap' or 'debruijn')")
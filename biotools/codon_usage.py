@@ -0,0 +1,157 @@
+"""
+Codon usage statistics as matrix operations.
+
+Each gene or record becomes a 64-bin vector of codon counts (one `bincount`
+over its codon codes), and a collection becomes a (records, 64) count
+matrix. Synonymous codon families are a (64, families) membership matrix
+built from a genetic code of the registry (NCBI id), so RSCU, relative adaptiveness, the
+Codon Adaptation Index and the effective number of codons (ENC) are a few
+matrix products over the whole collection at once.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+import numpy as np
+
+from .genetic_code import INVALID_CODON, genetic_code
+from .translate import codon_codes
+
+
+def codon_counts(seq, frame=0):
+    """64-bin codon count vector of one frame (codons with N or other symbols are skipped)."""
+    values = codon_codes(seq, frame)
+    return np.bincount(values[values != INVALID_CODON], minlength=64)
+
+
+def count_matrix(sequences, workers=1):
+    """
+    (len(sequences), 64) codon count matrix. Counting is serial by default;
+    workers > 1 (or None for one per CPU) spreads large collections over a
+    process pool.
+    """
+    sequences = list(sequences)
+    if workers is None or workers > 1:
+        workers = workers or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            rows = list(executor.map(codon_counts, sequences, chunksize=max(1, len(sequences) // (4 * workers))))
+    else:
+        rows = [codon_counts(seq) for seq in sequences]
+    return np.array(rows, dtype=np.int64).reshape(-1, 64)
+
+
+def families(table=1):
+    """
+    Returns (letters, membership): the amino-acid letter of every synonymous
+    family (stop codons form the '*' family) and the (64, families) 0/1
+    matrix assigning codons to families. Built once per genetic code.
+    """
+    return _families(genetic_code(table))
+
+
+@lru_cache(maxsize=None)
+def _families(code):
+    amino_acids = code.letters[:64]
+    letters = np.unique(amino_acids)
+    membership = (amino_acids[:, None] == letters[None, :]).astype(np.float64)
+    return letters.tobytes().decode('ascii'), membership
+
+
+def rscu(counts, table=1):
+    """
+    Relative synonymous codon usage: each codon's count divided by the mean
+    count of its family. Rows of codons from unused families are 0.
+    """
+    counts = np.atleast_2d(counts).astype(np.float64)
+    _, membership = families(table)
+    expected = (counts @ membership / membership.sum(axis=0)) @ membership.T
+    return np.divide(counts, expected, out=np.zeros_like(counts), where=expected > 0)
+
+
+def _informative(table):
+    """Mask of the codons used for CAI/ENC: sense codons of families with 2+ codons."""
+    letters, membership = families(table)
+    sizes = membership.sum(axis=0)
+    stop = np.array([letter == '*' for letter in letters])
+    return (membership @ ((sizes > 1) & ~stop)) > 0
+
+
+def relative_adaptiveness(reference_counts, table=1, pseudocount=0.5):
+    """
+    Weights w of every codon from a reference set (e.g. highly expressed
+    genes): RSCU divided by the largest RSCU of its family. Codons never
+    seen in the reference get `pseudocount` instead of 0.
+    """
+    totals = np.atleast_2d(reference_counts).sum(axis=0).astype(np.float64)
+    totals[totals == 0] = pseudocount
+    values = rscu(totals, table)[0]
+    _, membership = families(table)
+    family_max = (membership * values[:, None]).max(axis=0)
+    return values / (membership @ family_max)
+
+
+def cai(counts, weights, table=1):
+    """Codon Adaptation Index of each row: geometric mean of w over its informative codons."""
+    counts = np.atleast_2d(counts).astype(np.float64)
+    used = _informative(table)
+    total = counts[:, used].sum(axis=1)
+    score = counts[:, used] @ np.log(weights[used])
+    return np.exp(np.divide(score, total, out=np.full_like(total, np.nan), where=total > 0))
+
+
+def enc(counts, table=1):
+    """
+    Effective number of codons (Wright 1990) of each row. Families are grouped
+    by degeneracy; a class with no usable family counts as uniform usage.
+    The result is capped at the number of sense codons.
+    """
+    counts = np.atleast_2d(counts).astype(np.float64)
+    letters, membership = families(table)
+    sense = np.array([letter != '*' for letter in letters])
+    membership = membership[:, sense]
+    sizes = membership.sum(axis=0)
+
+    n = counts @ membership
+    squares = (counts ** 2) @ membership
+    usable = n > 1
+    homozygosity = np.divide(squares / np.where(usable, n, 1) - 1, n - 1,
+                             out=np.zeros_like(n), where=usable)
+
+    result = np.full(len(counts), float(np.count_nonzero(sizes == 1)))
+    for size in np.unique(sizes[sizes > 1]):
+        group = sizes == size
+        used = usable[:, group].sum(axis=1)
+        mean = np.divide(homozygosity[:, group].sum(axis=1), used,
+                         out=np.full(len(counts), 1.0 / size), where=used > 0)
+        result += np.count_nonzero(group) / np.maximum(mean, 1.0 / size)
+    return np.minimum(result, sizes.sum())
+
+
+def usage_table(records, reference=None, table=1, workers=1):
+    """
+    Codon usage of (name, sequence) records in a single table:
+    {'names', 'counts' (n, 64), 'rscu' (n, 64), 'enc' (n,), 'cai' (n,)}.
+    CAI weights come from the rows whose names are in `reference`, or from
+    the whole collection when no reference is given; reference names that
+    match no record raise ValueError.
+    """
+    records = list(records)
+    names = [name for name, _ in records]
+    counts = count_matrix((seq for _, seq in records), workers)
+    if reference:
+        wanted = set(reference)
+        missing = wanted.difference(names)
+        if missing:
+            raise ValueError(f"Reference names not found in the records: {sorted(missing)}")
+        rows = [i for i, name in enumerate(names) if name in wanted]
+    else:
+        rows = slice(None)
+    weights = relative_adaptiveness(counts[rows], table)
+    return {
+        'names': names,
+        'counts': counts,
+        'rscu': rscu(counts, table),
+        'enc': enc(counts, table),
+        'cai': cai(counts, weights, table),
+    }
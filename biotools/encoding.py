@@ -0,0 +1,76 @@
+"""
+Integer encoding of nucleotide sequences shared by the NumPy kernels.
+
+A=0, C=1, G=2, T/U=3 and every other symbol (N, IUPAC codes, gaps) is 4.
+Lowercase letters are encoded like uppercase ones. Where ambiguity matters,
+IUPAC symbols can instead be encoded as 4-bit base sets (A=1, C=2, G=4,
+T=8; N=15, gaps and unknown symbols 0).
+"""
+
+import numpy as np
+
+ALPHABET = "ACGT"
+OTHER = 4
+
+_ENCODE = np.full(256, OTHER, dtype=np.uint8)
+for _i, _base in enumerate(ALPHABET):
+    _ENCODE[ord(_base)] = _i
+    _ENCODE[ord(_base.lower())] = _i
+_ENCODE[ord('U')] = _ENCODE[ord('u')] = 3
+
+IUPAC_BASES = {
+    'A': 'A', 'C': 'C', 'G': 'G', 'T': 'T', 'U': 'T',
+    'R': 'AG', 'Y': 'CT', 'S': 'CG', 'W': 'AT', 'K': 'GT', 'M': 'AC',
+    'B': 'CGT', 'D': 'AGT', 'H': 'ACT', 'V': 'ACG', 'N': 'ACGT',
+}
+_ENCODE_IUPAC = np.zeros(256, dtype=np.uint8)
+for _symbol, _bases in IUPAC_BASES.items():
+    _ENCODE_IUPAC[ord(_symbol)] = _ENCODE_IUPAC[ord(_symbol.lower())] = sum(1 << ALPHABET.index(b) for b in _bases)
+# complementing a base set reverses its 4 bits (A <-> T, C <-> G)
+_COMPLEMENT_IUPAC = np.array([int(f"{m:04b}"[::-1], 2) for m in range(16)], dtype=np.uint8)
+
+_UPPER = np.frombuffer(bytes(range(256)).upper(), dtype=np.uint8)
+_DECODE = np.frombuffer(b"ACGTN", dtype=np.uint8)
+_COMPLEMENT = np.array([3, 2, 1, 0, OTHER], dtype=np.uint8)
+
+
+def as_bytes(seq):
+    """Returns the raw ASCII bytes of a str/bytes sequence as a uint8 array."""
+    if isinstance(seq, str):
+        seq = seq.encode('ascii')
+    return np.frombuffer(seq, dtype=np.uint8)
+
+
+def upper_bytes(seq):
+    """Like as_bytes, with ASCII letters converted to uppercase."""
+    return _UPPER[as_bytes(seq)]
+
+
+def encode(seq):
+    """
+    Encodes a str, bytes or PackedSeq into a uint8 array of codes 0-4.
+    NumPy arrays are assumed to hold codes already and are returned as-is.
+    """
+    if hasattr(seq, 'codes'):
+        return seq.codes()
+    if isinstance(seq, np.ndarray):
+        return seq
+    return _ENCODE[as_bytes(seq)]
+
+
+def decode(codes):
+    """Turns an array of codes 0-4 back into an uppercase string (4 -> N)."""
+    return _DECODE[np.asarray(codes, dtype=np.uint8)].tobytes().decode('ascii')
+
+
+def reverse_complement_codes(codes):
+    return _COMPLEMENT[codes[::-1]]
+
+
+def encode_iupac(seq):
+    """Encodes a str or bytes sequence into a uint8 array of 4-bit base sets."""
+    return _ENCODE_IUPAC[as_bytes(seq)]
+
+
+def reverse_complement_iupac(masks):
+    return _COMPLEMENT_IUPAC[masks[::-1]]
@@ -0,0 +1,123 @@
+"""
+Assembly evaluation against a reference genome.
+
+Contigs are placed on the reference by k-mer voting: every contig k-mer is
+looked up in a sorted k-mer index of the reference (both strands) and the
+most frequent (strand, diagonal) wins. The contig is then compared base by
+base with the reference at that offset (ungapped) to count mismatches.
+Per-base read depth and contig coverage come from a difference array: +1
+at each start, -1 at each end, and one cumulative sum.
+"""
+
+import numpy as np
+
+from .assembly import n50
+from .encoding import OTHER, encode, reverse_complement_codes as reverse_complement_bases
+from .kmers import kmer_positions, reverse_complement_codes
+from .local import SeedIndex
+
+MAPPING_DTYPE = np.dtype([('contig', 'i8'), ('ref_start', 'i8'), ('ref_end', 'i8'), ('strand', 'i1'),
+                          ('aligned', 'i8'), ('mismatches', 'i8'), ('support', 'i8')])
+
+
+def depth(length, starts, ends):
+    """Per-base depth of [start, end) intervals over positions 0..length-1."""
+    starts = np.clip(np.asarray(starts, dtype=np.int64), 0, length)
+    ends = np.clip(np.asarray(ends, dtype=np.int64), 0, length)
+    diff = np.bincount(starts, minlength=length + 1) - np.bincount(ends, minlength=length + 1)
+    return np.cumsum(diff[:length])
+
+
+def read_coverage(reference_length, starts, lengths):
+    """Per-base read depth of reads given by their start positions and lengths."""
+    starts = np.asarray(starts, dtype=np.int64)
+    return depth(reference_length, starts, starts + np.asarray(lengths, dtype=np.int64))
+
+
+def map_contigs(contigs, reference, k=21, index=None):
+    """
+    Places each contig on the reference. Returns a MAPPING_DTYPE array with
+    one row per placed contig: reference span, strand, number of bases
+    compared, mismatches and the number of k-mers supporting the placement.
+    Contigs without any shared k-mer are left out.
+    """
+    ref = encode(reference)
+    index = index or SeedIndex(ref, k)
+    rows = []
+    for number, contig in enumerate(contigs):
+        codes, starts = kmer_positions(contig, k)
+        best = None
+        for strand, values in ((1, codes), (-1, reverse_complement_codes(codes, k))):
+            which, positions = index.lookup(values, max_occurrences=None)
+            if len(which) == 0:
+                continue
+            if strand > 0:
+                offsets = positions - starts[which]
+            else:
+                # reverse strand: contig position p maps to reference end - p
+                offsets = positions + k + starts[which]
+            values, counts = np.unique(offsets, return_counts=True)
+            top = int(np.argmax(counts))
+            if best is None or counts[top] > best[2]:
+                best = (strand, int(values[top]), int(counts[top]))
+        if best is None:
+            continue
+
+        strand, offset, support = best
+        query = encode(contig)
+        if strand < 0:
+            query = reverse_complement_bases(query)
+            offset -= len(query)
+        ref_start, ref_end = max(offset, 0), min(offset + len(query), len(ref))
+        if ref_end <= ref_start:
+            continue
+        part = query[ref_start - offset:ref_end - offset]
+        target = ref[ref_start:ref_end]
+        compared = (part != OTHER) & (target != OTHER)
+        mismatches = int(np.count_nonzero(compared & (part != target)))
+        rows.append((number, ref_start, ref_end, strand, int(compared.sum()), mismatches, support))
+    return np.array(rows, dtype=MAPPING_DTYPE)
+
+
+def evaluate(contigs, reference, k=21, read_starts=None, read_lengths=None):
+    """
+    Quality report of an assembly against its reference, as a dict:
+    contigs, total, longest, n50, mapped, genome_fraction (% of reference
+    bases covered by a placed contig), mismatch_rate (per compared base),
+    and with read positions also mean_depth, zero_depth and 'coverage',
+    the per-base read depth array.
+    """
+    lengths = [len(contig) for contig in contigs]
+    reference_length = len(reference)
+    mappings = map_contigs(contigs, reference, k)
+    covered = depth(reference_length, mappings['ref_start'], mappings['ref_end']) > 0
+    aligned = int(mappings['aligned'].sum())
+
+    report = {
+        'contigs': len(lengths),
+        'total': int(sum(lengths)),
+        'longest': max(lengths, default=0),
+        'n50': n50(lengths),
+        'mapped': len(mappings),
+        'genome_fraction': 100.0 * float(covered.mean()) if reference_length else 0.0,
+        'mismatch_rate': int(mappings['mismatches'].sum()) / aligned if aligned else 0.0,
+    }
+    if read_starts is not None:
+        coverage = read_coverage(reference_length, read_starts, read_lengths)
+        report['mean_depth'] = float(coverage.mean()) if reference_length else 0.0
+        report['zero_depth'] = int(np.count_nonzero(coverage == 0))
+        report['coverage'] = coverage
+    return report
+
+
+def save_coverage(filename, coverage):
+    """Saves a depth array compressed, in the smallest unsigned type that holds it."""
+    coverage = np.asarray(coverage)
+    peak = int(coverage.max(initial=0))
+    dtype = np.uint8 if peak < 2 ** 8 else np.uint16 if peak < 2 ** 16 else np.uint32
+    np.savez_compressed(filename, coverage=coverage.astype(dtype))
+
+
+def load_coverage(filename):
+    with np.load(filename) as data:
+        return data['coverage']
@@ -0,0 +1,174 @@
+"""
+Indexed random access to FASTA files, compatible with `samtools faidx`.
+
+The index (``<file>.fai``) stores one line per record:
+name, length, byte offset of the first base, bases per line, bytes per line.
+With it any slice of a record is located with line-length arithmetic and read
+straight from a memory map, without touching the rest of the file.
+"""
+
+import mmap
+import os
+
+
+def index_path(filename):
+    return filename + ".fai"
+
+
+def build_index(filename):
+    """
+    Scans a FASTA file once and returns its index as a dict
+    {name: (length, offset, line_bases, line_width)} (insertion ordered).
+    Every line of a record except the last must have the same length.
+    """
+    index = {}
+    name = None
+    length = offset = line_bases = line_width = 0
+    short_line_seen = False
+    pos = 0
+
+    with open(filename, 'rb') as f:
+        for raw in f:
+            line_len = len(raw)
+            if raw.startswith(b'>'):
+                if name is not None:
+                    index[name] = (length, offset, line_bases, line_width)
+                name = raw[1:].split(None, 1)[0].decode() if raw[1:].strip() else ""
+                if name in index:
+                    raise ValueError(f"Duplicate record name '{name}' in {filename}")
+                length = line_bases = line_width = 0
+                offset = pos + line_len
+                short_line_seen = False
+            elif name is not None:
+                bases = len(raw.rstrip(b'\r\n'))
+                if bases == 0:
+                    short_line_seen = True
+                elif line_bases == 0:
+                    line_bases, line_width = bases, line_len
+                elif short_line_seen or bases > line_bases:
+                    raise ValueError(f"Record '{name}' in {filename} has uneven line lengths; cannot index it")
+                elif bases < line_bases or line_len != line_width:
+                    short_line_seen = True
+                length += bases
+            pos += line_len
+
+    if name is not None:
+        index[name] = (length, offset, line_bases, line_width)
+    return index
+
+
+def write_index(index, filename):
+    with open(filename, 'w') as f:
+        for name, (length, offset, line_bases, line_width) in index.items():
+            f.write(f"{name}\t{length}\t{offset}\t{line_bases}\t{line_width}\n")
+
+
+def read_index(filename):
+    index = {}
+    with open(filename, 'r') as f:
+        for line in f:
+            fields = line.rstrip('\r\n').split('\t')
+            if len(fields) < 5:
+                continue
+            index[fields[0]] = tuple(int(x) for x in fields[1:5])
+    return index
+
+
+def load_index(filename):
+    """
+    Returns the index of a FASTA file, reading ``<file>.fai`` when it is newer
+    than the FASTA and (re)building and saving it otherwise.
+    """
+    fai = index_path(filename)
+    if os.path.exists(fai) and os.path.getmtime(fai) >= os.path.getmtime(filename):
+        return read_index(fai)
+
+    index = build_index(filename)
+    try:
+        write_index(index, fai)
+    except OSError:
+        pass  # read-only location: keep the index in memory only
+    return index
+
+
+class FastaIndex:
+    """
+    Memory-mapped reader over an indexed FASTA file.
+
+        with FastaIndex("genome.fasta") as fa:
+            region = fa.fetch("NC_007795.1", 0, 5000)
+
+    Coordinates are 0-based and half-open, like Python slices.
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+        self.index = load_index(filename)
+        self._file = open(filename, 'rb')
+        if os.path.getsize(filename) > 0:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            self._map = b""
+
+    @property
+    def names(self):
+        return list(self.index)
+
+    def length(self, name):
+        return self.index[name][0]
+
+    def __len__(self):
+        return len(self.index)
+
+    def __contains__(self, name):
+        return name in self.index
+
+    def __iter__(self):
+        return iter(self.index)
+
+    def _byte_pos(self, name, pos):
+        length, offset, line_bases, line_width = self.index[name]
+        if line_bases == 0:
+            return offset
+        return offset + (pos // line_bases) * line_width + pos % line_bases
+
+    def fetch(self, name, start=0, end=None):
+        """Returns bases [start, end) of record `name` as an uppercase string."""
+        if name not in self.index:
+            raise KeyError(f"Record '{name}' not found in {self.filename}")
+        length = self.index[name][0]
+        if end is None or end > length:
+            end = length
+        start = max(0, start)
+        if start >= end:
+            return ""
+
+        first = self._byte_pos(name, start)
+        last = self._byte_pos(name, end - 1) + 1
+        raw = self._map[first:last]
+        return raw.replace(b'\n', b'').replace(b'\r', b'').decode('ascii').upper()
+
+    def header(self, name):
+        """Full header line of record `name` (without '>'), read from the file."""
+        if name not in self.index:
+            raise KeyError(f"Record '{name}' not found in {self.filename}")
+        # the header is the line ending just before the record's sequence offset
+        offset = self.index[name][1]
+        start = self._map.rfind(b'\n', 0, offset - 1) + 1
+        return self._map[start + 1:offset].decode().strip()
+
+    def records(self):
+        """Yields (name, sequence) for every record, one at a time."""
+        for name in self.index:
+            yield name, self.fetch(name)
+
+    def close(self):
+        if isinstance(self._map, mmap.mmap):
+            self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,57 @@
+"""Streaming FASTA/FNA reader shared by all the labs."""
+
+
+class _KeepOnly(dict):
+    """str.translate table that deletes every character not already mapped."""
+
+    def __missing__(self, key):
+        self[key] = None
+        return None
+
+
+def _make_filter(alphabet):
+    table = _KeepOnly()
+    for ch in alphabet:
+        table[ord(ch)] = ord(ch)
+    return table
+
+
+def read_fasta(filename, alphabet=None, upper=True):
+    """
+    Yields (header, sequence) pairs from a FASTA file, one record at a time.
+    Lines are collected in a list and joined once per record, so loading is
+    linear in the file size and only the current record is kept in memory.
+    Handles LF and CRLF line endings; ';' comment lines and '[' annotation
+    lines are skipped. If `alphabet` is given (e.g. "ACGT"), every other
+    character is dropped from the sequence.
+    """
+    keep = _make_filter(alphabet) if alphabet else None
+
+    header = None
+    chunks = []
+    with open(filename, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith((';', '[')):
+                continue
+
+            if line.startswith('>'):
+                if header is not None or chunks:
+                    yield header or "", "".join(chunks)
+                header = line[1:].strip()
+                chunks = []
+                continue
+
+            if upper:
+                line = line.upper()
+            if keep is not None:
+                line = line.translate(keep)
+            chunks.append(line)
+
+    if header is not None or chunks:
+        yield header or "", "".join(chunks)
+
+
+def read_sequence(filename, alphabet=None, upper=True):
+    """Reads every record of a FASTA file and returns them concatenated."""
+    return "".join(seq for _, seq in read_fasta(filename, alphabet, upper))
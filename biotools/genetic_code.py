@@ -0,0 +1,175 @@
+"""
+Registry of the NCBI genetic codes as precomputed lookup arrays.
+
+Every table is stored once as a 65-entry uint8 array of amino-acid letters
+indexed by the integer codon code 16*b1 + 4*b2 + b3 (A=0, C=1, G=2, T=3),
+with 'X' at INVALID_CODON for codons containing other symbols, plus boolean
+start and stop masks. For ambiguous codons (N and IUPAC symbols) a second,
+4096-entry array is indexed by three 4-bit base sets: a codon translates to
+an amino acid only when every codon it can stand for agrees (GCN -> A,
+YTR -> L), and to 'X' otherwise. Tables are built at import time, the
+ambiguity array on first use.
+"""
+
+import numpy as np
+
+from .encoding import ALPHABET
+
+INVALID_CODON = 64
+
+# NCBI tables list codons in TCAG order
+_NCBI_BASES = "TCAG"
+
+# id: (name, amino acids, start codons marked 'M'), from the NCBI gc.prt
+_NCBI_TABLES = {
+    1: ("Standard",
+        "FFLLSSSSYY**CC*WLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG",
+        "---M------**--*----M---------------M----------------------------"),
+    2: ("Vertebrate Mitochondrial",
+        "FFLLSSSSYY**CCWWLLLLPPPPHHQQRRRRIIMMTTTTNNKKSS**VVVVAAAADDEEGGGG",
+        "----------**--------------------MMMM----------**---M------------"),
+    3: ("Yeast Mitochondrial",
+        "FFLLSSSSYY**CCWWTTTTPPPPHHQQRRRRIIMMTTTTNNKKSSRRVVVVAAAADDEEGGGG",
+        "----------**----------------------MM---------------M------------"),
+    4: ("Mold, Protozoan, and Coelenterate Mitochondrial; Mycoplasma; Spiroplasma",
+        "FFLLSSSSYY**CCWWLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG",
+        "--MM------**-------M------------MMMM---------------M------------"),
+    5: ("Invertebrate Mitochondrial",
+        "FFLLSSSSYY**CCWWLLLLPPPPHHQQRRRRIIMMTTTTNNKKSSSSVVVVAAAADDEEGGGG",
+        "---M------**--------------------MMMM---------------M------------"),
+    6: ("Ciliate, Dasycladacean and Hexamita Nuclear",
+        "FFLLSSSSYYQQCC*WLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG",
+        "--------------*--------------------M----------------------------"),
+    9: ("Echinoderm and Flatworm Mitochondrial",
+        "FFLLSSSSYY**CCWWLLLLPPPPHHQQRRRRIIIMTTTTNNNKSSSSVVVVAAAADDEEGGGG",
+        "----------**-----------------------M---------------M------------"),
+    10: ("Euplotid Nuclear",
+         "FFLLSSSSYY**CCCWLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG",
+         "----------**-----------------------M----------------------------"),
+    11: ("Bacterial, Archaeal and Plant Plastid",
+         "FFLLSSSSYY**CC*WLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG",
+         "---M------**--*----M------------MMMM---------------M------------"),
+    12: ("Alternative Yeast Nuclear",
+         "FFLLSSSSYY**CC*WLLLSPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG",
+         "----------**--*----M---------------M----------------------------"),
+    13: ("Ascidian Mitochondrial",
+         "FFLLSSSSYY**CCWWLLLLPPPPHHQQRRRRIIMMTTTTNNKKSSGGVVVVAAAADDEEGGGG",
+         "---M------**----------------------MM---------------M------------"),
+    14: ("Alternative Flatworm Mitochondrial",
+         "FFLLSSSSYYY*CCWWLLLLPPPPHHQQRRRRIIIMTTTTNNNKSSSSVVVVAAAADDEEGGGG",
+         "-----------*-----------------------M----------------------------"),
+    15: ("Blepharisma Macronuclear",
+         "FFLLSSSSYY*QCC*WLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG",
+         "----------*---*--------------------M----------------------------"),
+    16: ("Chlorophycean Mitochondrial",
+         "FFLLSSSSYY*LCC*WLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG",
+         "----------*---*--------------------M----------------------------"),
+    21: ("Trematode Mitochondrial",
+         "FFLLSSSSYY**CCWWLLLLPPPPHHQQRRRRIIMMTTTTNNNKSSSSVVVVAAAADDEEGGGG",
+         "----------**-----------------------M---------------M------------"),
+    22: ("Scenedesmus obliquus Mitochondrial",
+         "FFLLSS*SYY*LCC*WLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG",
+         "------*---*---*--------------------M----------------------------"),
+    23: ("Thraustochytrium Mitochondrial",
+         "FF*LSSSSYY**CC*WLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG",
+         "--*-------**--*-----------------M--M---------------M------------"),
+    24: ("Rhabdopleuridae Mitochondrial",
+         "FFLLSSSSYY**CCWWLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSSKVVVVAAAADDEEGGGG",
+         "---M------**-------M---------------M---------------M------------"),
+    25: ("Candidate Division SR1 and Gracilibacteria",
+         "FFLLSSSSYY**CCGWLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG",
+         "---M------**-----------------------M---------------M------------"),
+    26: ("Pachysolen tannophilus Nuclear",
+         "FFLLSSSSYY**CC*WLLLAPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG",
+         "----------**--*----M---------------M----------------------------"),
+    27: ("Karyorelict Nuclear",
+         "FFLLSSSSYYQQCCWWLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG",
+         "--------------*--------------------M----------------------------"),
+    28: ("Condylostoma Nuclear",
+         "FFLLSSSSYYQQCCWWLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG",
+         "----------**--*--------------------M----------------------------"),
+    29: ("Mesodinium Nuclear",
+         "FFLLSSSSYYYYCC*WLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG",
+         "--------------*--------------------M----------------------------"),
+    30: ("Peritrich Nuclear",
+         "FFLLSSSSYYEECC*WLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG",
+         "--------------*--------------------M----------------------------"),
+    31: ("Blastocrithidia Nuclear",
+         "FFLLSSSSYYEECCWWLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG",
+         "----------**-----------------------M----------------------------"),
+    32: ("Balanophoraceae Plastid",
+         "FFLLSSSSYY*WCC*WLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG",
+         "---M------*---*----M------------MMMM---------------M------------"),
+    33: ("Cephalodiscidae Mitochondrial",
+         "FFLLSSSSYYY*CCWWLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSSKVVVVAAAADDEEGGGG",
+         "---M-------*-------M---------------M---------------M------------"),
+}
+
+THREE_LETTER = {
+    'A': 'Ala', 'R': 'Arg', 'N': 'Asn', 'D': 'Asp', 'C': 'Cys',
+    'Q': 'Gln', 'E': 'Glu', 'G': 'Gly', 'H': 'His', 'I': 'Ile',
+    'L': 'Leu', 'K': 'Lys', 'M': 'Met', 'F': 'Phe', 'P': 'Pro',
+    'S': 'Ser', 'T': 'Thr', 'W': 'Trp', 'Y': 'Tyr', 'V': 'Val',
+    '*': 'Stop', 'X': '?',
+}
+
+CODONS = [a + b + c for a in ALPHABET for b in ALPHABET for c in ALPHABET]
+
+# position of every NCBI (TCAG-ordered) codon in the ACGT code order
+_NCBI_ORDER = np.array([16 * ALPHABET.index(a) + 4 * ALPHABET.index(b) + ALPHABET.index(c)
+                        for a in _NCBI_BASES for b in _NCBI_BASES for c in _NCBI_BASES])
+
+
+class GeneticCode:
+    """
+    One translation table: `letters` (uint8, 65 entries), `starts` and
+    `stops` (bool, 65 entries, False at INVALID_CODON).
+    """
+
+    def __init__(self, ncbi_id, name, amino_acids, start_marks):
+        if len(amino_acids) != 64 or len(start_marks) != 64:
+            raise ValueError(f"Genetic code {ncbi_id} needs 64 amino acids and 64 start marks")
+        self.id = ncbi_id
+        self.name = name
+        self.letters = np.full(INVALID_CODON + 1, ord('X'), dtype=np.uint8)
+        self.letters[_NCBI_ORDER] = np.frombuffer(amino_acids.encode('ascii'), dtype=np.uint8)
+        self.starts = np.zeros(INVALID_CODON + 1, dtype=bool)
+        self.starts[_NCBI_ORDER] = np.frombuffer(start_marks.encode('ascii'), dtype=np.uint8) == ord('M')
+        self.stops = self.letters == ord('*')
+        self._ambiguous = None
+
+    def __repr__(self):
+        return f"GeneticCode({self.id}, '{self.name}')"
+
+    @property
+    def ambiguous(self):
+        """4096-entry letter array indexed by 256*s1 + 16*s2 + s3 (4-bit base sets)."""
+        if self._ambiguous is None:
+            sets = np.arange(16)
+            # members[s, b]: base b belongs to base set s
+            members = (sets[:, None] >> np.arange(4)) & 1 == 1
+            codons = (members[:, None, None, :, None, None] & members[None, :, None, None, :, None]
+                      & members[None, None, :, None, None, :]).reshape(4096, 64)
+            letters = self.letters[:64].astype(np.int16)
+            low = np.where(codons, letters, 256).min(axis=1)
+            high = np.where(codons, letters, -1).max(axis=1)
+            self._ambiguous = np.where(low == high, low, ord('X')).astype(np.uint8)
+        return self._ambiguous
+
+    def start_codons(self):
+        """Start codons of the table as DNA strings."""
+        return [CODONS[code] for code in np.flatnonzero(self.starts).tolist()]
+
+
+CODES = {ncbi_id: GeneticCode(ncbi_id, *table) for ncbi_id, table in _NCBI_TABLES.items()}
+STANDARD = CODES[1]
+
+
+def genetic_code(table=1):
+    """Looks up a GeneticCode by NCBI id; GeneticCode objects are returned as-is."""
+    if isinstance(table, GeneticCode):
+        return table
+    try:
+        return CODES[int(table)]
+    except (KeyError, TypeError, ValueError):
+        raise ValueError(f"Unknown genetic code '{table}' (NCBI ids: {sorted(CODES)})") from None
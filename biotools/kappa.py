@@ -0,0 +1,76 @@
+"""
+Kappa index of coincidence (PromKappa) for single sequences and sliding windows.
+
+For a sequence of length N, IC is the mean over shifts d = 1..N-1 of the
+percentage of positions i with s[i] == s[i + d]. The match counts for all
+shifts are an autocorrelation of per-symbol indicator vectors, so they are
+computed together instead of with a double loop over positions and shifts.
+"""
+
+import numpy as np
+
+from .encoding import upper_bytes
+
+# Above this length the autocorrelation goes through an FFT instead of np.correlate
+FFT_MIN_LENGTH = 512
+
+
+def _symbol_indicators(raw):
+    _, inverse = np.unique(raw, return_inverse=True)
+    for symbol in range(inverse.max() + 1):
+        yield (inverse == symbol).astype(np.float64)
+
+
+def shift_matches(seq):
+    """Array m where m[d - 1] is the number of matching pairs at shift d (d = 1..N-1)."""
+    raw = upper_bytes(seq)
+    n = len(raw)
+    if n < 2:
+        return np.zeros(0, dtype=np.int64)
+
+    total = np.zeros(n - 1)
+    if n < FFT_MIN_LENGTH:
+        for ind in _symbol_indicators(raw):
+            total += np.correlate(ind, ind, 'full')[n:]
+    else:
+        size = 1 << (2 * n - 1).bit_length()
+        for ind in _symbol_indicators(raw):
+            spectrum = np.fft.rfft(ind, size)
+            total += np.fft.irfft(spectrum * np.conj(spectrum), size)[1:n]
+    return np.rint(total).astype(np.int64)
+
+
+def kappa_ic(seq):
+    n = len(seq)
+    if n < 2:
+        return 0.0
+    overlaps = np.arange(n - 1, 0, -1)
+    return float(np.sum(shift_matches(seq) / overlaps) * 100.0 / (n - 1))
+
+
+def kappa_ic_windows(seq, window, step=1):
+    """
+    Kappa IC of every window of length `window` (starts 0, step, 2*step, ...).
+
+    For each shift d the equality track eq_d[i] = (s[i] == s[i + d]) is
+    built once for the whole sequence. Moving a window by one base drops
+    eq_d at its left edge and adds the pair entering on the right, which is
+    a prefix-sum difference, so all windows cost O(len(seq) * window) in
+    total instead of O(window**2) each.
+    """
+    raw = upper_bytes(seq)
+    n = len(raw)
+    if n < window:
+        return np.zeros(0)
+
+    starts = np.arange(0, n - window + 1, step)
+    ic = np.zeros(len(starts))
+    if window < 2:
+        return ic
+    prefix = np.zeros(n + 1, dtype=np.int64)
+    for d in range(1, window):
+        eq = raw[:-d] == raw[d:]
+        np.cumsum(eq, out=prefix[1:n - d + 1])
+        matches = prefix[starts + window - d] - prefix[starts]
+        ic += matches / (window - d)
+    return ic * 100.0 / (window - 1)
@@ -0,0 +1,167 @@
+"""
+Vectorised k-mer counting.
+
+The sequence is encoded once (A=0, C=1, G=2, T=3) and every k-mer becomes a
+2k-bit integer computed with a rolling shift over the whole code array.
+Counting is a `bincount` over the 4**k possible codes for k <= 12 and a
+sort + `unique` over the observed codes for larger k (up to 31).
+K-mers that overlap an N or other ambiguous symbol are skipped.
+"""
+
+import numpy as np
+
+from .encoding import ALPHABET, OTHER, encode
+
+DENSE_MAX_K = 12
+MAX_K = 31
+
+
+def _check_k(k):
+    if not 1 <= k <= MAX_K:
+        raise ValueError(f"k must be between 1 and {MAX_K}, got {k}")
+
+
+def _valid_starts(codes, k):
+    """Boolean mask of window starts whose k bases are all A/C/G/T."""
+    bad = np.concatenate([[0], np.cumsum(codes == OTHER)])
+    return (bad[k:] - bad[:-k]) == 0
+
+
+def _rolling_codes(codes):
+    """Yields (k, codes of every window of length k) for k = 1, 2, ..."""
+    base = codes.astype(np.uint64)
+    base[codes == OTHER] = 0
+    current = base
+    k = 1
+    while True:
+        yield k, current
+        k += 1
+        if k > len(base):
+            return
+        current = (current[:-1] << np.uint64(2)) | base[k - 1:]
+
+
+def kmer_codes(seq, k):
+    """Returns the integer code of every valid k-mer, in sequence order."""
+    _check_k(k)
+    codes = encode(seq)
+    if len(codes) < k:
+        return np.zeros(0, dtype=np.uint64)
+    for length, values in _rolling_codes(codes):
+        if length == k:
+            return values[_valid_starts(codes, k)]
+
+
+def kmer_positions(seq, k):
+    """Returns (codes, starts) of every valid k-mer, in sequence order."""
+    _check_k(k)
+    codes = encode(seq)
+    if len(codes) < k:
+        return np.zeros(0, dtype=np.uint64), np.zeros(0, dtype=np.int64)
+    for length, values in _rolling_codes(codes):
+        if length == k:
+            valid = _valid_starts(codes, k)
+            return values[valid], np.flatnonzero(valid)
+
+
+def reverse_complement_codes(values, k):
+    """Integer codes of the reverse complements of k-mer codes."""
+    values = np.asarray(values, dtype=np.uint64)
+    mask = np.uint64((1 << (2 * k)) - 1)
+    comp = ~values & mask
+    rc = np.zeros_like(values)
+    for _ in range(k):
+        rc = (rc << np.uint64(2)) | (comp & np.uint64(3))
+        comp >>= np.uint64(2)
+    return rc
+
+
+def canonical_codes(values, k):
+    """Smaller of each k-mer code and its reverse complement (strand-merged)."""
+    return np.minimum(values, reverse_complement_codes(values, k))
+
+
+def _count(values, k):
+    if k <= DENSE_MAX_K:
+        counts = np.bincount(values.astype(np.int64), minlength=4 ** k)
+        present = np.flatnonzero(counts)
+        return present.astype(np.uint64), counts[present]
+    return np.unique(values, return_counts=True)
+
+
+def count_kmers(seq, k, canonical=False):
+    """
+    Counts the k-mers of a sequence.
+    Returns (codes, counts): the sorted codes of the k-mers that occur and
+    how many times each one occurs. Use `as_strings` to decode the codes.
+    """
+    values = kmer_codes(seq, k)
+    if canonical:
+        values = canonical_codes(values, k)
+    return _count(values, k)
+
+
+def count_kmers_multi(seq, ks, canonical=False):
+    """
+    Counts several k values in one pass: the sequence is encoded once and
+    the codes for length k are extended by one base to get length k + 1.
+    Returns {k: (codes, counts)}.
+    """
+    wanted = sorted(set(ks))
+    for k in wanted:
+        _check_k(k)
+    codes = encode(seq)
+    result = {k: (np.zeros(0, dtype=np.uint64), np.zeros(0, dtype=np.int64)) for k in wanted}
+    if not wanted or len(codes) < wanted[0]:
+        return result
+
+    for k, values in _rolling_codes(codes):
+        if k in result:
+            values = values[_valid_starts(codes, k)]
+            if canonical:
+                values = canonical_codes(values, k)
+            result[k] = _count(values, k)
+        if k >= wanted[-1]:
+            break
+    return result
+
+
+def kmer_spectrum(seq, k, canonical=False):
+    """Dense count vector of length 4**k indexed by k-mer code (k <= 12)."""
+    if k > DENSE_MAX_K:
+        raise ValueError(f"Dense spectra are limited to k <= {DENSE_MAX_K}")
+    values = kmer_codes(seq, k)
+    if canonical:
+        values = canonical_codes(values, k)
+    return np.bincount(values.astype(np.int64), minlength=4 ** k)
+
+
+def distinct_kmers(seq, k):
+    """K-mers present in the sequence, as strings, in order of first occurrence."""
+    values = kmer_codes(seq, k)
+    _, first = np.unique(values, return_index=True)
+    return as_strings(values[np.sort(first)], k)
+
+
+def kmer_to_code(kmer):
+    code = 0
+    for base in kmer.upper():
+        code = (code << 2) | ALPHABET.index(base)
+    return code
+
+
+def as_strings(values, k):
+    """Decodes k-mer integer codes into strings."""
+    values = np.asarray(values, dtype=np.uint64)
+    if len(values) == 0:
+        return []
+    shifts = np.arange(2 * (k - 1), -1, -2, dtype=np.uint64)
+    digits = ((values[:, None] >> shifts) & np.uint64(3)).astype(np.uint8)
+    letters = np.frombuffer(ALPHABET.encode(), dtype=np.uint8)[digits]
+    return letters.view(f'S{k}').ravel().astype(str).tolist()
+
+
+def kmer_counter(seq, k, canonical=False):
+    """Counts as a {kmer: count} dict, for small results and printing."""
+    values, counts = count_kmers(seq, k, canonical)
+    return dict(zip(as_strings(values, k), counts.tolist()))
@@ -0,0 +1,162 @@
+"""
+Seed-and-extend local alignment search between two long sequences.
+
+The longer sequence is indexed once as sorted k-mer codes with their
+positions. Every k-mer of the other sequence is looked up with
+`searchsorted`, seeds on the same diagonal are merged, and each remaining
+seed is extended without gaps until the running score drops more than
+`xdrop` below its best (cumulative sums over blocks of bases). High-scoring
+segment pairs are then re-aligned with a banded Smith-Waterman around their
+diagonal, so the expensive DP only runs on small, promising regions.
+"""
+
+import numpy as np
+
+from .align import local_align
+from .encoding import OTHER, encode
+from .kmers import kmer_positions
+
+SEED_K = 11
+MAX_OCCURRENCES = 64
+XDROP = 20
+EXTEND_BLOCK = 1024
+
+
+class SeedIndex:
+    """Sorted k-mer codes of a sequence with the position of each occurrence."""
+
+    def __init__(self, seq, k=SEED_K):
+        self.k = k
+        codes, starts = kmer_positions(seq, k)
+        order = np.argsort(codes, kind="stable")
+        self.codes = codes[order]
+        self.positions = starts[order]
+
+    def lookup(self, codes, max_occurrences=MAX_OCCURRENCES):
+        """
+        Returns (indices, positions): for every occurrence of codes[i] in
+        the indexed sequence, i and the occurrence position. K-mers seen
+        more than max_occurrences times (repeats) are ignored.
+        """
+        lo = np.searchsorted(self.codes, codes, side="left")
+        hi = np.searchsorted(self.codes, codes, side="right")
+        counts = hi - lo
+        if max_occurrences is not None:
+            counts[counts > max_occurrences] = 0
+        total = int(counts.sum())
+        indices = np.repeat(np.arange(len(codes)), counts)
+        # position of each hit inside its [lo, hi) range
+        run_starts = np.cumsum(counts) - counts
+        offsets = np.arange(total) - np.repeat(run_starts, counts)
+        return indices, self.positions[np.repeat(lo, counts) + offsets]
+
+
+def _extend(q, t, match, mismatch, xdrop):
+    """
+    Ungapped X-drop extension of q against t from their first symbols.
+    Returns (length, score) of the best-scoring prefix.
+    """
+    limit = min(len(q), len(t))
+    base = peak = 0
+    best_len = 0
+    for offset in range(0, limit, EXTEND_BLOCK):
+        end = min(offset + EXTEND_BLOCK, limit)
+        a, b = q[offset:end], t[offset:end]
+        scores = np.where((a == b) & (a != OTHER), match, mismatch)
+        cs = base + np.cumsum(scores)
+        running = np.maximum(np.maximum.accumulate(cs), peak)
+        dropped = np.flatnonzero(cs < running - xdrop)
+        stop = dropped[0] if len(dropped) else len(cs)
+        if stop > 0:
+            k = int(np.argmax(cs[:stop]))
+            if cs[k] > peak:
+                peak, best_len = cs[k], offset + k + 1
+        if len(dropped):
+            break
+        base = cs[-1]
+    return best_len, peak
+
+
+def find_hsps(query, target, index, match=2, mismatch=-3, xdrop=XDROP, min_score=30,
+              max_occurrences=MAX_OCCURRENCES):
+    """
+    Ungapped high-scoring segment pairs between encoded query and target.
+    Returns a list of (score, query_start, query_end, target_start) sorted
+    by decreasing score.
+    """
+    k = index.k
+    codes, starts = kmer_positions(query, k)
+    which, t_pos = index.lookup(codes, max_occurrences)
+    if len(which) == 0:
+        return []
+    q_pos = starts[which]
+    diag = t_pos - q_pos
+    order = np.lexsort((q_pos, diag))
+    q_pos, diag = q_pos[order], diag[order]
+
+    hsps = []
+    current_diag, reached = None, -1
+    for qs, d in zip(q_pos.tolist(), diag.tolist()):
+        if d == current_diag and qs + k <= reached:
+            continue  # already inside an extended segment on this diagonal
+        ts = qs + d
+        right, right_score = _extend(query[qs + k:], target[ts + k:], match, mismatch, xdrop)
+        left, left_score = _extend(query[:qs][::-1], target[:ts][::-1], match, mismatch, xdrop)
+        score = k * match + right_score + left_score
+        current_diag, reached = d, qs + k + right
+        if score >= min_score:
+            hsps.append((score, qs - left, qs + k + right, ts - left))
+    hsps.sort(key=lambda h: -h[0])
+    return hsps
+
+
+def local_search(seq1, seq2, top=5, k=SEED_K, match=2, mismatch=-3, gap_open=-5, gap_extend=-2,
+                 xdrop=XDROP, band=32, margin=256, min_score=30, max_occurrences=MAX_OCCURRENCES):
+    """
+    Top-scoring local alignments between seq1 and seq2.
+
+    The seed index is built on the longer sequence. Each segment pair is
+    re-aligned over its span plus `margin` bases on both sides, within
+    +/- band diagonals of its own diagonal. Returns up to `top`
+    dicts with score, start1/end1, start2/end2 (0-based, half-open),
+    aligned1, aligned2, matches and identity (%), best first.
+    """
+    swap = len(seq1) > len(seq2)
+    query, target = (seq2, seq1) if swap else (seq1, seq2)
+    q, t = encode(query), encode(target)
+    index = SeedIndex(t, k)
+    hsps = find_hsps(q, t, index, match, mismatch, xdrop, min_score, max_occurrences)
+
+    results = []
+    for _, qs, qe, ts in hsps:
+        te = ts + (qe - qs)
+        if any(qs < r["end1"] and r["start1"] < qe and ts < r["end2"] and r["start2"] < te
+               for r in results):
+            continue  # the segment pair overlaps an alignment already found
+        before = min(margin, qs, ts)
+        after = min(margin, len(q) - qe, len(t) - te)
+        q0, t0 = qs - before, ts - before
+        aligned_q, aligned_t, score, matches, span = local_align(
+            query[q0:qe + after], target[t0:te + after],
+            match, mismatch, gap_open, gap_extend, band)
+        if score < min_score:
+            continue
+        results.append({
+            "score": score,
+            "start1": q0 + span[0], "end1": q0 + span[1],
+            "start2": t0 + span[2], "end2": t0 + span[3],
+            "aligned1": aligned_q, "aligned2": aligned_t,
+            "matches": matches,
+            "identity": 100.0 * matches / len(aligned_q),
+        })
+        if len(results) >= 4 * top:
+            break
+
+    results.sort(key=lambda r: -r["score"])
+    results = results[:top]
+    if swap:
+        for r in results:
+            r["start1"], r["start2"] = r["start2"], r["start1"]
+            r["end1"], r["end2"] = r["end2"], r["end1"]
+            r["aligned1"], r["aligned2"] = r["aligned2"], r["aligned1"]
+    return results
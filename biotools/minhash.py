@@ -0,0 +1,162 @@
+"""
+Bottom-k MinHash sketches (Mash-style) for fast approximate genome distances.
+
+Every canonical k-mer (smaller of the k-mer and its reverse complement) is
+hashed with a seeded 64-bit mixer (the SplitMix64 finalizer), and a sketch
+keeps the `size` smallest distinct hash values. Genomes are processed in
+chunks so memory stays bounded on large sequences. Two sketches estimate the
+Jaccard index of their k-mer sets from the bottom `size` hashes of their
+union, and the Mash distance from that estimate. Sketches are stored in a
+compact little-endian binary file (header + raw uint64 hashes).
+"""
+
+import math
+import os
+import struct
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .fasta import read_fasta
+from .kmers import canonical_codes, kmer_codes
+
+DEFAULT_K = 21
+DEFAULT_SIZE = 1000
+DEFAULT_SEED = 42
+CHUNK_SIZE = 1_000_000
+
+MAGIC = b"MSKT"
+_HEADER = struct.Struct("<4sBIQQQH")  # magic, k, size, seed, genome length, count, name length
+
+
+def hash_codes(values, seed=DEFAULT_SEED):
+    """Seeded 64-bit hashes of k-mer codes (SplitMix64 finalizer)."""
+    with np.errstate(over='ignore'):
+        z = np.asarray(values, dtype=np.uint64) + np.uint64((seed + 1) * 0x9E3779B97F4A7C15 % 2 ** 64)
+        z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        return z ^ (z >> np.uint64(31))
+
+
+class Sketch:
+    """Sorted bottom-`size` canonical k-mer hashes of one genome."""
+
+    def __init__(self, name, k, size, seed, length, hashes):
+        self.name = name
+        self.k = k
+        self.size = size
+        self.seed = seed
+        self.length = length
+        self.hashes = np.asarray(hashes, dtype=np.uint64)
+
+    def __len__(self):
+        return len(self.hashes)
+
+    def _check(self, other):
+        if (self.k, self.seed) != (other.k, other.seed):
+            raise ValueError(f"Sketches '{self.name}' and '{other.name}' use different k or seed")
+
+    def jaccard(self, other):
+        """Estimated Jaccard index of the two k-mer sets."""
+        self._check(other)
+        size = min(self.size, other.size)
+        a, b = self.hashes[:size], other.hashes[:size]
+        if len(a) == 0 or len(b) == 0:
+            return 0.0
+        found = np.searchsorted(b, a)
+        found[found == len(b)] = 0
+        in_b = b[found] == a
+        # bottom `size` of the union: a stable sort merges the two sorted runs in linear time
+        merged = np.concatenate([a, b])
+        merged.sort(kind='stable')
+        union = merged[np.concatenate([[True], merged[1:] != merged[:-1]])][:size]
+        return float(np.count_nonzero(in_b & (a <= union[-1])) / len(union))
+
+    def mash_distance(self, other):
+        """Mash distance -ln(2j / (1 + j)) / k; 1.0 when nothing is shared."""
+        j = self.jaccard(other)
+        if j == 0:
+            return 1.0
+        return -math.log(2 * j / (1 + j)) / self.k
+
+
+def _bottom(hashes, size):
+    hashes = np.unique(hashes)
+    return hashes[:size]
+
+
+def sketch_sequence(seq, name="", k=DEFAULT_K, size=DEFAULT_SIZE, seed=DEFAULT_SEED):
+    """Builds the Sketch of one sequence."""
+    return sketch_records([(name, seq)], name, k, size, seed)
+
+
+def sketch_records(records, name="", k=DEFAULT_K, size=DEFAULT_SIZE, seed=DEFAULT_SEED):
+    """Builds one Sketch over all (header, sequence) records (k-mers never span records)."""
+    hashes = np.zeros(0, dtype=np.uint64)
+    length = 0
+    for _, seq in records:
+        length += len(seq)
+        for start in range(0, max(len(seq) - k + 1, 0), CHUNK_SIZE):
+            values = canonical_codes(kmer_codes(seq[start:start + CHUNK_SIZE + k - 1], k), k)
+            hashes = _bottom(np.concatenate([hashes, hash_codes(values, seed)]), size)
+    return Sketch(name, k, size, seed, length, hashes)
+
+
+def sketch_file(filename, k=DEFAULT_K, size=DEFAULT_SIZE, seed=DEFAULT_SEED):
+    """Sketch of every record of a FASTA file, named after the file."""
+    name = os.path.splitext(os.path.basename(filename))[0]
+    return sketch_records(read_fasta(filename), name, k, size, seed)
+
+
+def sketch_files(filenames, k=DEFAULT_K, size=DEFAULT_SIZE, seed=DEFAULT_SEED, workers=1):
+    """
+    Sketches FASTA files; returns the sketches in input order. Serial by
+    default; workers > 1 (or None for one per CPU) uses a process pool.
+    """
+    filenames = list(filenames)
+    count = len(filenames)
+    if workers is None or workers > 1:
+        workers = workers or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(sketch_file, filenames, [k] * count, [size] * count, [seed] * count))
+    return [sketch_file(filename, k, size, seed) for filename in filenames]
+
+
+def write_sketches(filename, sketches):
+    """Writes sketches to a binary file: per sketch a fixed header, the name and the hashes."""
+    with open(filename, 'wb') as out:
+        for sketch in sketches:
+            name = sketch.name.encode('utf-8')
+            out.write(_HEADER.pack(MAGIC, sketch.k, sketch.size, sketch.seed, sketch.length,
+                                   len(sketch.hashes), len(name)))
+            out.write(name)
+            out.write(sketch.hashes.astype('<u8').tobytes())
+
+
+def read_sketches(filename):
+    """Reads the sketches written by write_sketches."""
+    sketches = []
+    with open(filename, 'rb') as f:
+        data = f.read()
+    pos = 0
+    while pos < len(data):
+        magic, k, size, seed, length, count, name_length = _HEADER.unpack_from(data, pos)
+        if magic != MAGIC:
+            raise ValueError(f"{filename} is not a sketch file (bad header at byte {pos})")
+        pos += _HEADER.size
+        name = data[pos:pos + name_length].decode('utf-8')
+        pos += name_length
+        hashes = np.frombuffer(data, dtype='<u8', count=count, offset=pos).astype(np.uint64)
+        pos += 8 * count
+        sketches.append(Sketch(name, k, size, seed, length, hashes))
+    return sketches
+
+
+def distance_matrix(sketches):
+    """Symmetric matrix of pairwise Mash distances."""
+    count = len(sketches)
+    matrix = np.zeros((count, count))
+    for i in range(count):
+        for j in range(i + 1, count):
+            matrix[i, j] = matrix[j, i] = sketches[i].mash_distance(sketches[j])
+    return matrix
@@ -0,0 +1,190 @@
+"""
+Scanning whole motif libraries over sequence collections.
+
+Matrices of equal length are stacked into one weight matrix (forward and
+reverse-complement versions side by side), each genome is encoded once,
+and blocks of windows are one-hot encoded and scored against every motif of
+a length group with a single matrix product. Genomes are cut into chunks
+that are shared across a process pool; hits are produced as a stream of
+BED-like rows.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from .encoding import ALPHABET, encode
+from .pwm import N_SCORE, reverse_complement_pwm
+from .pwm_pvalue import UNIFORM_BACKGROUND, score_distribution
+
+BLOCK_SIZE = 8192
+CHUNK_SIZE = 1_000_000
+
+
+class MotifLibrary:
+    """Named (4, L) log-odds matrices, grouped by length for scanning."""
+
+    def __init__(self, motifs=()):
+        self.motifs = []
+        for name, pwm in motifs:
+            self.add(name, pwm)
+
+    def add(self, name, pwm):
+        pwm = np.asarray(pwm, dtype=np.float64)
+        if pwm.ndim != 2 or pwm.shape[0] != 4:
+            raise ValueError(f"Motif '{name}' must be a (4, L) matrix, got shape {pwm.shape}")
+        self.motifs.append((name, pwm))
+
+    def __len__(self):
+        return len(self.motifs)
+
+    @classmethod
+    def from_jaspar(cls, filename, pseudocount=0.8, background=UNIFORM_BACKGROUND):
+        """
+        Reads count matrices in JASPAR format:
+            >MA0004.1 Arnt
+            A  [ 4 19  0  0  0  0 ]
+            C  [16  0 20  0  0  0 ]
+            ...
+        and converts them to natural-log odds against `background`.
+        """
+        library = cls()
+        name, rows = None, {}
+
+        def flush():
+            if name is not None and len(rows) == 4:
+                counts = np.array([rows[base] for base in ALPHABET], dtype=np.float64) + pseudocount
+                probs = counts / counts.sum(axis=0)
+                library.add(name, np.log(probs / np.asarray(background)[:, None]))
+
+        with open(filename, 'r') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                if line.startswith('>'):
+                    flush()
+                    name, rows = " ".join(line[1:].split()), {}
+                    continue
+                fields = line.replace('[', ' ').replace(']', ' ').split()
+                rows[fields[0].upper()] = [float(v) for v in fields[1:]]
+        flush()
+        return library
+
+    def groups(self, pvalue=None, threshold=None, background=UNIFORM_BACKGROUND):
+        """
+        Returns {L: (names, weights, thresholds, matrices)} where `weights`
+        is a (2M, 5L) float32 matrix (M forward motifs then their reverse
+        complements; N row included), `thresholds` holds the score cutoff of
+        each row, from `pvalue` when given, otherwise `threshold`, and
+        `matrices` are the corresponding (4, L) float64 matrices.
+        """
+        by_length = {}
+        for name, pwm in self.motifs:
+            by_length.setdefault(pwm.shape[1], []).append((name, pwm))
+
+        groups = {}
+        for length, members in by_length.items():
+            names = [name for name, _ in members]
+            matrices = [pwm for _, pwm in members] + [reverse_complement_pwm(pwm) for _, pwm in members]
+            weights = np.empty((len(matrices), length, 5), dtype=np.float32)
+            cutoffs = np.empty(len(matrices))
+            for row, pwm in enumerate(matrices):
+                weights[row, :, :4] = pwm.T
+                weights[row, :, 4] = N_SCORE
+                if pvalue is not None:
+                    cutoffs[row] = score_distribution(pwm, background).threshold(pvalue)
+                else:
+                    cutoffs[row] = threshold
+            groups[length] = (names, weights.reshape(len(matrices), -1), cutoffs, matrices)
+        return groups
+
+
+def score_block(codes, weights, length):
+    """Scores of every window of `codes` (length len(codes) - L + 1) against all rows."""
+    windows = sliding_window_view(codes, length)
+    onehot = np.zeros((len(windows), 5 * length), dtype=np.float32)
+    onehot[np.arange(len(windows))[:, None], windows + 5 * np.arange(length)] = 1.0
+    return onehot @ weights.T
+
+
+_groups = None
+
+
+def _init_worker(groups):
+    global _groups
+    _groups = groups
+
+
+def _scan_chunk(record, offset, codes, count):
+    """
+    Hits of all motifs for window starts offset .. offset + count - 1, as
+    (record, start, end, motif, score, strand, length, row) tuples.
+    """
+    hits = []
+    for length, (names, weights, cutoffs, _) in _groups.items():
+        group_count = min(count, len(codes) - length + 1)
+        motifs = len(names)
+        for block in range(0, max(group_count, 0), BLOCK_SIZE):
+            stop = min(block + BLOCK_SIZE, group_count)
+            scores = score_block(codes[block:stop + length - 1], weights, length)
+            rows, cols = np.nonzero(scores >= cutoffs)
+            for row, col in zip(rows.tolist(), cols.tolist()):
+                strand = '+' if col < motifs else '-'
+                start = offset + block + row
+                hits.append((record, start, start + length, names[col % motifs],
+                             float(scores[row, col]), strand, length, col))
+    return hits
+
+
+def _chunks(records, max_length, chunk_size):
+    for name, seq in records:
+        codes = encode(seq)
+        for offset in range(0, len(codes), chunk_size):
+            yield name, offset, codes[offset:offset + chunk_size + max_length - 1], chunk_size
+
+
+def scan_library(records, library, pvalue=None, threshold=0.0, workers=1,
+                 chunk_size=CHUNK_SIZE, background=UNIFORM_BACKGROUND):
+    """
+    Scans every motif of `library` over every (name, sequence) record.
+    Yields BED-like tuples (record, start, end, motif, score, strand, pvalue),
+    with 0-based half-open coordinates, chunk by chunk in input order.
+    """
+    groups = library.groups(pvalue, threshold, background)
+    if not groups:
+        return
+    max_length = max(groups)
+
+    def finish(hits):
+        for record, start, end, motif, score, strand, length, row in hits:
+            distribution = score_distribution(groups[length][3][row], background)
+            yield record, start, end, motif, score, strand, distribution.pvalue(score)
+
+    chunks = _chunks(records, max_length, chunk_size)
+    if workers is None or workers > 1:
+        workers = workers or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(groups,)) as executor:
+            pending = []
+            for chunk in chunks:
+                pending.append(executor.submit(_scan_chunk, *chunk))
+                if len(pending) >= workers * 2:
+                    yield from finish(pending.pop(0).result())
+            for future in pending:
+                yield from finish(future.result())
+    else:
+        _init_worker(groups)
+        for chunk in chunks:
+            yield from finish(_scan_chunk(*chunk))
+
+
+def write_bed(hits, out):
+    """Writes hits from scan_library to an open text stream, one BED6+1 line each."""
+    count = 0
+    for record, start, end, motif, score, strand, pvalue in hits:
+        out.write(f"{record}\t{start}\t{end}\t{motif}\t{score:.3f}\t{strand}\t{pvalue:.3e}\n")
+        count += 1
+    return count
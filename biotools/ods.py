@@ -0,0 +1,129 @@
+"""
+Batch ODS (CG% / Kappa IC) patterns for promoter collections.
+
+Records from a FASTA file are analysed one by one, or spread over a
+process pool when workers are requested; each record yields compact
+float32 (CG, IC) arrays plus the sequence centroid, and the results are
+streamed in input order into an on-disk store:
+
+    <store>/cg.f32, <store>/ic.f32   every window point, appended per record
+    <store>/index.npz                names, per-record offsets, centroids
+
+`load_store` memory-maps the point arrays back, and `plot_density` draws
+them as a hexbin density instead of one scatter artist per point.
+"""
+
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+
+import numpy as np
+
+from .fasta import read_fasta
+from .kappa import kappa_ic_windows
+from .windows import window_profile
+
+
+def ods_pattern(sequence, window=30):
+    """(CG%, IC) of every window of the sequence as two float32 arrays."""
+    cg = window_profile(sequence, window)['gc'].astype(np.float32)
+    ic = kappa_ic_windows(sequence, window).astype(np.float32)
+    return cg, ic
+
+
+def _analyze_record(record, window):
+    header, sequence = record
+    cg, ic = ods_pattern(sequence, window)
+    if len(cg):
+        centroid = (float(cg.mean()), float(ic.mean()))
+    else:
+        centroid = (np.nan, np.nan)
+    return header, cg, ic, centroid
+
+
+def _ordered_results(executor, records, window, max_pending):
+    """Submits records lazily and yields results in input order."""
+    pending = deque()
+    for record in records:
+        pending.append(executor.submit(_analyze_record, record, window))
+        if len(pending) >= max_pending:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def run_batch(fasta_file, store_path, window=30, workers=1, progress=None, progress_every=100):
+    """
+    Computes the ODS pattern of every record of `fasta_file` and writes it
+    to the store directory `store_path`. Serial by default; workers > 1
+    (or None for one per CPU) uses a process pool. `progress`, if given, is
+    called with the number of records done every `progress_every` records.
+    Returns the number of records processed.
+    """
+    os.makedirs(store_path, exist_ok=True)
+
+    names, offsets, centroids = [], [0], []
+    with open(os.path.join(store_path, "cg.f32"), 'wb') as cg_out, \
+            open(os.path.join(store_path, "ic.f32"), 'wb') as ic_out, \
+            ExitStack() as stack:
+        if workers is None or workers > 1:
+            workers = workers or os.cpu_count() or 1
+            executor = stack.enter_context(ProcessPoolExecutor(max_workers=workers))
+            results = _ordered_results(executor, read_fasta(fasta_file), window, workers * 4)
+        else:
+            results = (_analyze_record(record, window) for record in read_fasta(fasta_file))
+        for count, (header, cg, ic, centroid) in enumerate(results, 1):
+            cg.tofile(cg_out)
+            ic.tofile(ic_out)
+            names.append(header)
+            offsets.append(offsets[-1] + len(cg))
+            centroids.append(centroid)
+            if progress and progress_every and count % progress_every == 0:
+                progress(count)
+
+    np.savez(os.path.join(store_path, "index.npz"),
+             names=np.array(names, dtype=str),
+             offsets=np.array(offsets, dtype=np.int64),
+             centroids=np.array(centroids, dtype=np.float32).reshape(-1, 2),
+             window=window)
+    return len(names)
+
+
+def load_store(store_path):
+    """
+    Opens a store written by run_batch. Returns a dict with 'cg' and 'ic'
+    (memory-mapped float32 arrays of all points), 'names', 'offsets'
+    (points of record i are offsets[i]:offsets[i + 1]), 'centroids' and 'window'.
+    """
+    with np.load(os.path.join(store_path, "index.npz")) as index:
+        store = {key: index[key] for key in index.files}
+    store['window'] = int(store['window'])
+    for key in ('cg', 'ic'):
+        path = os.path.join(store_path, f"{key}.f32")
+        if os.path.getsize(path):
+            store[key] = np.memmap(path, dtype=np.float32, mode='r')
+        else:
+            store[key] = np.zeros(0, dtype=np.float32)
+    return store
+
+
+def plot_density(store, output_filename, gridsize=80):
+    """Hexbin density of all (CG, IC) points with the record centroids on top."""
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots(figsize=(12, 10))
+    if len(store['cg']):
+        hb = ax.hexbin(store['cg'], store['ic'], gridsize=gridsize, bins='log', cmap='viridis', mincnt=1)
+        fig.colorbar(hb, ax=ax, label='Windows (log count)')
+    centroids = store['centroids']
+    if len(centroids):
+        ax.scatter(centroids[:, 0], centroids[:, 1], s=6, c='red', alpha=0.5, label='Sequence centroids')
+        ax.legend()
+
+    ax.set_title(f"Combined ODS Patterns (N={len(store['names'])} Sequences)")
+    ax.set_xlabel('C+G %')
+    ax.set_ylabel('Kappa IC')
+    ax.grid(True, linestyle='--', alpha=0.3)
+    fig.savefig(output_filename)
+    plt.close(fig)
@@ -0,0 +1,135 @@
+"""
+PackedSeq: nucleotide sequence stored at 2 bits per base.
+
+ACGT bases are packed four to a byte (first base in the high bits). Any other
+symbol (N, IUPAC ambiguity codes) is kept in a sparse side-table of runs
+(start, end, symbol), so a genome with a few N blocks costs about a quarter
+of the memory of the equivalent Python str. Slices with step 1 are views that
+share the packed buffer and side-table with their parent.
+"""
+
+import numpy as np
+
+from .encoding import OTHER, as_bytes, decode, encode, upper_bytes
+from .fasta import read_fasta
+
+_SHIFTS = np.array([6, 4, 2, 0], dtype=np.uint8)
+
+_IUPAC_COMPLEMENT = bytes.maketrans(b"ACGTUNRYKMSWBVDH-", b"TGCAANYRMKSWVBHD-")
+
+
+def _pack(codes):
+    """Packs codes 0-3 into bytes, four bases per byte."""
+    pad = (-len(codes)) % 4
+    if pad:
+        codes = np.concatenate([codes, np.zeros(pad, dtype=np.uint8)])
+    quads = codes.reshape(-1, 4)
+    return (quads[:, 0] << 6) | (quads[:, 1] << 4) | (quads[:, 2] << 2) | quads[:, 3]
+
+
+def _find_runs(raw, mask):
+    """Returns (starts, ends, symbols) of runs of identical non-ACGT symbols."""
+    idx = np.flatnonzero(mask)
+    if len(idx) == 0:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty.copy(), np.zeros(0, dtype=np.uint8)
+    new_run = np.ones(len(idx), dtype=bool)
+    new_run[1:] = (np.diff(idx) != 1) | (raw[idx[1:]] != raw[idx[:-1]])
+    starts = idx[new_run]
+    last = np.append(np.flatnonzero(new_run)[1:] - 1, len(idx) - 1)
+    ends = idx[last] + 1
+    return starts.astype(np.int64), ends.astype(np.int64), raw[starts].copy()
+
+
+class PackedSeq:
+    def __init__(self, seq=""):
+        raw = upper_bytes(seq)
+        codes = encode(raw.tobytes())
+        other = codes == OTHER
+        self._starts, self._ends, self._symbols = _find_runs(raw, other)
+        codes[other] = 0
+        self._data = _pack(codes)
+        self._offset = 0
+        self._length = len(codes)
+
+    @classmethod
+    def _view(cls, parent, offset, length):
+        view = cls.__new__(cls)
+        view._data = parent._data
+        view._starts, view._ends, view._symbols = parent._starts, parent._ends, parent._symbols
+        view._offset = offset
+        view._length = length
+        return view
+
+    def __len__(self):
+        return self._length
+
+    @property
+    def nbytes(self):
+        """Memory held by the packed buffer and side-table (shared by views)."""
+        return self._data.nbytes + self._starts.nbytes + self._ends.nbytes + self._symbols.nbytes
+
+    def _exception_runs(self):
+        """Side-table runs clipped to this view, in view coordinates."""
+        lo, hi = self._offset, self._offset + self._length
+        first = np.searchsorted(self._ends, lo, side='right')
+        last = np.searchsorted(self._starts, hi, side='left')
+        starts = np.clip(self._starts[first:last], lo, hi) - lo
+        ends = np.clip(self._ends[first:last], lo, hi) - lo
+        return starts, ends, self._symbols[first:last]
+
+    def _unpack(self):
+        """Codes 0-3 for every base of the view (exceptions read as A)."""
+        lo, hi = self._offset, self._offset + self._length
+        block = self._data[lo // 4:(hi + 3) // 4]
+        codes = ((block[:, None] >> _SHIFTS) & 3).astype(np.uint8).ravel()
+        return codes[lo % 4:lo % 4 + self._length]
+
+    def codes(self):
+        """uint8 array of codes A=0, C=1, G=2, T=3, other=4."""
+        codes = self._unpack()
+        for start, end in zip(*self._exception_runs()[:2]):
+            codes[start:end] = OTHER
+        return codes
+
+    def to_bytes(self):
+        raw = as_bytes(decode(self._unpack())).copy()
+        for start, end, symbol in zip(*self._exception_runs()):
+            raw[start:end] = symbol
+        return raw.tobytes()
+
+    def __str__(self):
+        return self.to_bytes().decode('ascii')
+
+    def __repr__(self):
+        text = str(self[:20]) + ("..." if self._length > 20 else "")
+        return f"PackedSeq('{text}', length={self._length})"
+
+    def __eq__(self, other):
+        if isinstance(other, PackedSeq):
+            return len(self) == len(other) and self.to_bytes() == other.to_bytes()
+        if isinstance(other, str):
+            return str(self) == other.upper()
+        return NotImplemented
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            start, stop, step = key.indices(self._length)
+            if step == 1:
+                return PackedSeq._view(self, self._offset + start, max(0, stop - start))
+            return PackedSeq(self.to_bytes()[start:stop:step])
+        if key < 0:
+            key += self._length
+        if not 0 <= key < self._length:
+            raise IndexError("PackedSeq index out of range")
+        return str(self[key:key + 1])
+
+    def reverse_complement(self):
+        """Returns a new PackedSeq holding the reverse complement."""
+        return PackedSeq(self.to_bytes()[::-1].translate(_IUPAC_COMPLEMENT))
+
+
+def read_packed(filename):
+    """Yields (header, PackedSeq) for every record of a FASTA file."""
+    for header, seq in read_fasta(filename):
+        yield header, PackedSeq(seq)
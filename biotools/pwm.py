@@ -0,0 +1,159 @@
+"""
+Position weight matrix (PWM) scanning with NumPy.
+
+A PWM is a (4, L) float array of log-likelihood scores, rows in A, C, G, T
+order. A fifth row of N_SCORE is appended internally so windows containing
+N or other symbols are scored with the same heavy penalty Lab12 uses.
+Scores for every window are accumulated column by column over the encoded
+sequence (L vectorised passes), on both strands.
+"""
+
+import numpy as np
+
+from .encoding import ALPHABET, OTHER, encode
+from .pwm_pvalue import UNIFORM_BACKGROUND, score_distribution
+
+N_SCORE = -99.0
+
+HIT_DTYPE = np.dtype([
+    ('seq', np.int32),
+    ('position', np.int64),
+    ('strand', 'U1'),
+    ('score', np.float32),
+    ('pvalue', np.float64),
+])
+
+
+def count_matrix(motifs, pseudocount=0):
+    """(4, L) counts of each base at each position of equal-length motifs."""
+    length = len(motifs[0])
+    counts = np.full((4, length), pseudocount, dtype=np.float64)
+    for motif in motifs:
+        codes = encode(motif)
+        known = codes != OTHER
+        np.add.at(counts, (codes[known], np.flatnonzero(known)), 1)
+    return counts
+
+
+def log_likelihood_matrix(motifs, pseudocount=1, background=0.25):
+    """Natural-log odds matrix of the motifs against a uniform background."""
+    counts = count_matrix(motifs, pseudocount)
+    probs = counts / counts.sum(axis=0)
+    return np.log(probs / background)
+
+
+def pwm_from_dict(matrix):
+    """Converts a {'A': [...], 'C': [...], ...} matrix to a (4, L) array."""
+    return np.array([matrix[base] for base in ALPHABET], dtype=np.float64)
+
+
+def reverse_complement_pwm(pwm):
+    return np.ascontiguousarray(pwm[::-1, ::-1])
+
+
+def _with_n_row(pwm):
+    pwm = np.asarray(pwm, dtype=np.float64)
+    return np.vstack([pwm, np.full(pwm.shape[1], N_SCORE)])
+
+
+def _score_codes(codes, pwm5):
+    length = pwm5.shape[1]
+    count = len(codes) - length + 1
+    if count <= 0:
+        return np.zeros(0, dtype=np.float32)
+    scores = np.zeros(count, dtype=np.float64)
+    for j in range(length):
+        scores += pwm5[codes[j:j + count], j]
+    return scores.astype(np.float32)
+
+
+def score_track(seq, pwm, reverse=False):
+    """
+    Score of every window start of the sequence as float32.
+    With reverse=True the windows are scored on the reverse strand
+    (the reverse complement of each window), still indexed by forward start.
+    """
+    if reverse:
+        pwm = reverse_complement_pwm(pwm)
+    return _score_codes(encode(seq), _with_n_row(pwm))
+
+
+def _concatenate(sequences, length):
+    """Encodes sequences into one array separated by N runs so no window spans two."""
+    parts, starts = [], []
+    spacer = np.full(length - 1, OTHER, dtype=np.uint8)
+    pos = 0
+    for seq in sequences:
+        codes = encode(seq)
+        starts.append(pos)
+        parts.extend([codes, spacer])
+        pos += len(codes) + len(spacer)
+    if not parts:
+        return np.zeros(0, dtype=np.uint8), []
+    return np.concatenate(parts), starts
+
+
+def scan_many(sequences, pwm, threshold=None, both_strands=True, pvalue=None, background=UNIFORM_BACKGROUND):
+    """
+    Scans several sequences in one batched call.
+
+    Without a threshold returns a list with, for every sequence, the
+    forward track (and the reverse track when both_strands) as float32.
+    With a threshold returns a HIT_DTYPE structured array of all windows
+    scoring >= threshold, sorted by score. Instead of a raw score, a
+    `pvalue` cutoff can be given; it is converted to a score threshold once
+    from the exact score distribution of the matrix under `background`
+    (threshold and pvalue are mutually exclusive). Hit p-values come from
+    the same distribution.
+    """
+    if threshold is not None and pvalue is not None:
+        raise ValueError("Give either a score threshold or a pvalue cutoff, not both")
+    sequences = list(sequences)
+    length = np.asarray(pwm).shape[1]
+    codes, starts = _concatenate(sequences, length)
+    lengths = [len(seq) for seq in sequences]
+
+    forward = _score_codes(codes, _with_n_row(pwm))
+    reverse = _score_codes(codes, _with_n_row(reverse_complement_pwm(pwm))) if both_strands else None
+
+    # Window starts that lie fully inside one sequence
+    valid = np.zeros(len(forward), dtype=bool)
+    seq_of = np.zeros(len(forward), dtype=np.int32)
+    for i, (start, n) in enumerate(zip(starts, lengths)):
+        valid[start:start + max(0, n - length + 1)] = True
+        seq_of[start:start + n] = i
+
+    if threshold is None and pvalue is None:
+        tracks = []
+        for start, n in zip(starts, lengths):
+            stop = start + max(0, n - length + 1)
+            if both_strands:
+                tracks.append((forward[start:stop], reverse[start:stop]))
+            else:
+                tracks.append(forward[start:stop])
+        return tracks
+
+    strands = [('+', forward, pwm)]
+    if both_strands:
+        strands.append(('-', reverse, reverse_complement_pwm(pwm)))
+
+    hits = []
+    for strand, track, strand_pwm in strands:
+        distribution = score_distribution(strand_pwm, background)
+        cutoff = threshold if pvalue is None else distribution.threshold(pvalue)
+        idx = np.flatnonzero(valid & (track >= cutoff))
+        found = np.zeros(len(idx), dtype=HIT_DTYPE)
+        found['seq'] = seq_of[idx]
+        found['position'] = idx - np.asarray(starts, dtype=np.int64)[seq_of[idx]]
+        found['strand'] = strand
+        found['score'] = track[idx]
+        found['pvalue'] = distribution.pvalue(track[idx])
+        hits.append(found)
+    hits = np.concatenate(hits)
+    return hits[np.argsort(-hits['score'], kind='stable')]
+
+
+def scan(seq, pwm, threshold=None, both_strands=True, pvalue=None, background=UNIFORM_BACKGROUND):
+    """Single-sequence form of scan_many."""
+    result = scan_many([seq], pwm, threshold, both_strands, pvalue, background)
+    return result[0] if threshold is None and pvalue is None else result
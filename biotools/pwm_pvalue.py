@@ -0,0 +1,82 @@
+"""
+Exact score distribution of a PWM under a background model.
+
+The matrix is discretised to a fixed granularity and the distribution of
+the total score of a random L-mer (bases drawn independently from the
+background) is built column by column by dynamic programming, in the
+spirit of TFM-Pvalue. From it p-values and score thresholds are looked up
+directly, with no sampling. Distributions are cached per matrix.
+"""
+
+import numpy as np
+
+DEFAULT_GRANULARITY = 0.001
+UNIFORM_BACKGROUND = (0.25, 0.25, 0.25, 0.25)
+
+_CACHE = {}
+
+
+class ScoreDistribution:
+    """
+    Survival function P(score >= s) of a PWM on a grid of step `granularity`.
+    Discretisation error of any score is at most L * granularity / 2.
+    """
+
+    def __init__(self, pwm, background=UNIFORM_BACKGROUND, granularity=DEFAULT_GRANULARITY):
+        pwm = np.asarray(pwm, dtype=np.float64)
+        background = np.asarray(background, dtype=np.float64)
+        self.granularity = granularity
+        int_pwm = np.rint(pwm / granularity).astype(np.int64)
+
+        probs = np.ones(1)
+        offset = 0  # integer score of probs[0]
+        for column in int_pwm.T:
+            col_min = int(column.min())
+            width = int(column.max()) - col_min
+            new = np.zeros(len(probs) + width)
+            for base in range(4):
+                shift = int(column[base]) - col_min
+                new[shift:shift + len(probs)] += background[base] * probs
+            probs = new
+            offset += col_min
+
+        self.min_score = offset
+        self.probs = probs
+        # sf[i] = P(integer score >= low + i)
+        self.sf = np.cumsum(probs[::-1])[::-1]
+
+    def _index(self, scores):
+        ints = np.rint(np.asarray(scores, dtype=np.float64) / self.granularity).astype(np.int64)
+        return ints - self.min_score
+
+    def pvalue(self, scores):
+        """P(random score >= score) for a score or an array of scores."""
+        idx = self._index(scores)
+        result = np.where(idx < 0, 1.0, self.sf[np.clip(idx, 0, len(self.sf) - 1)])
+        result = np.where(idx >= len(self.sf), 0.0, result)
+        return float(result) if np.ndim(result) == 0 else result
+
+    def threshold(self, pvalue):
+        """Smallest score whose p-value is <= `pvalue` (inf if none is)."""
+        passing = np.flatnonzero(self.sf <= pvalue)
+        if len(passing) == 0:
+            return np.inf
+        return (self.min_score + passing[0]) * self.granularity
+
+
+def score_distribution(pwm, background=UNIFORM_BACKGROUND, granularity=DEFAULT_GRANULARITY):
+    """Cached ScoreDistribution for a (4, L) matrix."""
+    pwm = np.ascontiguousarray(pwm, dtype=np.float64)
+    key = (pwm.shape, pwm.tobytes(), tuple(background), granularity)
+    if key not in _CACHE:
+        _CACHE[key] = ScoreDistribution(pwm, background, granularity)
+    return _CACHE[key]
+
+
+def score_threshold(pwm, pvalue, background=UNIFORM_BACKGROUND, granularity=DEFAULT_GRANULARITY):
+    """Converts a p-value cutoff into a raw score cutoff for the matrix."""
+    return score_distribution(pwm, background, granularity).threshold(pvalue)
+
+
+def score_pvalue(pwm, scores, background=UNIFORM_BACKGROUND, granularity=DEFAULT_GRANULARITY):
+    return score_distribution(pwm, background, granularity).pvalue(scores)
@@ -0,0 +1,175 @@
+"""
+Read simulation from a reference genome.
+
+The genome is encoded once; read start positions, lengths and strands are
+drawn for a whole chunk of reads at a time with a NumPy Generator, and the
+reads are gathered from a sliding-window view of the encoded genome into a
+(reads, max_length) code matrix. Sequencing errors are applied to the whole
+matrix at once: substitutions in place, deletions and insertions by
+scattering the surviving bases to their new columns. FASTQ output is
+written chunk by chunk, so read sets larger than memory can be streamed.
+"""
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from .encoding import ALPHABET, OTHER, encode
+
+CHUNK_SIZE = 100_000
+MAX_QUALITY = 40
+
+_LETTERS = np.frombuffer((ALPHABET + "N").encode('ascii'), dtype=np.uint8)
+
+
+class ErrorProfile:
+    """Per-base probabilities of a substitution, an inserted base after it, and its deletion."""
+
+    def __init__(self, substitution=0.0, insertion=0.0, deletion=0.0):
+        for name, rate in (("substitution", substitution), ("insertion", insertion),
+                           ("deletion", deletion)):
+            if not 0 <= rate < 1:
+                raise ValueError(f"{name} rate must be in [0, 1), got {rate}")
+        self.substitution = substitution
+        self.insertion = insertion
+        self.deletion = deletion
+
+    @property
+    def error_rate(self):
+        return self.substitution + self.insertion + self.deletion
+
+    def quality(self):
+        """Phred quality matching the total error rate (capped at MAX_QUALITY)."""
+        if self.error_rate == 0:
+            return MAX_QUALITY
+        return int(min(MAX_QUALITY, round(-10 * np.log10(self.error_rate))))
+
+
+ERROR_FREE = ErrorProfile()
+
+
+def sample_positions(genome_length, count, min_length, max_length, rng):
+    """Uniform read lengths in [min_length, max_length] and start positions that fit the genome."""
+    max_length = min(max_length, genome_length)
+    if not 1 <= min_length <= max_length:
+        raise ValueError(f"Cannot sample reads of {min_length}-{max_length} bp "
+                         f"from a {genome_length} bp genome")
+    lengths = rng.integers(min_length, max_length + 1, size=count)
+    starts = (rng.random(count) * (genome_length - lengths + 1)).astype(np.int64)
+    return starts, lengths
+
+
+def read_matrix(codes, starts, lengths):
+    """
+    Gathers reads from encoded genome `codes` as a (reads, max_length)
+    uint8 matrix; positions past each read's length are OTHER.
+    """
+    width = int(lengths.max()) if len(lengths) else 0
+    padded = np.concatenate([codes, np.full(width, OTHER, dtype=np.uint8)])
+    reads = sliding_window_view(padded, max(width, 1))[starts, :width].copy()
+    reads[np.arange(width) >= lengths[:, None]] = OTHER
+    return reads
+
+
+def reverse_complement_rows(reads, lengths, rows):
+    """Reverse-complements, in place, the reads selected by the boolean mask `rows`."""
+    width = reads.shape[1]
+    columns = lengths[rows, None] - 1 - np.arange(width)
+    inside = columns >= 0
+    flipped = np.take_along_axis(reads[rows], np.where(inside, columns, 0), axis=1)
+    flipped = np.where(flipped == OTHER, OTHER, 3 - flipped)
+    reads[rows] = np.where(inside, flipped, OTHER)
+    return reads
+
+
+def _event_mask(shape, rate, rng):
+    """Boolean mask with each cell set with probability `rate`, drawn sparsely."""
+    mask = np.zeros(shape, dtype=bool)
+    total = mask.size
+    if rate and total:
+        mask.flat[rng.integers(0, total, size=rng.binomial(total, rate))] = True
+    return mask
+
+
+def apply_errors(reads, lengths, profile, rng):
+    """Returns (reads, lengths) with substitutions, insertions and deletions from `profile`."""
+    count, width = reads.shape
+    inside = np.arange(width) < lengths[:, None]
+
+    if profile.substitution:
+        hit = _event_mask(reads.shape, profile.substitution, rng) & inside & (reads != OTHER)
+        shift = rng.integers(1, 4, size=int(hit.sum()), dtype=np.uint8)
+        reads[hit] = (reads[hit] + shift) % 4
+
+    if not (profile.insertion or profile.deletion):
+        return reads, lengths
+
+    keep = inside & ~_event_mask(reads.shape, profile.deletion, rng)
+    insert = keep & _event_mask(reads.shape, profile.insertion, rng)
+    slots = keep.astype(np.int32) + insert
+    ends = np.cumsum(slots, axis=1, dtype=np.int32)
+    new_lengths = ends[:, -1].astype(np.int64) if width else np.zeros(count, dtype=np.int64)
+
+    # flat indices are much faster than (row, column) pairs here
+    out_width = int(new_lengths.max(initial=0))
+    out = np.full(count * out_width, OTHER, dtype=np.uint8)
+    kept = np.flatnonzero(keep)
+    target = (kept // width) * out_width + (ends.ravel()[kept] - slots.ravel()[kept])
+    out[target] = reads.ravel()[kept]
+    extra = insert.ravel()[kept]
+    out[target[extra] + 1] = rng.integers(0, 4, size=int(extra.sum()), dtype=np.uint8)
+    return out.reshape(count, out_width), new_lengths
+
+
+def simulate_reads(genome, count, min_length=100, max_length=150, profile=ERROR_FREE,
+                   both_strands=False, seed=None, chunk_size=CHUNK_SIZE):
+    """
+    Yields chunks of simulated reads as dicts with 'starts', 'strands'
+    (+1/-1), 'reads' (code matrix) and 'lengths'. `genome` may be a
+    sequence or an already encoded code array. Same seed, same reads.
+    """
+    codes = encode(genome)
+    rng = np.random.default_rng(seed)
+    for done in range(0, count, chunk_size):
+        size = min(chunk_size, count - done)
+        starts, lengths = sample_positions(len(codes), size, min_length, max_length, rng)
+        reads = read_matrix(codes, starts, lengths)
+        strands = np.ones(size, dtype=np.int8)
+        if both_strands:
+            strands[rng.random(size) < 0.5] = -1
+            reverse_complement_rows(reads, lengths, strands < 0)
+        reads, lengths = apply_errors(reads, lengths, profile, rng)
+        yield {'starts': starts, 'strands': strands, 'reads': reads, 'lengths': lengths}
+
+
+def as_strings(reads, lengths):
+    """Decodes a read code matrix into a list of strings."""
+    letters = _LETTERS[reads]
+    return [row[:length].tobytes().decode('ascii') for row, length in zip(letters, lengths.tolist())]
+
+
+def sample_reads(genome, count, min_length=100, max_length=150, profile=ERROR_FREE,
+                 both_strands=False, seed=None):
+    """Simulated reads as a list of strings."""
+    reads = []
+    for chunk in simulate_reads(genome, count, min_length, max_length, profile, both_strands, seed):
+        reads.extend(as_strings(chunk['reads'], chunk['lengths']))
+    return reads
+
+
+def write_fastq(out, chunks, profile=ERROR_FREE, prefix="read"):
+    """
+    Writes chunks from simulate_reads to an open text stream as FASTQ,
+    one chunk at a time; read names carry the true start and strand.
+    Returns the number of reads written.
+    """
+    quality = chr(33 + profile.quality())
+    count = 0
+    for chunk in chunks:
+        lines = []
+        sequences = as_strings(chunk['reads'], chunk['lengths'])
+        for start, strand, seq in zip(chunk['starts'].tolist(), chunk['strands'].tolist(), sequences):
+            count += 1
+            lines.append(f"@{prefix}{count} start={start} strand={'+' if strand > 0 else '-'}\n"
+                         f"{seq}\n+\n{quality * len(seq)}\n")
+        out.write("".join(lines))
+    return count
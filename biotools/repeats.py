@@ -0,0 +1,77 @@
+"""
+Inverted-repeat detection (transposon-like elements).
+
+An inverted repeat is a k-mer followed, after a spacer of min_dist to
+max_dist bases, by its own reverse complement. For each IR length the
+genome's k-mer codes are computed once and sorted by (code, position), so
+for every k-mer the first occurrence of its reverse complement inside the
+allowed distance band is found with two `searchsorted` calls over the whole
+genome at once.
+"""
+
+import numpy as np
+
+from .kmers import as_strings, kmer_positions, reverse_complement_codes
+
+IR_DTYPE = np.dtype([('start', 'i8'), ('end', 'i8'), ('ir_len', 'u1'), ('payload_len', 'i4'),
+                     ('ir_code', 'u8')])
+
+
+def _pairs(seq, k, min_dist, max_dist):
+    codes, starts = kmer_positions(seq, k)
+    span = len(seq) + 1
+    # positions are increasing, so a stable sort by code sorts by (code, position)
+    order = np.argsort(codes, kind='stable')
+    sorted_codes, positions = codes[order], starts[order]
+    # key on the rank of each distinct code, not the code itself: 4**k * span
+    # overflows 64 bits for long arms, the number of distinct codes never does
+    new = np.ones(len(sorted_codes), dtype=bool)
+    new[1:] = sorted_codes[1:] != sorted_codes[:-1]
+    distinct = sorted_codes[new]
+    keys = (np.cumsum(new) - 1) * span + positions
+
+    # the closing IR must start in [i + k + min_dist, i + k + max_dist]
+    # (bounds are clipped to the sequence so they never reach the next code's keys)
+    wanted = reverse_complement_codes(codes, k)
+    rank = np.searchsorted(distinct, wanted)
+    present = rank < len(distinct)
+    present[present] = distinct[rank[present]] == wanted[present]
+    first = rank * span + np.minimum(starts + k + min_dist, len(seq))
+    last = rank * span + np.minimum(starts + k + max_dist, len(seq))
+    # searching in sorted order keeps searchsorted cache-friendly
+    query_order = np.argsort(first)
+    lo = np.empty(len(first), dtype=np.int64)
+    lo[query_order] = np.searchsorted(keys, first[query_order], side='left')
+    found = present & (lo < len(keys))
+    found[found] = keys[lo[found]] <= last[found]
+
+    hits = np.zeros(int(found.sum()), dtype=IR_DTYPE)
+    closing = positions[lo[found]]
+    hits['start'] = starts[found]
+    hits['end'] = closing + k
+    hits['ir_len'] = k
+    hits['payload_len'] = closing - (starts[found] + k)
+    hits['ir_code'] = codes[found]
+    return hits
+
+
+def find_inverted_repeats(seq, min_ir=4, max_ir=6, min_dist=10, max_dist=100):
+    """
+    Inverted repeats with arms of min_ir..max_ir bases and a payload of
+    min_dist..max_dist bases, as an IR_DTYPE array sorted by (start, ir_len).
+    For each arm only the nearest closing arm is reported. Arms containing
+    N or other ambiguous symbols are skipped.
+    """
+    if min_ir < 1 or max_ir < min_ir:
+        raise ValueError(f"Invalid IR length range {min_ir}-{max_ir}")
+    if min_dist < 0 or max_dist < min_dist:
+        raise ValueError(f"Invalid distance range {min_dist}-{max_dist}")
+    hits = np.concatenate([_pairs(seq, k, min_dist, max_dist) for k in range(min_ir, max_ir + 1)])
+    # hits are concatenated by increasing ir_len, so a stable sort by start keeps that order
+    return hits[np.argsort(hits['start'], kind='stable')]
+
+
+def ir_sequences(hits):
+    """Left arm sequence of each hit, as strings."""
+    return [as_strings(np.array([code], dtype=np.uint64), k)[0]
+            for code, k in zip(hits['ir_code'].tolist(), hits['ir_len'].tolist())]
@@ -0,0 +1,526 @@
+"""
+Restriction digests with many enzymes in one pass over the sequence.
+
+Every recognition site is expanded from its IUPAC symbols into concrete
+ACGT words (the reverse-complement words too, for sites that are not
+palindromic) and all words of all enzymes go into one Aho-Corasick
+automaton with a dense (states, 5) transition table, so the sequence is
+read once whatever the number of enzymes. Sites whose expansion would be too
+large (long N runs, e.g. XcmI CCANNNNNNNNNTGG) are entered by their longest
+expandable prefix and the candidate hits are checked against the full
+site with 4-bit base-set masks afterwards.
+
+A site hit becomes a top-strand and a bottom-strand cut position; the top
+cut bounds the fragments and the distance to the bottom cut is the sticky
+end. Per-enzyme cut arrays are kept sorted, so any combination of enzymes
+is digested by merging them.
+
+Virtual digest searches run on those arrays too. Adding an enzyme only
+splits fragments, so a pair's fragments lie within the [smallest, largest]
+fragment interval of each partner and a pair has at least as many fragments
+as either partner: enzymes whose interval or fragment count already rules a
+pair out are pruned. The remaining partners of an enzyme are merged with it
+in one sort of (partner, cut) keys and their fragments computed together.
+"""
+
+import itertools
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from .encoding import ALPHABET, IUPAC_BASES, OTHER, encode, encode_iupac
+
+MAX_EXPANSION = 1024
+
+SITE_DTYPE = np.dtype([('enzyme', 'i4'), ('start', 'i8'), ('strand', 'i1'), ('top', 'i8'),
+                       ('bottom', 'i8')])
+FRAGMENT_DTYPE = np.dtype([('start', 'i8'), ('end', 'i8'), ('length', 'i8'), ('left', 'i4'),
+                           ('right', 'i4')])
+
+_COMPLEMENT = str.maketrans("ACGTRYSWKMBDHVN", "TGCAYRSWMKVHDBN")
+
+
+class Enzyme:
+    """
+    A restriction enzyme: IUPAC recognition `site` and the cut positions on
+    the top and bottom strand, counted in bases from the start of the site
+    on the top strand (EcoRI G^AATT_C: top=1, bottom=5). Cuts may lie
+    outside the site (type IIS enzymes).
+    """
+
+    def __init__(self, name, site, top, bottom=None):
+        site = site.upper().replace('U', 'T')
+        if not site or any(symbol not in IUPAC_BASES for symbol in site):
+            raise ValueError(f"Invalid recognition site '{site}' for {name}")
+        self.name = name
+        self.site = site
+        self.top = top
+        self.bottom = len(site) - top if bottom is None else bottom
+
+    def __repr__(self):
+        return f"Enzyme('{self.name}', '{self.site}', {self.top}, {self.bottom})"
+
+    @classmethod
+    def from_rebase(cls, name, pattern):
+        """
+        Parses REBASE notation: 'G^AATTC' (cut inside a palindromic site) or
+        'GGTCTC(1/5)' (cuts 1 and 5 bases after the site on the top and
+        bottom strand).
+        """
+        if '^' in pattern:
+            top = pattern.index('^')
+            return cls(name, pattern.replace('^', ''), top)
+        if pattern.endswith(')') and '(' in pattern:
+            site, _, cuts = pattern[:-1].partition('(')
+            top, _, bottom = cuts.partition('/')
+            return cls(name, site, len(site) + int(top), len(site) + int(bottom))
+        raise ValueError(f"Cannot parse REBASE pattern '{pattern}' for {name}")
+
+    @property
+    def overhang(self):
+        """Sticky-end length: > 0 for 5' overhangs, < 0 for 3' overhangs, 0 for blunt ends."""
+        return self.bottom - self.top
+
+    @property
+    def ends(self):
+        return "blunt" if self.overhang == 0 else "5'" if self.overhang > 0 else "3'"
+
+    @property
+    def palindromic(self):
+        return self.site == reverse_complement_site(self.site)
+
+
+def reverse_complement_site(site):
+    return site.translate(_COMPLEMENT)[::-1]
+
+
+def expand_site(site):
+    """All ACGT words matched by an IUPAC site."""
+    return ["".join(word) for word in itertools.product(*(IUPAC_BASES[symbol] for symbol in site))]
+
+
+def _anchor(site):
+    """Longest prefix of `site` with at most MAX_EXPANSION concrete words."""
+    count = 1
+    for length, symbol in enumerate(site):
+        count *= len(IUPAC_BASES[symbol])
+        if count > MAX_EXPANSION:
+            return site[:max(length, 1)]
+    return site
+
+
+COMMON_ENZYMES = [Enzyme.from_rebase(name, pattern) for name, pattern in (
+    ("EcoRI", "G^AATTC"), ("BamHI", "G^GATCC"), ("HindIII", "A^AGCTT"), ("TaqI", "T^CGA"),
+    ("HaeIII", "GG^CC"), ("PstI", "CTGCA^G"), ("SmaI", "CCC^GGG"), ("KpnI", "GGTAC^C"),
+    ("SacI", "GAGCT^C"), ("XbaI", "T^CTAGA"), ("SalI", "G^TCGAC"), ("XhoI", "C^TCGAG"),
+    ("NotI", "GC^GGCCGC"), ("NcoI", "C^CATGG"), ("NdeI", "CA^TATG"), ("EcoRV", "GAT^ATC"),
+    ("SpeI", "A^CTAGT"), ("NheI", "G^CTAGC"), ("BglII", "A^GATCT"), ("ClaI", "AT^CGAT"),
+    ("MspI", "C^CGG"), ("AluI", "AG^CT"), ("DpnII", "^GATC"), ("Sau3AI", "^GATC"),
+    ("HinfI", "G^ANTC"), ("DdeI", "C^TNAG"), ("AvaI", "C^YCGRG"), ("HincII", "GTY^RAC"),
+    ("BglI", "GCCNNNN^NGGC"), ("SfiI", "GGCCNNNN^NGGCC"), ("XcmI", "CCANNNNN^NNNNTGG"),
+    ("BsaI", "GGTCTC(1/5)"), ("BsmBI", "CGTCTC(1/5)"), ("BbsI", "GAAGAC(2/6)"),
+    ("SapI", "GCTCTTC(1/4)"), ("MlyI", "GAGTC(5/5)"),
+)]
+
+
+def read_emboss(filename):
+    """
+    Reads a REBASE enzyme file in EMBOSS format (emboss_e.###): one enzyme per
+    line with name, site, length, number of cuts, blunt flag and the cut
+    positions. Enzymes without known cuts are skipped; for enzymes cutting
+    on both sides of the site only the first pair of cuts is used.
+    """
+    enzymes = []
+    with open(filename, 'r') as f:
+        for line in f:
+            if not line.strip() or line.startswith('#'):
+                continue
+            fields = line.split()
+            name, site, cuts = fields[0], fields[1], int(fields[3])
+            if cuts == 0 or site == '?':
+                continue
+            enzymes.append(Enzyme(name, site, int(fields[5]), int(fields[6])))
+    return enzymes
+
+
+class Automaton:
+    """
+    Aho-Corasick automaton over the words of a list of enzymes. Every word
+    carries (enzyme, strand, site length); `outputs` lists, for each state,
+    the words ending there, including those reached through failure links.
+    """
+
+    def __init__(self, enzymes):
+        self.enzymes = list(enzymes)
+        words, self.word_enzyme, self.word_strand, self.partial = [], [], [], []
+        self.max_length = 1
+        for number, enzyme in enumerate(self.enzymes):
+            strands = [(1, enzyme.site)]
+            if not enzyme.palindromic:
+                strands.append((-1, reverse_complement_site(enzyme.site)))
+            for strand, site in strands:
+                anchor = _anchor(site)
+                self.max_length = max(self.max_length, len(site))
+                for word in expand_site(anchor):
+                    words.append(word)
+                    self.word_enzyme.append(number)
+                    self.word_strand.append(strand)
+                    self.partial.append(len(anchor) < len(site))
+        self.word_enzyme = np.array(self.word_enzyme, dtype=np.int32)
+        self.word_strand = np.array(self.word_strand, dtype=np.int8)
+        self.word_length = np.array([len(word) for word in words], dtype=np.int64)
+        self.partial = np.array(self.partial, dtype=bool)
+        self._build(words)
+
+    def _build(self, words):
+        # trie
+        children, own = [[-1] * 4], [[]]
+        for number, word in enumerate(words):
+            state = 0
+            for symbol in word:
+                base = ALPHABET.index(symbol)
+                if children[state][base] < 0:
+                    children[state][base] = len(children)
+                    children.append([-1] * 4)
+                    own.append([])
+                state = children[state][base]
+            own[state].append(number)
+
+        # failure links and the dense transition table, breadth first
+        count = len(children)
+        delta = [[0] * 5 for _ in range(count)]
+        fail = [0] * count
+        outputs = [[] for _ in range(count)]
+        queue = []
+        for base, child in enumerate(children[0]):
+            if child >= 0:
+                delta[0][base] = child
+                queue.append(child)
+        for state in queue:
+            outputs[state] = own[state] + outputs[fail[state]]
+            for base, child in enumerate(children[state]):
+                if child >= 0:
+                    fail[child] = delta[fail[state]][base]
+                    delta[state][base] = child
+                    queue.append(child)
+                else:
+                    delta[state][base] = delta[fail[state]][base]
+
+        self.delta = np.array(delta, dtype=np.int64)
+        sizes = np.array([len(words) for words in outputs], dtype=np.int64)
+        self.output_start = np.cumsum(sizes) - sizes
+        self.output_count = sizes
+        self.outputs = np.array([word for words in outputs for word in words], dtype=np.int64)
+
+    def scan(self, codes):
+        """
+        (end position, word) of every word occurrence in `codes`, with end
+        positions exclusive. The sequence is read once; symbols other than
+        ACGT send the automaton back to the root.
+        """
+        # states are stored premultiplied by 5 so a step is a single lookup
+        step = (5 * self.delta).ravel().tolist()
+        accepting = np.repeat(self.output_count > 0, 5).tolist()
+        state, ends, states = 0, [], []
+        for position, code in enumerate(codes.tolist()):
+            state = step[state + code]
+            if accepting[state]:
+                ends.append(position)
+                states.append(state // 5)
+        ends = np.array(ends, dtype=np.int64) + 1
+        states = np.array(states, dtype=np.int64)
+        counts = self.output_count[states]
+        run_starts = np.cumsum(counts) - counts
+        within = np.arange(int(counts.sum())) - np.repeat(run_starts, counts)
+        return np.repeat(ends, counts), self.outputs[np.repeat(self.output_start[states], counts) + within]
+
+
+def _verify(codes, starts, site):
+    """Which site starts in `codes` match the full IUPAC site."""
+    masks = encode_iupac(site).astype(np.int64)
+    padded = np.concatenate([codes, np.full(len(site), OTHER, dtype=np.uint8)])
+    windows = sliding_window_view(padded, len(site))[starts].astype(np.int64)
+    return (((1 << windows) & masks) != 0).all(axis=1)
+
+
+def find_sites(seq, enzymes, circular=False, automaton=None):
+    """
+    Every recognition site of every enzyme, from a single scan of `seq`.
+    Returns a SITE_DTYPE array sorted by top-strand cut: enzyme index,
+    site start, strand (+1 for the site as written, -1 for its reverse
+    complement) and the top/bottom-strand cut positions. On circular
+    sequences sites may span the origin and cuts are taken modulo the
+    length; on linear ones cuts outside the sequence are dropped.
+    """
+    automaton = automaton or Automaton(enzymes)
+    enzymes = automaton.enzymes
+    codes = encode(seq)
+    length = len(codes)
+    text = np.concatenate([codes, codes[:automaton.max_length - 1]]) if circular else codes
+
+    ends, words = automaton.scan(text)
+    starts = ends - automaton.word_length[words]
+    keep = starts < length
+    starts, words = starts[keep], words[keep]
+
+    # hits of anchors only: check the rest of the site
+    checked = np.flatnonzero(automaton.partial[words])
+    if len(checked):
+        valid = np.ones(len(words), dtype=bool)
+        keys = 2 * automaton.word_enzyme[words[checked]] + (automaton.word_strand[words[checked]] < 0)
+        for key in np.unique(keys).tolist():
+            rows = checked[keys == key]
+            site = enzymes[key // 2].site
+            valid[rows] = _verify(text, starts[rows], reverse_complement_site(site) if key % 2 else site)
+        starts, words = starts[valid], words[valid]
+
+    number = automaton.word_enzyme[words]
+    strand = automaton.word_strand[words]
+    site_length = np.array([len(enzyme.site) for enzyme in enzymes], dtype=np.int64)[number]
+    top_offset = np.array([enzyme.top for enzyme in enzymes], dtype=np.int64)[number]
+    bottom_offset = np.array([enzyme.bottom for enzyme in enzymes], dtype=np.int64)[number]
+
+    sites = np.zeros(len(words), dtype=SITE_DTYPE)
+    sites['enzyme'], sites['start'], sites['strand'] = number, starts, strand
+    # on the reverse strand the site reads right to left: its top-strand cut
+    # is the mirror of the enzyme's bottom-strand cut
+    sites['top'] = np.where(strand > 0, starts + top_offset, starts + site_length - bottom_offset)
+    sites['bottom'] = np.where(strand > 0, starts + bottom_offset, starts + site_length - top_offset)
+    if circular:
+        sites['top'] %= max(length, 1)
+        sites['bottom'] %= max(length, 1)
+    else:
+        sites = sites[(sites['top'] > 0) & (sites['top'] < length)
+                      & (sites['bottom'] > 0) & (sites['bottom'] < length)]
+    # one int64 key sorts much faster than a lexsort of the two fields
+    return sites[np.argsort(sites['top'] * len(enzymes) + sites['enzyme'])]
+
+
+def fragments(cuts, length, circular=False, labels=None):
+    """
+    Fragments between sorted cut positions as a FRAGMENT_DTYPE array, in
+    sequence order: start, end (exclusive; past the end of the sequence for
+    the fragment spanning the origin of a circular molecule), length and
+    the label (enzyme index) of the cut on each side, -1 for a sequence end.
+    """
+    cuts = np.asarray(cuts, dtype=np.int64)
+    labels = np.full(len(cuts), -1, dtype=np.int32) if labels is None else np.asarray(labels)
+    if len(cuts) == 0:
+        return np.array([(0, length, length, -1, -1)], dtype=FRAGMENT_DTYPE)
+    if circular:
+        starts, ends = cuts, np.append(cuts[1:], cuts[0] + length)
+        left, right = labels, np.roll(labels, -1)
+    else:
+        starts, ends = np.append(0, cuts), np.append(cuts, length)
+        left, right = np.append(-1, labels), np.append(labels, -1)
+    result = np.zeros(len(starts), dtype=FRAGMENT_DTYPE)
+    result['start'], result['end'], result['length'] = starts, ends, ends - starts
+    result['left'], result['right'] = left, right
+    return result
+
+
+def _grouped_fragments(groups, cuts, group_count, length, circular):
+    """
+    Fragment lengths of several digests at once. `cuts` holds the sorted,
+    distinct cut positions of every digest one after the other, `groups`
+    the (nondecreasing) digest of each cut. Returns (lengths, digest of
+    each fragment); a digest without cuts is one fragment of `length`.
+    """
+    same = groups[1:] == groups[:-1]
+    inner = (cuts[1:] - cuts[:-1])[same]
+    inner_groups = groups[1:][same]
+
+    counts = np.bincount(groups, minlength=group_count)
+    last = np.cumsum(counts) - 1
+    cut = np.flatnonzero(counts)
+    first_cut, last_cut = cuts[last[cut] - counts[cut] + 1], cuts[last[cut]]
+    if circular:
+        ends, end_groups = first_cut + length - last_cut, cut
+    else:
+        ends = np.concatenate([first_cut, length - last_cut])
+        end_groups = np.concatenate([cut, cut])
+    uncut = np.flatnonzero(counts == 0)
+    lengths = np.concatenate([inner, ends, np.full(len(uncut), length, dtype=np.int64)])
+    return lengths, np.concatenate([inner_groups, end_groups, uncut])
+
+
+class Digest:
+    """
+    The sites of a set of enzymes in one sequence, found with a single
+    scan. Cut positions are kept sorted per enzyme, so single, double and
+    combinatorial digests only merge the arrays of the enzymes involved.
+    """
+
+    def __init__(self, seq, enzymes, circular=True):
+        self.seq = seq
+        self.length = len(seq)
+        self.circular = circular
+        self.automaton = Automaton(enzymes)
+        self.enzymes = self.automaton.enzymes
+        self.names = {enzyme.name: number for number, enzyme in enumerate(self.enzymes)}
+        self.sites = find_sites(seq, self.enzymes, circular, self.automaton)
+        enzyme, top = self.sites['enzyme'], self.sites['top']
+        order = np.argsort(enzyme * np.int64(self.length + 1) + top)
+        # sites of enzyme i are by_enzyme[bounds[i]:bounds[i + 1]], sorted by top cut
+        self.by_enzyme = self.sites[order]
+        self.bounds = np.searchsorted(enzyme[order], np.arange(len(self.enzymes) + 1))
+        enzyme, top = enzyme[order], top[order]
+        distinct = np.ones(len(top), dtype=bool)
+        distinct[1:] = (top[1:] != top[:-1]) | (enzyme[1:] != enzyme[:-1])
+        # distinct cuts of all enzymes, enzyme by enzyme: enzyme i owns cuts[cut_bounds[i]:cut_bounds[i + 1]]
+        self.cut_enzyme = enzyme[distinct].astype(np.int64)
+        self.flat_cuts = top[distinct]
+        self.cut_bounds = np.searchsorted(self.cut_enzyme, np.arange(len(self.enzymes) + 1))
+        self.cut_arrays = [self.flat_cuts[lo:hi]
+                           for lo, hi in zip(self.cut_bounds[:-1].tolist(), self.cut_bounds[1:].tolist())]
+
+        # fragment count and [smallest, largest] fragment of every single digest
+        lengths, groups = _grouped_fragments(self.cut_enzyme, self.flat_cuts, len(self.enzymes),
+                                             self.length, circular)
+        self.fragment_count = np.bincount(groups, minlength=len(self.enzymes))
+        self.smallest = np.full(len(self.enzymes), self.length, dtype=np.int64)
+        self.largest = np.zeros(len(self.enzymes), dtype=np.int64)
+        np.minimum.at(self.smallest, groups, lengths)
+        np.maximum.at(self.largest, groups, lengths)
+
+    def _index(self, enzyme):
+        if isinstance(enzyme, str):
+            if enzyme not in self.names:
+                raise ValueError(f"Unknown enzyme '{enzyme}'")
+            return self.names[enzyme]
+        return int(enzyme)
+
+    def enzyme_sites(self, enzyme):
+        number = self._index(enzyme)
+        return self.by_enzyme[self.bounds[number]:self.bounds[number + 1]]
+
+    def cuts(self, enzyme):
+        """Sorted, distinct top-strand cut positions of one enzyme."""
+        return self.cut_arrays[self._index(enzyme)]
+
+    def merged_cuts(self, enzymes):
+        """(sorted distinct cut positions, enzyme index of each cut) of several enzymes together."""
+        numbers = [self._index(enzyme) for enzyme in enzymes]
+        cuts = np.concatenate([self.cut_arrays[number] for number in numbers] + [np.zeros(0, np.int64)])
+        labels = np.concatenate([np.full(len(self.cut_arrays[number]), number, dtype=np.int32)
+                                 for number in numbers] + [np.zeros(0, np.int32)])
+        order = np.argsort(cuts, kind='stable')
+        cuts, labels = cuts[order], labels[order]
+        first = np.ones(len(cuts), dtype=bool)
+        first[1:] = cuts[1:] != cuts[:-1]
+        return cuts[first], labels[first]
+
+    def digest(self, *enzymes):
+        """Fragments (FRAGMENT_DTYPE) of a digest with one or more enzymes."""
+        cuts, labels = self.merged_cuts(enzymes)
+        return fragments(cuts, self.length, self.circular, labels)
+
+    def combinations(self, size=2):
+        """Yields (enzyme names, fragments) of every digest with `size` enzymes."""
+        for numbers in itertools.combinations(range(len(self.enzymes)), size):
+            yield tuple(self.enzymes[number].name for number in numbers), self.digest(*numbers)
+
+    def overhangs(self, enzyme):
+        """Sticky-end sequences of every site of an enzyme, in cut order."""
+        sites = self.enzyme_sites(enzyme)
+        text = self.seq + self.seq if self.circular else self.seq
+        result = []
+        for top, bottom in zip(sites['top'].tolist(), sites['bottom'].tolist()):
+            low, high = min(top, bottom), max(top, bottom)
+            if self.circular and high - low > self.length // 2:
+                # the two cuts lie on either side of the origin
+                low, high = high, low + self.length
+            result.append(text[low:high])
+        return result
+
+    def fragment_search(self, min_size, max_size, pairs=True, all_within=False, max_fragments=None):
+        """
+        Single enzymes and, with pairs=True, enzyme pairs whose digest has a
+        fragment of min_size..max_size bp (every fragment in the window with
+        all_within=True) and at most max_fragments fragments. Returns
+        (enzyme names, fragment count, fragments in the window) tuples,
+        fewest fragments first.
+        """
+        limit = self.length + 1 if max_fragments is None else max_fragments
+        # a pair's fragments are no larger, and its smallest no larger, than each partner's
+        if all_within:
+            possible = self.smallest >= min_size
+        else:
+            possible = self.largest >= min_size
+        possible &= self.fragment_count <= limit
+
+        results = []
+
+        def collect(numbers, lengths, groups, group_count):
+            inside = (lengths >= min_size) & (lengths <= max_size)
+            hits = np.bincount(groups, weights=inside, minlength=group_count).astype(np.int64)
+            count = np.bincount(groups, minlength=group_count)
+            found = (hits == count) if all_within else (hits > 0)
+            found &= count <= limit
+            for group in np.flatnonzero(found).tolist():
+                names = tuple(self.enzymes[number].name for number in numbers[group])
+                results.append((names, int(count[group]), int(hits[group])))
+
+        lengths, groups = _grouped_fragments(self.cut_enzyme, self.flat_cuts, len(self.enzymes),
+                                             self.length, self.circular)
+        collect([(number,) for number in range(len(self.enzymes))], lengths, groups, len(self.enzymes))
+
+        if pairs:
+            # pairing with an enzyme that does not cut is the single digest again
+            partners = np.flatnonzero(possible & (self.cut_bounds[1:] > self.cut_bounds[:-1]))
+            for first in partners.tolist():
+                others = partners[partners > first]
+                if len(others) == 0:
+                    continue
+                # cuts of all partners, then `first`'s cuts once per partner, merged by one sort
+                counts = self.cut_bounds[others + 1] - self.cut_bounds[others]
+                run_starts = np.cumsum(counts) - counts
+                flat = np.repeat(self.cut_bounds[others] - run_starts, counts) + np.arange(int(counts.sum()))
+                own = self.cut_arrays[first]
+                groups = np.concatenate([np.repeat(np.arange(len(others)), counts),
+                                         np.repeat(np.arange(len(others)), len(own))])
+                cuts = np.concatenate([self.flat_cuts[flat], np.tile(own, len(others))])
+                keys = np.sort(groups * np.int64(self.length + 1) + cuts)
+                keys = keys[np.append(True, keys[1:] != keys[:-1])]
+                groups, cuts = keys // (self.length + 1), keys % (self.length + 1)
+                lengths, fragment_groups = _grouped_fragments(groups, cuts, len(others), self.length,
+                                                              self.circular)
+                collect([(first, other) for other in others.tolist()], lengths, fragment_groups, len(others))
+
+        results.sort(key=lambda result: (result[1], len(result[0]), result[0]))
+        return results
+
+    def region_cutters(self, start, end, unique=True):
+        """
+        Enzymes cutting exactly once inside [start, end), as (name, cut)
+        pairs sorted by cut. With unique=True they must not cut anywhere
+        else in the sequence.
+        """
+        keys = self.cut_enzyme * (self.length + 1) + self.flat_cuts
+        base = np.arange(len(self.enzymes), dtype=np.int64) * (self.length + 1)
+        lo = np.searchsorted(keys, base + max(start, 0))
+        hi = np.searchsorted(keys, base + min(end, self.length + 1))
+        once = hi - lo == 1
+        if unique:
+            once &= self.cut_bounds[1:] - self.cut_bounds[:-1] == 1
+        numbers = np.flatnonzero(once)
+        cuts = self.flat_cuts[lo[numbers]]
+        order = np.argsort(cuts, kind='stable')
+        return [(self.enzymes[number].name, cut)
+                for number, cut in zip(numbers[order].tolist(), cuts[order].tolist())]
+
+    def region_pairs(self, start, end, min_size=0, max_size=None, unique=True):
+        """
+        Pairs of enzymes that each cut once inside [start, end) at different
+        positions (e.g. for directional cloning), with min_size..max_size bp
+        between the cuts. Returns (name, name, cut, cut) tuples by cut.
+        """
+        cutters = self.region_cutters(start, end, unique)
+        cuts = np.array([cut for _, cut in cutters], dtype=np.int64)
+        left, right = np.triu_indices(len(cutters), k=1)
+        span = cuts[right] - cuts[left]
+        keep = (span > 0) & (span >= min_size)
+        if max_size is not None:
+            keep &= span <= max_size
+        return [(cutters[a][0], cutters[b][0], cutters[a][1], cutters[b][1])
+                for a, b in zip(left[keep].tolist(), right[keep].tolist())]
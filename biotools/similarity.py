@@ -0,0 +1,149 @@
+"""
+Pairwise similarity scores and all-vs-all similarity matrices.
+
+Positional scores (identity and weighted match/mismatch) compare the
+uppercase byte arrays of two sequences with one NumPy equality reduction
+over their common length. The k-mer Jaccard index works on each sequence's
+sorted array of distinct k-mer codes, computed once per sequence, and
+counts the intersection with `searchsorted`. All-vs-all matrices are filled
+row by row in a process pool and written as symmetric distance matrices
+(relaxed PHYLIP) ready for clustering.
+"""
+
+import glob
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .encoding import upper_bytes
+from .fasta import read_sequence
+from .kmers import count_kmers
+
+SCORES = ("identity", "weighted", "jaccard")
+
+
+def _matches(a, b):
+    length = min(len(a), len(b))
+    return int(np.count_nonzero(a[:length] == b[:length])), length
+
+
+def identity(seq1, seq2):
+    """Returns (percentage, matches) of identical symbols at the same positions."""
+    matches, length = _matches(upper_bytes(seq1), upper_bytes(seq2))
+    if length == 0:
+        return 0.0, 0
+    return matches / length * 100, matches
+
+
+def _weighted(matches, length, match_reward, mismatch_penalty):
+    raw = matches * match_reward - (length - matches) * mismatch_penalty
+    low, high = -length * mismatch_penalty, length * match_reward
+    return (raw - low) / (high - low) * 100, raw
+
+
+def weighted(seq1, seq2, match_reward=1, mismatch_penalty=1):
+    """
+    Returns (normalized, raw): raw adds match_reward per identical position
+    and subtracts mismatch_penalty per other position; normalized maps raw
+    from [min, max] possible to 0..100.
+    """
+    matches, length = _matches(upper_bytes(seq1), upper_bytes(seq2))
+    if length == 0:
+        return 0.0, 0
+    return _weighted(matches, length, match_reward, mismatch_penalty)
+
+
+def kmer_set(seq, k):
+    """Sorted array of the distinct k-mer codes of a sequence."""
+    return count_kmers(seq, k)[0]
+
+
+def jaccard_codes(kmers1, kmers2):
+    """Returns (percentage, intersection, union) of two sorted distinct k-mer code arrays."""
+    if len(kmers1) > len(kmers2):
+        kmers1, kmers2 = kmers2, kmers1
+    found = np.searchsorted(kmers2, kmers1)
+    found[found == len(kmers2)] = 0
+    intersection = int(np.count_nonzero(kmers2[found] == kmers1)) if len(kmers2) else 0
+    union = len(kmers1) + len(kmers2) - intersection
+    if union == 0:
+        return 0.0, 0, 0
+    return intersection / union * 100, intersection, union
+
+
+def jaccard(seq1, seq2, k=3):
+    """Jaccard index of the k-mer sets of two sequences (k-mers with N are skipped)."""
+    return jaccard_codes(kmer_set(seq1, k), kmer_set(seq2, k))
+
+
+def _init_worker(sequences, kmer_sets, match_reward, mismatch_penalty):
+    global _sequences, _kmer_sets, _rewards
+    _sequences, _kmer_sets = sequences, kmer_sets
+    _rewards = (match_reward, mismatch_penalty)
+
+
+def _row(i):
+    """Scores of sequence i against every sequence j > i."""
+    count = len(_sequences)
+    row = np.zeros((len(SCORES), count - i - 1))
+    for col, j in enumerate(range(i + 1, count)):
+        matches, length = _matches(_sequences[i], _sequences[j])
+        if length:
+            row[0, col] = matches / length * 100
+            row[1, col] = _weighted(matches, length, *_rewards)[0]
+        row[2, col] = jaccard_codes(_kmer_sets[i], _kmer_sets[j])[0]
+    return i, row
+
+
+def similarity_matrices(records, k=3, match_reward=1, mismatch_penalty=1, workers=1):
+    """
+    All-vs-all similarities of (name, sequence) records.
+    Returns (names, {score: (n, n) matrix of percentages}) for each score
+    in SCORES; diagonals are 100. Rows are computed serially by default;
+    workers > 1 (or None for one per CPU) uses a process pool.
+    """
+    records = list(records)
+    names = [name for name, _ in records]
+    sequences = [upper_bytes(seq) for _, seq in records]
+    kmer_sets = [kmer_set(seq, k) for _, seq in records]
+    count = len(records)
+    matrices = np.zeros((len(SCORES), count, count))
+
+    initargs = (sequences, kmer_sets, match_reward, mismatch_penalty)
+    if workers is None or workers > 1:
+        workers = workers or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=initargs) as executor:
+            rows = list(executor.map(_row, range(count)))
+    else:
+        _init_worker(*initargs)
+        rows = [_row(i) for i in range(count)]
+
+    for i, row in rows:
+        matrices[:, i, i + 1:] = row
+    matrices += matrices.transpose(0, 2, 1)
+    matrices[:, np.arange(count), np.arange(count)] = 100.0
+    return names, dict(zip(SCORES, matrices))
+
+
+def distance_matrix(similarity):
+    """Converts a matrix of similarity percentages into distances in [0, 1]."""
+    return 1.0 - np.asarray(similarity) / 100.0
+
+
+def write_distance_matrix(filename, names, matrix):
+    """Writes a square distance matrix in relaxed PHYLIP format."""
+    with open(filename, 'w') as out:
+        out.write(f"{len(names)}\n")
+        for name, row in zip(names, matrix):
+            out.write(name.replace(' ', '_') + " " + " ".join(f"{d:.6f}" for d in row) + "\n")
+
+
+def read_fasta_folder(folder, pattern="*.fasta"):
+    """Returns (name, sequence) for every FASTA file of a folder, named after the file."""
+    records = []
+    for filename in sorted(glob.glob(os.path.join(folder, pattern))):
+        name = os.path.splitext(os.path.basename(filename))[0]
+        records.append((name, read_sequence(filename)))
+    return records
@@ -0,0 +1,150 @@
+"""
+Dot-plot / synteny engine for comparing two genomes.
+
+Anchors are k-mers shared by both genomes, on either strand, found by
+looking up the integer codes of one genome's k-mers in a sorted code index
+of the other. Anchors are chained into collinear blocks by clustering them
+on their diagonal (pos2 - pos1 forward, pos2 + pos1 reverse) and splitting
+clusters where consecutive anchors are more than `max_gap` bases apart.
+Coverage tracks along the first genome are kept as a pyramid of per-bin
+sums, each level with bins twice as wide as the one below, so a view can ask
+for a region and get a bounded number of bins at any zoom level.
+"""
+
+import numpy as np
+
+from .kmers import kmer_positions, reverse_complement_codes
+from .local import MAX_OCCURRENCES, SeedIndex
+
+ANCHOR_DTYPE = np.dtype([('pos1', 'i8'), ('pos2', 'i8'), ('strand', 'i1')])
+BLOCK_DTYPE = np.dtype([('start1', 'i8'), ('end1', 'i8'), ('start2', 'i8'), ('end2', 'i8'),
+                        ('strand', 'i1'), ('anchors', 'i4')])
+
+
+def find_anchors(seq1, seq2, k=15, max_occurrences=MAX_OCCURRENCES):
+    """
+    K-mers shared by seq1 and seq2 as an ANCHOR_DTYPE array sorted by pos1.
+    strand is -1 when the k-mer at pos1 is the reverse complement of the
+    one at pos2. K-mers occurring more than max_occurrences times in seq2
+    are ignored.
+    """
+    index = SeedIndex(seq2, k)
+    codes, starts = kmer_positions(seq1, k)
+    parts = []
+    for strand, values in ((1, codes), (-1, reverse_complement_codes(codes, k))):
+        which, pos2 = index.lookup(values, max_occurrences)
+        part = np.zeros(len(which), dtype=ANCHOR_DTYPE)
+        part['pos1'], part['pos2'], part['strand'] = starts[which], pos2, strand
+        parts.append(part)
+    anchors = np.concatenate(parts)
+    return anchors[np.lexsort((anchors['pos2'], anchors['pos1']))]
+
+
+def chain_anchors(anchors, k, max_gap=500, tolerance=20, min_anchors=10):
+    """
+    Chains anchors into collinear blocks (BLOCK_DTYPE, sorted by start1).
+    Anchors whose diagonals differ by at most `tolerance` belong to the
+    same cluster; a cluster is split where consecutive anchors are more than
+    `max_gap` bases apart. Blocks with fewer than min_anchors are dropped.
+    """
+    blocks = []
+    for strand in (1, -1):
+        part = anchors[anchors['strand'] == strand]
+        if len(part) == 0:
+            continue
+        pos1, pos2 = part['pos1'], part['pos2']
+        diag = pos2 - pos1 if strand == 1 else pos2 + pos1
+        order = np.argsort(diag, kind='stable')
+        cluster = np.empty(len(order), dtype=np.int64)
+        cluster[order] = np.concatenate([[0], np.cumsum(np.diff(diag[order]) > tolerance)])
+
+        order = np.lexsort((pos1, cluster))
+        pos1, pos2, cluster = pos1[order], pos2[order], cluster[order]
+        new = np.concatenate([[True], (np.diff(cluster) != 0) | (np.diff(pos1) > max_gap)])
+        first = np.flatnonzero(new)
+
+        block = np.zeros(len(first), dtype=BLOCK_DTYPE)
+        block['start1'] = np.minimum.reduceat(pos1, first)
+        block['end1'] = np.maximum.reduceat(pos1, first) + k
+        block['start2'] = np.minimum.reduceat(pos2, first)
+        block['end2'] = np.maximum.reduceat(pos2, first) + k
+        block['strand'] = strand
+        block['anchors'] = np.diff(np.append(first, len(pos1)))
+        blocks.append(block[block['anchors'] >= min_anchors])
+
+    if not blocks:
+        return np.zeros(0, dtype=BLOCK_DTYPE)
+    blocks = np.concatenate(blocks)
+    return blocks[np.argsort(blocks['start1'], kind='stable')]
+
+
+def covered(length, starts, ends):
+    """Boolean mask of the positions 0..length-1 covered by any [start, end) interval."""
+    diff = np.zeros(length + 1, dtype=np.int64)
+    np.add.at(diff, np.clip(starts, 0, length), 1)
+    np.add.at(diff, np.clip(ends, 0, length), -1)
+    return np.cumsum(diff[:-1]) > 0
+
+
+class TrackPyramid:
+    """Per-bin sums of a per-base track, at bin sizes base_bin * 2**level."""
+
+    def __init__(self, values, base_bin=16):
+        self.length = len(values)
+        self.base_bin = base_bin
+        sums = np.add.reduceat(np.asarray(values, dtype=np.float64),
+                               np.arange(0, max(self.length, 1), base_bin)) if self.length else np.zeros(1)
+        self.levels = [sums]
+        while len(sums) > 1:
+            if len(sums) % 2:
+                sums = np.append(sums, 0.0)
+            sums = sums[0::2] + sums[1::2]
+            self.levels.append(sums)
+
+    def query(self, start, end, max_bins=1000):
+        """
+        Mean value per bin over [start, end) using the finest level with at
+        most max_bins bins there. Returns (bin_starts, bin_ends, means, bin_size).
+        """
+        start, end = max(int(start), 0), min(int(end), self.length)
+        if end <= start:
+            empty = np.zeros(0)
+            return empty.astype(np.int64), empty.astype(np.int64), empty, self.base_bin
+        level = 0
+        while level < len(self.levels) - 1 and (end - start) / (self.base_bin << level) > max_bins:
+            level += 1
+        size = self.base_bin << level
+        first, last = start // size, -(-end // size)
+        starts = np.arange(first, last, dtype=np.int64) * size
+        ends = np.minimum(starts + size, self.length)
+        return starts, ends, self.levels[level][first:last] / (ends - starts), size
+
+
+class SyntenyMap:
+    """Anchors, collinear blocks and coverage pyramids of seq1 against seq2."""
+
+    def __init__(self, seq1, seq2, k=15, base_bin=16, max_gap=500, tolerance=20, min_anchors=10,
+                 max_occurrences=MAX_OCCURRENCES):
+        self.length1, self.length2 = len(seq1), len(seq2)
+        self.k = k
+        self.anchors = find_anchors(seq1, seq2, k, max_occurrences)
+        self.blocks = chain_anchors(self.anchors, k, max_gap, tolerance, min_anchors)
+        self.tracks = {
+            'anchors': TrackPyramid(covered(self.length1, self.anchors['pos1'],
+                                            self.anchors['pos1'] + k), base_bin),
+            'blocks': TrackPyramid(covered(self.length1, self.blocks['start1'],
+                                           self.blocks['end1']), base_bin),
+        }
+
+    def anchors_in(self, start, end):
+        """Anchors whose pos1 lies in [start, end)."""
+        lo, hi = np.searchsorted(self.anchors['pos1'], [start, end])
+        return self.anchors[lo:hi]
+
+    def blocks_in(self, start, end):
+        """Blocks overlapping [start, end) of seq1."""
+        return self.blocks[(self.blocks['start1'] < end) & (self.blocks['end1'] > start)]
+
+    def track(self, name, start, end, max_bins=1000):
+        """Aggregated coverage of track `name` over [start, end); see TrackPyramid.query."""
+        return self.tracks[name].query(start, end, max_bins)
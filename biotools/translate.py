@@ -0,0 +1,151 @@
+"""
+Vectorised translation and ORF finding.
+
+A sequence is encoded once and each reading frame is viewed as a (codons, 3)
+array; a codon becomes the integer 16*b1 + 4*b2 + b3 (A=0, C=1, G=2, T=3),
+or INVALID_CODON when it contains any other symbol. Translation is a single
+lookup in the 65-entry letter array of a genetic code from the registry
+(NCBI id or GeneticCode, standard code by default); with ambiguous=True
+codons are coded as three 4-bit IUPAC base sets instead and looked up in
+the code's ambiguity array, so GCN still reads as alanine. ORFs are found
+per frame from boolean stop and start masks: the next stop after every codon
+is a reversed running minimum, so every start codon is paired with its stop
+without a Python loop over codons.
+"""
+
+import numpy as np
+
+from .encoding import OTHER, encode, encode_iupac, reverse_complement_codes, reverse_complement_iupac
+from .genetic_code import INVALID_CODON, genetic_code
+
+ORF_DTYPE = np.dtype([('start', 'i8'), ('end', 'i8'), ('strand', 'i1'), ('frame', 'i1'),
+                      ('length', 'i8')])
+
+
+def codon_code(codon):
+    """Integer code of a codon string (DNA or RNA)."""
+    codes = encode(codon)
+    if len(codes) != 3 or (codes == OTHER).any():
+        raise ValueError(f"Invalid codon '{codon}'")
+    return int(16 * codes[0] + 4 * codes[1] + codes[2])
+
+
+def codon_codes(seq, frame=0):
+    """Integer codes (0-63, INVALID_CODON) of the complete codons of a frame (0, 1 or 2)."""
+    codes = encode(seq)[frame:]
+    triplets = codes[:len(codes) // 3 * 3].reshape(-1, 3).astype(np.int16)
+    values = 16 * triplets[:, 0] + 4 * triplets[:, 1] + triplets[:, 2]
+    values[(triplets == OTHER).any(axis=1)] = INVALID_CODON
+    return values
+
+
+def ambiguous_codon_codes(masks, frame=0):
+    """Codes 256*s1 + 16*s2 + s3 of the complete codons of a frame of IUPAC base sets."""
+    triplets = masks[frame:][:(len(masks) - frame) // 3 * 3].reshape(-1, 3).astype(np.int16)
+    return 256 * triplets[:, 0] + 16 * triplets[:, 1] + triplets[:, 2]
+
+
+def translate_codes(values, table=1, ambiguous=False):
+    """Amino-acid letters of an array of codon codes (ambiguous codes with ambiguous=True), as a string."""
+    code = genetic_code(table)
+    letters = code.ambiguous if ambiguous else code.letters
+    return letters[values].tobytes().decode('ascii')
+
+
+def translate(seq, frame=0, table=1, to_stop=False, ambiguous=False):
+    """
+    One-letter translation of a frame ('*' = stop, 'X' = codon with N or
+    other symbols) with genetic code `table`. With ambiguous=True, codons
+    with IUPAC symbols translate when all their readings agree. With
+    to_stop=True translation ends before the first stop.
+    """
+    if ambiguous:
+        protein = translate_codes(ambiguous_codon_codes(encode_iupac(seq), frame), table, True)
+    else:
+        protein = translate_codes(codon_codes(seq, frame), table)
+    if to_stop:
+        protein = protein.split('*', 1)[0]
+    return protein
+
+
+def six_frames(seq, table=1, ambiguous=False):
+    """
+    Translations of the six reading frames, keyed +1, +2, +3 (forward) and
+    -1, -2, -3 (reverse complement).
+    """
+    if ambiguous:
+        codes = encode_iupac(seq)
+        reverse = reverse_complement_iupac(codes)
+        frame_codes = ambiguous_codon_codes
+    else:
+        codes = encode(seq)
+        reverse = reverse_complement_codes(codes)
+        frame_codes = codon_codes
+    frames = {}
+    for frame in range(3):
+        frames[frame + 1] = translate_codes(frame_codes(codes, frame), table, ambiguous)
+    for frame in range(3):
+        frames[-(frame + 1)] = translate_codes(frame_codes(reverse, frame), table, ambiguous)
+    return frames
+
+
+def _frame_orfs(values, stop_mask, start_mask, min_length, nested):
+    """(start codon index, stop codon index) of the ORFs of one frame."""
+    count = len(values)
+    is_stop = stop_mask[values]
+    # index of the first stop at or after every codon (count when there is none)
+    stop_at = np.where(is_stop, np.arange(count), count)
+    next_stop = np.minimum.accumulate(stop_at[::-1])[::-1]
+
+    starts = np.flatnonzero(start_mask[values])
+    stops = next_stop[starts]
+    keep = stops < count
+    starts, stops = starts[keep], stops[keep]
+    if not nested:
+        # only the most upstream start before each stop
+        stops, first = np.unique(stops, return_index=True)
+        starts = starts[first]
+    long_enough = stops - starts >= min_length
+    return starts[long_enough], stops[long_enough]
+
+
+def find_orfs(seq, min_length=100, starts=("ATG",), table=1, nested=False,
+              both_strands=True):
+    """
+    Open reading frames from a start codon to the next in-frame stop codon,
+    of at least min_length amino acids (stop excluded).
+
+    Returns an ORF_DTYPE array sorted by start: forward-strand coordinates
+    (0-based, half-open, stop codon included), strand (+1/-1), frame
+    (0-2, on the strand's own coordinates) and length in amino acids.
+    With nested=False only the longest ORF ending at each stop is reported;
+    with nested=True every in-frame start gives an ORF. starts=None uses
+    the start codons of the genetic code.
+    """
+    code = genetic_code(table)
+    codes = encode(seq)
+    length = len(codes)
+    if starts is None:
+        start_mask = code.starts
+    else:
+        start_mask = np.zeros(INVALID_CODON + 1, dtype=bool)
+        start_mask[[codon_code(codon) for codon in starts]] = True
+
+    strands = [(1, codes)]
+    if both_strands:
+        strands.append((-1, reverse_complement_codes(codes)))
+    parts = []
+    for strand, strand_codes in strands:
+        for frame in range(3):
+            first, stop = _frame_orfs(codon_codes(strand_codes, frame), code.stops, start_mask,
+                                      min_length, nested)
+            orfs = np.zeros(len(first), dtype=ORF_DTYPE)
+            begin, end = frame + 3 * first, frame + 3 * (stop + 1)
+            if strand < 0:
+                begin, end = length - end, length - begin
+            orfs['start'], orfs['end'] = begin, end
+            orfs['strand'], orfs['frame'] = strand, frame
+            orfs['length'] = stop - first
+            parts.append(orfs)
+    orfs = np.concatenate(parts)
+    return orfs[np.lexsort((orfs['end'], orfs['start']))]
@@ -0,0 +1,83 @@
+"""
+Sliding-window composition profiles in O(n).
+
+Each symbol gets a cumulative count array; the count inside any window is
+then the difference of two entries, so every window and step size costs the
+same single vectorised pass regardless of the window length.
+"""
+
+import numpy as np
+
+from .encoding import ALPHABET, OTHER, as_bytes, encode
+
+SYMBOLS = ALPHABET + "N"
+
+
+def _window_starts(length, window, step):
+    if window <= 0 or step <= 0:
+        raise ValueError("window and step must be positive")
+    if length < window:
+        return np.zeros(0, dtype=np.int64)
+    return np.arange(0, length - window + 1, step, dtype=np.int64)
+
+
+def _windowed(mask, starts, window):
+    prefix = np.zeros(len(mask) + 1, dtype=np.int64)
+    np.cumsum(mask, out=prefix[1:])
+    return prefix[starts + window] - prefix[starts]
+
+
+def window_counts(seq, window, step=1):
+    """
+    Counts A, C, G, T and N (any other symbol) in every window.
+    Returns (starts, {symbol: count array}).
+    """
+    codes = encode(seq)
+    starts = _window_starts(len(codes), window, step)
+    counts = {}
+    for code, symbol in enumerate(ALPHABET):
+        counts[symbol] = _windowed(codes == code, starts, window)
+    counts["N"] = _windowed(codes == OTHER, starts, window)
+    return starts, counts
+
+
+def window_profile(seq, window, step=1):
+    """
+    Composition of every window as a dict of float arrays:
+    'positions' (window starts), 'A', 'C', 'G', 'T', 'N' (relative
+    frequencies), 'gc' (G+C percent), 'gc_skew' (G-C)/(G+C) and
+    'at_skew' (A-T)/(A+T). Skews are 0 where the denominator is 0.
+    """
+    starts, counts = window_counts(seq, window, step)
+    profile = {"positions": starts}
+    for symbol in SYMBOLS:
+        profile[symbol] = counts[symbol] / window
+
+    g, c, a, t = counts["G"], counts["C"], counts["A"], counts["T"]
+    profile["gc"] = (g + c) / window * 100
+    profile["gc_skew"] = np.divide(g - c, g + c, out=np.zeros(len(starts)), where=(g + c) > 0)
+    profile["at_skew"] = np.divide(a - t, a + t, out=np.zeros(len(starts)), where=(a + t) > 0)
+    return profile
+
+
+def symbol_counts(seq, window, step=1, alphabet=None):
+    """
+    Count of each symbol of `alphabet` (default: the symbols found in the
+    sequence) in every window, as {symbol: int64 array}.
+    Symbols are matched exactly, so pass an uppercase sequence.
+    """
+    raw = as_bytes(seq)
+    if alphabet is None:
+        alphabet = [chr(b) for b in np.flatnonzero(np.bincount(raw, minlength=256))]
+    starts = _window_starts(len(raw), window, step)
+    return {symbol: _windowed(raw == ord(symbol), starts, window) for symbol in alphabet}
+
+
+def symbol_frequencies(seq, window, step=1, alphabet=None):
+    """
+    Relative frequency of each symbol of `alphabet` (default: the symbols
+    found in the sequence) in every window, as {symbol: float array}.
+    Symbols are matched exactly, so pass an uppercase sequence.
+    """
+    counts = symbol_counts(seq, window, step, alphabet)
+    return {symbol: count / window for symbol, count in counts.items()}
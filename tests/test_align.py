@@ -0,0 +1,91 @@
+import os
+import random
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from biotools import align
+from biotools.align import affine_align, global_align, global_score
+
+NEG = float('-inf')
+
+
+def reference_global(a, b, match, mismatch, gap):
+    """Needleman-Wunsch score with a full matrix."""
+    prev = [j * gap for j in range(len(b) + 1)]
+    for i in range(1, len(a) + 1):
+        row = [i * gap]
+        for j in range(1, len(b) + 1):
+            diagonal = prev[j - 1] + (match if a[i - 1] == b[j - 1] else mismatch)
+            row.append(max(diagonal, prev[j] + gap, row[j - 1] + gap))
+        prev = row
+    return prev[-1]
+
+
+def reference_affine(a, b, match, mismatch, gap_open, gap_extend):
+    """Gotoh score: M ends in a (mis)match, X in a gap in b, Y in a gap in a."""
+    n, m = len(a), len(b)
+    M = [[NEG] * (m + 1) for _ in range(n + 1)]
+    X = [[NEG] * (m + 1) for _ in range(n + 1)]
+    Y = [[NEG] * (m + 1) for _ in range(n + 1)]
+    M[0][0] = 0
+    for i in range(n + 1):
+        for j in range(m + 1):
+            if i and j:
+                best = max(M[i - 1][j - 1], X[i - 1][j - 1], Y[i - 1][j - 1])
+                M[i][j] = best + (match if a[i - 1] == b[j - 1] else mismatch)
+            if i:
+                X[i][j] = max(max(M[i - 1][j], Y[i - 1][j]) + gap_open, X[i - 1][j] + gap_extend)
+            if j:
+                Y[i][j] = max(max(M[i][j - 1], X[i][j - 1]) + gap_open, Y[i][j - 1] + gap_extend)
+    return max(M[n][m], X[n][m], Y[n][m])
+
+
+def column_score(row1, row2, match, mismatch, gap_open, gap_extend):
+    score, previous = 0, None
+    for c1, c2 in zip(row1, row2):
+        state = 'x' if c2 == '-' else 'y' if c1 == '-' else 'm'
+        if state == 'm':
+            score += match if c1 == c2 else mismatch
+        else:
+            score += gap_extend if state == previous else gap_open
+        previous = state
+    return score
+
+
+def random_pairs(count, seed):
+    rng = random.Random(seed)
+    for _ in range(count):
+        a = "".join(rng.choice("ACGT") for _ in range(rng.randint(0, 30)))
+        b = list(a)
+        for _ in range(rng.randint(0, 8)):
+            position = rng.randint(0, len(b))
+            if rng.random() < 0.5 and position < len(b):
+                del b[position]
+            else:
+                b.insert(position, rng.choice("ACGT"))
+        yield a, "".join(b)
+
+
+def test_global_align_matches_full_matrix(monkeypatch):
+    # tiny sub-problem size so Hirschberg splits even short inputs
+    monkeypatch.setattr(align, "FULL_MATRIX_CELLS", 16)
+    for seq1, seq2 in random_pairs(150, 0):
+        for match, mismatch, gap in ((1, -1, 0), (2, -1, -2), (1, -3, -1)):
+            expected = reference_global(seq1, seq2, match, mismatch, gap)
+            row1, row2, score, matches = global_align(seq1, seq2, match, mismatch, gap)
+            assert score == expected == global_score(seq1, seq2, match, mismatch, gap)
+            assert row1.replace('-', '') == seq1 and row2.replace('-', '') == seq2
+            assert column_score(row1, row2, match, mismatch, gap, gap) == score
+            assert matches == sum(c1 == c2 != '-' for c1, c2 in zip(row1, row2))
+
+
+def test_affine_align_matches_gotoh():
+    for seq1, seq2 in random_pairs(150, 1):
+        for match, mismatch, gap_open, gap_extend in ((1, -1, -2, -1), (2, -3, -5, -2)):
+            expected = reference_affine(seq1, seq2, match, mismatch, gap_open, gap_extend)
+            row1, row2, score, _ = affine_align(seq1, seq2, match, mismatch, gap_open, gap_extend)
+            assert score == expected
+            # a band wider than both sequences changes nothing
+            assert affine_align(seq1, seq2, match, mismatch, gap_open, gap_extend, band=40)[2] == expected
+            assert row1.replace('-', '') == seq1 and row2.replace('-', '') == seq2
+            assert column_score(row1, row2, match, mismatch, gap_open, gap_extend) == score
@@ -0,0 +1,31 @@
+import os
+import random
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from biotools.assembly import assembly_stats, debruijn_assemble, n50, overlap_assemble
+
+COMPLEMENT = str.maketrans("ACGT", "TGCA")
+
+
+def tiled_reads(genome, length, step, seed):
+    reads = [genome[i:i + length] for i in range(0, len(genome) - length + 1, step)]
+    random.Random(seed).shuffle(reads)
+    return reads
+
+
+def test_error_free_reads_give_the_genome():
+    rng = random.Random(0)
+    genome = "".join(rng.choice("ACGT") for _ in range(3000))
+    reads = tiled_reads(genome, 150, 25, 1)
+    assert overlap_assemble(reads, min_overlap=70) == [genome]
+    contigs = debruijn_assemble(reads, k=31)
+    assert len(contigs) == 1
+    assert contigs[0] in (genome, genome.translate(COMPLEMENT)[::-1])
+
+
+def test_n50():
+    assert n50([]) == 0
+    assert n50([5, 4, 3, 2, 1]) == 4
+    assert n50([10, 1, 1]) == 10
+    assert assembly_stats(["ACGT", "AC"]) == {'contigs': 2, 'total': 6, 'longest': 4, 'n50': 4}
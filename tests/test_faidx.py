@@ -0,0 +1,36 @@
+import os
+import random
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from biotools.faidx import FastaIndex
+from biotools.fasta import read_fasta
+
+
+def write_fasta(path, records, width, newline="\n"):
+    with open(path, 'w', newline="") as f:
+        for header, seq in records:
+            f.write(f">{header}{newline}")
+            for i in range(0, len(seq), width):
+                f.write(seq[i:i + width] + newline)
+
+
+def test_fetch_matches_full_read(tmp_path):
+    rng = random.Random(0)
+    records = [(f"seq{i} sample a>b {i}", "".join(rng.choice("acgtN") for _ in range(rng.randint(0, 500))))
+               for i in range(6)]
+    for width, newline in ((60, "\n"), (17, "\r\n"), (1, "\n")):
+        path = str(tmp_path / f"w{width}.fasta")
+        write_fasta(path, records, width, newline)
+        expected = dict(read_fasta(path))
+        with FastaIndex(path) as fasta:
+            assert fasta.names == [header.split()[0] for header, _ in records]
+            for header, _ in records:
+                name = header.split()[0]
+                seq = expected[header]
+                assert fasta.header(name) == header
+                assert fasta.length(name) == len(seq)
+                assert fasta.fetch(name) == seq
+                for _ in range(20):
+                    start, end = sorted(rng.randint(-5, len(seq) + 5) for _ in range(2))
+                    assert fasta.fetch(name, start, end) == seq[max(start, 0):max(end, 0)]
@@ -0,0 +1,41 @@
+import os
+import random
+import sys
+from collections import Counter
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from biotools.kmers import as_strings, count_kmers, kmer_spectrum, kmer_to_code
+
+COMPLEMENT = str.maketrans("ACGT", "TGCA")
+
+
+def reference_counts(seq, k, canonical=False):
+    counts = Counter()
+    for i in range(len(seq) - k + 1):
+        kmer = seq[i:i + k]
+        if set(kmer) <= set("ACGT"):
+            if canonical:
+                kmer = min(kmer, kmer.translate(COMPLEMENT)[::-1])
+            counts[kmer] += 1
+    return counts
+
+
+def test_count_kmers_matches_counter():
+    rng = random.Random(0)
+    seq = "".join(rng.choice("ACGTACGTN") for _ in range(3000))
+    # dense (bincount) and sparse (unique) paths, up to the 31-mer limit
+    for k in (1, 2, 5, 12, 13, 20, 31):
+        for canonical in (False, True):
+            codes, counts = count_kmers(seq, k, canonical)
+            assert dict(zip(as_strings(codes, k), counts.tolist())) == reference_counts(seq, k, canonical)
+            assert (np.diff(codes.astype(np.float64)) > 0).all()
+
+
+def test_kmer_spectrum_is_indexed_by_code():
+    seq = "ACGTTGCAACGTNNACG"
+    spectrum = kmer_spectrum(seq, 3)
+    assert spectrum.sum() == sum(reference_counts(seq, 3).values())
+    for kmer, count in reference_counts(seq, 3).items():
+        assert spectrum[kmer_to_code(kmer)] == count
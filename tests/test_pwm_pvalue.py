@@ -0,0 +1,43 @@
+import itertools
+import os
+import sys
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from biotools.pwm_pvalue import score_distribution
+
+
+def all_scores(pwm, background):
+    """Score and probability of every L-mer, by enumeration."""
+    length = pwm.shape[1]
+    words = np.array(list(itertools.product(range(4), repeat=length)))
+    scores = pwm[words, np.arange(length)].sum(axis=1)
+    probs = np.asarray(background)[words].prod(axis=1)
+    return scores, probs
+
+
+def test_pvalue_matches_enumeration():
+    rng = np.random.default_rng(0)
+    pwm = rng.normal(size=(4, 5))
+    background = (0.3, 0.2, 0.2, 0.3)
+    distribution = score_distribution(pwm, background)
+    scores, probs = all_scores(pwm, background)
+    # the grid step bounds the error of any score to L * granularity / 2
+    tolerance = pwm.shape[1] * distribution.granularity / 2
+    for score in np.quantile(scores, [0, 0.1, 0.5, 0.9, 0.99, 1]):
+        low = probs[scores >= score + tolerance].sum()
+        high = probs[scores >= score - tolerance].sum()
+        assert low - 1e-9 <= distribution.pvalue(score) <= high + 1e-9
+
+
+def test_threshold_is_smallest_passing_score():
+    rng = np.random.default_rng(1)
+    pwm = rng.normal(size=(4, 4))
+    distribution = score_distribution(pwm)
+    for pvalue in (0.5, 0.05, 0.01):
+        threshold = distribution.threshold(pvalue)
+        assert distribution.pvalue(threshold) <= pvalue
+        assert distribution.pvalue(threshold - distribution.granularity) > pvalue
+    # no 4-mer is rarer than 1 / 256
+    assert distribution.threshold(1e-3) == np.inf
@@ -0,0 +1,17 @@
+import os
+import random
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from biotools.repeats import find_inverted_repeats
+
+
+def test_long_arm_in_long_sequence():
+    # 4**25 * (len + 1) no longer fits in 64 bits for a 30 kb sequence
+    rng = random.Random(0)
+    arm = "".join(rng.choice("ACGT") for _ in range(25))
+    closing = arm.translate(str.maketrans("ACGT", "TGCA"))[::-1]
+    background = "".join(rng.choice("ACGT") for _ in range(30000))
+    seq = background[:1000] + arm + "A" * 50 + closing + background[1000:]
+    hits = find_inverted_repeats(seq, min_ir=25, max_ir=25, min_dist=10, max_dist=100)
+    assert (1000, 1100) in hits[['start', 'end']].tolist()
@@ -0,0 +1,117 @@
+import itertools
+import os
+import random
+import re
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from biotools.encoding import IUPAC_BASES
+from biotools.restriction import COMMON_ENZYMES, Digest, find_sites, reverse_complement_site
+
+# exact and ambiguous sites, 5'/3'/blunt ends, type IIS cuts outside the site, long N runs
+NAMES = ["EcoRI", "HindIII", "TaqI", "PstI", "EcoRV", "HinfI", "AvaI", "BglI", "XcmI",
+         "BsaI", "MlyI", "SapI", "AluI", "MspI"]
+ENZYMES = [enzyme for enzyme in COMMON_ENZYMES if enzyme.name in NAMES]
+
+
+def random_sequence(length, seed):
+    rng = random.Random(seed)
+    return "".join(rng.choice("ACGT") for _ in range(length))
+
+
+def reference_sites(seq, enzymes, circular):
+    """(enzyme, start, strand, top, bottom) of every site, found with regular expressions."""
+    length = len(seq)
+    result = set()
+    for number, enzyme in enumerate(enzymes):
+        size = len(enzyme.site)
+        text = seq + seq[:size - 1] if circular else seq
+        strands = [(1, enzyme.site)]
+        if not enzyme.palindromic:
+            strands.append((-1, reverse_complement_site(enzyme.site)))
+        for strand, site in strands:
+            pattern = "".join(f"[{IUPAC_BASES[symbol]}]" for symbol in site)
+            for match in re.finditer(f"(?=({pattern}))", text):
+                start = match.start()
+                if strand > 0:
+                    top, bottom = start + enzyme.top, start + enzyme.bottom
+                else:
+                    top, bottom = start + size - enzyme.bottom, start + size - enzyme.top
+                if circular:
+                    top, bottom = top % length, bottom % length
+                elif not (0 < top < length and 0 < bottom < length):
+                    continue
+                result.add((number, start, strand, top, bottom))
+    return result
+
+
+def test_find_sites_matches_regex():
+    for circular in (False, True):
+        for seed in range(3):
+            seq = random_sequence(4000, seed)
+            sites = find_sites(seq, ENZYMES, circular)
+            found = {tuple(site) for site in sites.tolist()}
+            assert len(found) == len(sites)
+            assert found == reference_sites(seq, ENZYMES, circular)
+            assert (sites['top'][1:] >= sites['top'][:-1]).all()
+
+
+def test_site_across_origin():
+    # EcoRI G^AATTC split over the end and the start of a circular sequence
+    seq = "AATTC" + random_sequence(200, 7).replace("GAATTC", "GATTTC") + "G"
+    ecori = [enzyme for enzyme in COMMON_ENZYMES if enzyme.name == "EcoRI"]
+    assert len(find_sites(seq, ecori, circular=False)) == 0
+    sites = find_sites(seq, ecori, circular=True)
+    assert sites[['start', 'top', 'bottom']].tolist() == [(len(seq) - 1, 0, 4)]
+
+
+def test_digest_cuts_match_regex():
+    for circular in (False, True):
+        seq = random_sequence(5000, 11)
+        digest = Digest(seq, ENZYMES, circular)
+        reference = reference_sites(seq, ENZYMES, circular)
+        for number, enzyme in enumerate(ENZYMES):
+            expected = sorted({top for enzyme_number, _, _, top, _ in reference if enzyme_number == number})
+            assert digest.cuts(enzyme.name).tolist() == expected
+
+
+def test_digest_fragments_cover_sequence():
+    for circular in (False, True):
+        seq = random_sequence(3000, 5)
+        digest = Digest(seq, ENZYMES, circular)
+        for names in (("EcoRI",), ("TaqI", "HinfI"), ("BsaI", "MlyI", "AluI")):
+            fragments = digest.digest(*names)
+            assert fragments['length'].sum() == len(seq)
+            assert (fragments['length'] > 0).all()
+
+
+def brute_force_search(digest, min_size, max_size, all_within, max_fragments):
+    limit = digest.length + 1 if max_fragments is None else max_fragments
+    names = [enzyme.name for enzyme in digest.enzymes]
+    cutting = [name for name in names if len(digest.cuts(name))]
+    results = []
+    for combination in [(name,) for name in names] + list(itertools.combinations(cutting, 2)):
+        lengths = digest.digest(*combination)['length']
+        inside = int(((lengths >= min_size) & (lengths <= max_size)).sum())
+        found = inside == len(lengths) if all_within else inside > 0
+        if found and len(lengths) <= limit:
+            results.append((combination, len(lengths), inside))
+    return sorted(results)
+
+
+def test_fragment_search_matches_exhaustive_digest():
+    for circular in (False, True):
+        seq = random_sequence(3000, 3)
+        digest = Digest(seq, ENZYMES, circular)
+        for min_size, max_size in ((100, 400), (500, 3000), (1, 60)):
+            for all_within in (False, True):
+                for max_fragments in (None, 0, 1, 4, 12):
+                    result = digest.fragment_search(min_size, max_size, all_within=all_within,
+                                                    max_fragments=max_fragments)
+                    assert sorted(result) == brute_force_search(digest, min_size, max_size,
+                                                                all_within, max_fragments)
+
+
+def test_fragment_search_zero_fragments():
+    digest = Digest(random_sequence(2000, 1), ENZYMES, circular=False)
+    assert digest.fragment_search(1, 2000, max_fragments=0) == []
@@ -0,0 +1,41 @@
+import itertools
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from biotools.encoding import IUPAC_BASES
+from biotools.genetic_code import genetic_code
+from biotools.translate import translate
+
+STANDARD = {
+    'TTT': 'F', 'TTC': 'F', 'TTA': 'L', 'TTG': 'L', 'CTT': 'L', 'CTC': 'L', 'CTA': 'L', 'CTG': 'L',
+    'ATT': 'I', 'ATC': 'I', 'ATA': 'I', 'ATG': 'M', 'GTT': 'V', 'GTC': 'V', 'GTA': 'V', 'GTG': 'V',
+    'TCT': 'S', 'TCC': 'S', 'TCA': 'S', 'TCG': 'S', 'CCT': 'P', 'CCC': 'P', 'CCA': 'P', 'CCG': 'P',
+    'ACT': 'T', 'ACC': 'T', 'ACA': 'T', 'ACG': 'T', 'GCT': 'A', 'GCC': 'A', 'GCA': 'A', 'GCG': 'A',
+    'TAT': 'Y', 'TAC': 'Y', 'TAA': '*', 'TAG': '*', 'CAT': 'H', 'CAC': 'H', 'CAA': 'Q', 'CAG': 'Q',
+    'AAT': 'N', 'AAC': 'N', 'AAA': 'K', 'AAG': 'K', 'GAT': 'D', 'GAC': 'D', 'GAA': 'E', 'GAG': 'E',
+    'TGT': 'C', 'TGC': 'C', 'TGA': '*', 'TGG': 'W', 'CGT': 'R', 'CGC': 'R', 'CGA': 'R', 'CGG': 'R',
+    'AGT': 'S', 'AGC': 'S', 'AGA': 'R', 'AGG': 'R', 'GGT': 'G', 'GGC': 'G', 'GGA': 'G', 'GGG': 'G',
+}
+
+
+def test_standard_code():
+    codons = sorted(STANDARD)
+    assert translate("".join(codons)) == "".join(STANDARD[codon] for codon in codons)
+    assert translate("ATGNNNTAA") == "MX*"
+    assert sorted(genetic_code(1).start_codons()) == ["ATG", "CTG", "TTG"]
+
+
+def test_table_differences():
+    assert translate("TGAAGA", table=2) == "W*"
+    assert translate("TAATAGTGA", table=32) == "*W*"
+    assert translate("CTG", table=3) == "T"
+
+
+def test_ambiguous_codons_agree_with_their_readings():
+    for table in (1, 2, 11):
+        for codon in ("GCN", "YTR", "TAR", "ATH", "MGR", "TGR"):
+            readings = {translate("".join(bases), table=table)
+                        for bases in itertools.product(*(IUPAC_BASES[symbol] for symbol in codon))}
+            expected = readings.pop() if len(readings) == 1 else 'X'
+            assert translate(codon, table=table, ambiguous=True) == expected, (table, codon)